@@ -1,8 +1,22 @@
 import streamlit as st
 import pandas as pd
-from ortools.sat.python import cp_model
+import hashlib
 import io
-import collections
+import json
+import os
+import time
+
+from engine import (
+    create_automated_classes, class_config_from_settings, analyze_data, compute_capacity, max_fillable_slots,
+    build_teacher_table, SOLVER_PROFILES, solver_profile,
+)
+from ingest import load_roster, load_calendar
+from export import write_schedule_workbook, write_term_workbook
+from jobs import SolveJob
+from sweep import expand_grid, run_sweep
+from cache import SolutionCache, make_cache_key
+from store import ScheduleStore
+from term import solve_term, term_summary
 
 # --- SAYFA AYARLARI ---
 st.set_page_config(page_title="Ders Programı V60 - Tercih Motoru", layout="wide")
@@ -18,6 +32,29 @@ st.sidebar.header("⚙️ Genel Ayarlar")
 max_teachers_per_class = st.sidebar.slider("Sınıf Başına Max Hoca", 1, 6, 3)
 allow_native_advisor = st.sidebar.checkbox("Native Hocalar Danışman Olabilir mi?", value=False)
 allow_empty_slots = st.sidebar.checkbox("Sıkışınca Boş Ders Bırak", value=True)
+partner_rule_label = st.sidebar.selectbox("İstenmeyen Partner Kuralı", ["Esnek (Cezalı)", "Kesin (Yasak)"])
+partner_rule = "hard" if partner_rule_label.startswith("Kesin") else "soft"
+SOLVE_MODES = {
+    "Ağırlıklı (Tek Amaç)": "weighted",
+    "Kademeli (Öncelik Sırasıyla)": "tiered",
+    "Vardiyalara Bölünmüş (Paralel)": "decomposed",
+}
+solve_mode = SOLVE_MODES[st.sidebar.selectbox("Çözüm Modu", list(SOLVE_MODES))]
+profile_names = list(SOLVER_PROFILES)
+solver_profile_name = st.sidebar.selectbox(
+    "Çözücü Profili", profile_names, index=profile_names.index("balanced"),
+    format_func=lambda name: SOLVER_PROFILES[name]["label"],
+)
+random_seed = int(st.sidebar.number_input(
+    "Rastgele Tohum (Seed)", 0, 1000000, 0,
+    help="Aynı sonucu sadece tek çekirdekle ve süre sınırından önce biten çözümlerde garanti eder.",
+))
+instrument = st.sidebar.checkbox(
+    "Ölçüm Kaydı", value=False,
+    help="Kurulum ve çözücü ölçümlerini (CP-SAT arama günlüğü dahil) toplar; çözümü biraz yavaşlatabilir.",
+)
+resolved_profile = solver_profile(solver_profile_name, seed=random_seed)
+st.sidebar.caption(f"{resolved_profile['time_limit']:.0f} sn, {resolved_profile['num_workers']} çekirdek")
 
 st.sidebar.markdown("---")
 st.sidebar.header("🏫 Sınıf ve Zaman Ayarları")
@@ -37,23 +74,34 @@ with col2:
     count_b2 = st.number_input("B2 Sayısı", 0, 20, 2)
     time_b2 = st.selectbox("B2 Zamanı", ["Sabah", "Öğle"], key="t_b2")
 
-# --- SINIF OLUŞTURMA ---
-def create_automated_classes():
-    class_list = []
-    config = [
-        (count_a1, "A1", 0 if time_a1 == "Sabah" else 1),
-        (count_a2, "A2", 0 if time_a2 == "Sabah" else 1),
-        (count_b1, "B1", 0 if time_b1 == "Sabah" else 1),
-        (count_b2, "B2", 0 if time_b2 == "Sabah" else 1),
-        (count_pre, "PreFaculty", 0 if time_pre == "Sabah" else 1),
-    ]
-    for count, lvl, time_code in config:
-        for i in range(1, count + 1):
-            class_name = f"{lvl}.{i:02d}"
-            class_list.append({"Sınıf Adı": class_name, "Seviye": lvl, "Zaman Kodu": time_code})
-    return pd.DataFrame(class_list)
+class_settings = {
+    "count_a1": count_a1, "time_a1": time_a1,
+    "count_a2": count_a2, "time_a2": time_a2,
+    "count_b1": count_b1, "time_b1": time_b1,
+    "count_b2": count_b2, "time_b2": time_b2,
+    "count_pre": count_pre, "time_pre": time_pre,
+}
+class_config = class_config_from_settings(class_settings)
+
+st.sidebar.markdown("---")
+st.sidebar.header("🗂️ Program Arşivi")
+archive_term = st.sidebar.text_input("Dönem", "2026 Güz").strip()
+archive_department = st.sidebar.text_input("Bölüm", "Hazırlık").strip()
+
+# --- ÇÖZÜM ÖNBELLEĞİ ---
+@st.cache_resource
+def get_solution_cache():
+    return SolutionCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".schedule_cache"), max_entries=64)
+
+@st.cache_resource
+def get_schedule_store():
+    return ScheduleStore(os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules.sqlite3"))
+
+def parse_int_list(text):
+    return [int(v) for v in str(text).replace(";", ",").split(",") if v.strip()]
 
 # --- EXCEL ŞABLONU ---
+@st.cache_data(show_spinner=False)
 def generate_template():
     output = io.BytesIO()
     with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
@@ -68,63 +116,108 @@ def generate_template():
             'İstenmeyen Partner': ['', '', 'Ayşe Hoca', 'Mehmet (Danışman)']
         })
         df_teachers.to_excel(writer, sheet_name='Ogretmenler', index=False)
+        # Dönem modu için isteğe bağlı sayfalar.
+        pd.DataFrame({
+            'Hafta': [1, 2, 3, 4],
+            'Durum': ['Ders', 'Ders', 'Tatil', 'Sınav'],
+            'Tatil Günleri': ['', 'Pazartesi', '', ''],
+        }).to_excel(writer, sheet_name='Takvim', index=False)
+        pd.DataFrame({
+            'Hafta': [2], 'Ad Soyad': ['Ahmet Hoca'], 'Yasaklı Günler': ['Salı'],
+        }).to_excel(writer, sheet_name='Haftalik_Musaitlik', index=False)
     return output.getvalue()
 
 st.sidebar.markdown("---")
 st.sidebar.download_button("📥 Kılavuzlu Şablonu İndir", generate_template(), "ogretmen_listesi.xlsx")
 
-# --- GÜVENLİ STRİNG OKUYUCULAR ---
-def get_role(t):
-    return str(t['Rol']).upper().replace('İ', 'I').replace('i', 'I').replace('ı', 'I')
-
-def get_pref(t):
-    return str(t.get('Tercih (Sabah/Öğle)', 'Farketmez')).upper().replace('Ö', 'O').replace('ö', 'O').replace('Ğ', 'G').replace('ğ', 'G').strip()
-
-# --- ANALİZ ---
-def analyze_data(teachers, classes):
-    warnings = []
-    errors = []
-    
-    assigned_fixed = []
-    for t in teachers:
-        role = get_role(t)
-        fixed_class = str(t['Sabit Sınıf']).strip()
-        forbidden_str = str(t['Yasaklı Günler'])
-
-        if fixed_class:
-            if not allow_native_advisor and "NATIVE" in role:
-                 errors.append(f"🛑 **{t['Ad Soyad']}**: Native hocaya sabit sınıf verilmesi engellendi.")
-            if "EK GÖREVL" in role:
-                 errors.append(f"🛑 **{t['Ad Soyad']}**: Ek Görevli rolündekilere sabit sınıf verilemez.")
-
-            target_class = next((c for c in classes if c['Sınıf Adı'] == fixed_class), None)
-            if not target_class:
-                errors.append(f"❌ **{t['Ad Soyad']}**: Atandığı '{fixed_class}' sınıfı sistemde yok.")
-            else:
-                assigned_fixed.append(fixed_class)
-
-            if "Pazartesi" in forbidden_str:
-                warnings.append(f"⚠️ **Uyarı ({t['Ad Soyad']}):** '{fixed_class}' danışmanı ama Pazartesi yasaklı.")
-
-    dupes = [item for item, count in collections.Counter(assigned_fixed).items() if count > 1]
-    if dupes:
-        errors.append(f"❌ **ÇAKISMA HATASI:** {', '.join(dupes)} sınıfına 1'den fazla öğretmen sabitlenmiş!")
-
-    return errors, warnings
+# --- ÖNBELLEKLİ ÖN HESAPLAR ---
+# Streamlit her etkileşimde betiği baştan çalıştırır. Yükleme içeriğinin özeti (content_hash)
+# ve ilgili ayarlar anahtardır; alt çizgiyle başlayan argümanlar özetlenmez (aynı içeriği
+# taşıdıkları için tekrar hashlemeye gerek yok). Önbellekler sınırlıdır.
+ROSTER_CACHE_ENTRIES = 32
+
+def content_hash(uploaded):
+    return hashlib.sha256(uploaded.getvalue()).hexdigest()
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES, show_spinner=False)
+def cached_roster(roster_hash, filename, _content):
+    return load_roster(io.BytesIO(_content), filename)
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES, show_spinner=False)
+def cached_previous_schedule(file_hash, _content):
+    return pd.read_excel(io.BytesIO(_content), sheet_name='Program').fillna("").to_dict('records')
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES, show_spinner=False)
+def cached_calendar(roster_hash, filename, _content):
+    try:
+        return load_calendar(io.BytesIO(_content), filename)
+    except ValueError:
+        return None, []
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES, show_spinner=False)
+def cached_classes(config):
+    return create_automated_classes(config)
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES * 4, show_spinner=False)
+def cached_analysis(roster_hash, config, allow_native_advisor, _teachers, _classes):
+    return analyze_data(_teachers, _classes, allow_native_advisor)
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES, show_spinner=False)
+def cached_native_names(roster_hash, _teachers):
+    return build_teacher_table(_teachers).native_names()
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES * 4, show_spinner=False)
+def cached_capacity(roster_hash, config, _teachers, _classes):
+    return compute_capacity(_teachers, _classes)
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES * 4, show_spinner=False)
+def cached_fillable(roster_hash, config, _teachers, _classes):
+    return max_fillable_slots(_teachers, _classes)
+
+# Çalışma kitapları her yeniden çalıştırmada (1 sn'lik ilerleme yoklamaları dahil) yeniden
+# yazılmaz: çözüm sonuçları anahtar + çalıştırma kimliğiyle (run_id, önbellekten gelende
+# None), arşiv sürümleri değişmez sürüm kimlikleriyle önbelleklenir.
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES, show_spinner=False)
+def cached_result_workbook(result_key, run_id, _res_data, _stats, _violations, _native_names, _run_info):
+    return write_schedule_workbook(io.BytesIO(), _res_data, _stats, _violations, _native_names, _run_info).getvalue()
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES, show_spinner=False)
+def cached_term_workbook(term_key, run_id, _results, _summary, _native_names):
+    return write_term_workbook(io.BytesIO(), _results, _summary, _native_names).getvalue()
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES, show_spinner=False)
+def cached_version(version_id):
+    loaded = get_schedule_store().load(version_id)
+    workbook = write_schedule_workbook(io.BytesIO(), loaded["schedule"], loaded["stats"], loaded["violations"],
+                                       loaded["native_names"], loaded["solver_stats"]).getvalue()
+    return loaded, workbook
+
+@st.cache_data(max_entries=ROSTER_CACHE_ENTRIES * 4, show_spinner=False)
+def cached_version_diff(old_id, new_id):
+    return get_schedule_store().diff(old_id, new_id)
 
 # --- ANA PROGRAM ---
-uploaded_file = st.file_uploader("Öğretmen Listesini Yükle", type=["xlsx"])
+uploaded_file = st.file_uploader("Öğretmen Listesini Yükle", type=["xlsx", "csv", "parquet"])
+previous_file = st.file_uploader("Önceki Programı Yükle (İsteğe Bağlı, ders_programi_final.xlsx)", type=["xlsx"])
+minimal_change = st.checkbox("Önceki Programa Sadık Kal (Minimum Değişiklik)", value=True, disabled=previous_file is None)
 
 if uploaded_file:
-    df_teachers = pd.read_excel(uploaded_file, sheet_name='Ogretmenler').fillna("")
-    if 'Hedef Ders Sayısı' not in df_teachers.columns and 'Hedef Gün Sayısı' in df_teachers.columns:
-        df_teachers.rename(columns={'Hedef Gün Sayısı': 'Hedef Ders Sayısı'}, inplace=True)
-
-    df_classes = create_automated_classes()
-    teachers_list = df_teachers.to_dict('records')
-    classes_list = df_classes.to_dict('records')
-
-    logic_errors, logic_warnings = analyze_data(teachers_list, classes_list)
+    roster_hash = content_hash(uploaded_file)
+    try:
+        teachers_list, ingest_errors = cached_roster(roster_hash, uploaded_file.name, uploaded_file.getvalue())
+    except ValueError as exc:
+        st.error(f"🛑 Dosya okunamadı: {exc}")
+        st.stop()
+    if ingest_errors:
+        st.error(f"🛑 Öğretmen listesinde {len(ingest_errors)} hatalı hücre var; lütfen düzeltip tekrar yükleyin.")
+        st.dataframe(pd.DataFrame(ingest_errors))
+        st.stop()
+
+    previous_rows = cached_previous_schedule(content_hash(previous_file), previous_file.getvalue()) if previous_file else None
+    class_key = tuple(class_config)
+    classes_list = cached_classes(class_key)
+
+    logic_errors, logic_warnings = cached_analysis(roster_hash, class_key, allow_native_advisor, teachers_list, classes_list)
 
     if logic_errors:
         st.error("🛑 Lütfen Excel'deki mantıksal hataları düzeltin:")
@@ -134,401 +227,263 @@ if uploaded_file:
             for w in logic_warnings: st.warning(w)
 
         # İhtiyaçlar ve Kapasite
-        morning_needs = sum([3 if c['Seviye'] == 'PreFaculty' else 5 for c in classes_list if c['Zaman Kodu'] == 0])
-        afternoon_needs = sum([3 if c['Seviye'] == 'PreFaculty' else 5 for c in classes_list if c['Zaman Kodu'] == 1])
-        total_slots_needed = morning_needs + afternoon_needs
-
-        morning_cap, afternoon_cap, farketmez_cap = 0, 0, 0
-        base_targets = []
-        
-        for t in teachers_list:
-            forbidden_cnt = len(str(t['Yasaklı Günler']).split(',')) if str(t['Yasaklı Günler']).strip() else 0
-            teacher_cap = min(int(t['Hedef Ders Sayısı']), 5 - forbidden_cnt)
-            base_targets.append(teacher_cap)
-            
-            pref = get_pref(t)
-            if 'SABAH' in pref: morning_cap += teacher_cap
-            elif 'OGLE' in pref: afternoon_cap += teacher_cap
-            else: farketmez_cap += teacher_cap
-
-        raw_demand = sum(base_targets)
+        capacity = cached_capacity(roster_hash, class_key, teachers_list, classes_list)
 
         col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Sabah İhtiyacı", morning_needs)
-        col2.metric("Sabah Kapasitesi", f"{morning_cap} (+{farketmez_cap})")
-        col3.metric("Öğle İhtiyacı", afternoon_needs)
-        col4.metric("Öğle Kapasitesi", f"{afternoon_cap} (+{farketmez_cap})")
-
-        # HİYERARŞİK KIRPMA MANTIĞI (NATIVE KORUMALI)
-        adjusted_targets = list(base_targets)
-        excess_capacity = raw_demand - total_slots_needed
-
+        col1.metric("Sabah İhtiyacı", capacity["morning_needs"])
+        col2.metric("Sabah Kapasitesi", f"{capacity['morning_cap']} (+{capacity['farketmez_cap']})")
+        col3.metric("Öğle İhtiyacı", capacity["afternoon_needs"])
+        col4.metric("Öğle Kapasitesi", f"{capacity['afternoon_cap']} (+{capacity['farketmez_cap']})")
+
+        # Yetkinlik, Native-A1, PreFaculty kapanışı ve yasaklı günler hesaba katılarak
+        # gerçekten doldurulabilecek en fazla ders saati (maksimum akış, milisaniyeler).
+        fillable = cached_fillable(roster_hash, class_key, teachers_list, classes_list)
+        unfillable = fillable["total_slots_needed"] - fillable["max_fillable"]
+        f1, f2 = st.columns(2)
+        f1.metric("Doldurulabilir Ders", f"{fillable['max_fillable']} / {fillable['total_slots_needed']}")
+        f2.metric("Kesin Boş Kalacak", unfillable)
+        with st.expander("📊 Seviye / Vardiya Bazında Doldurulabilirlik"):
+            st.table(pd.DataFrame(fillable["by_group"]))
+
+        excess_capacity = capacity["raw_demand"] - capacity["total_slots_needed"]
         if excess_capacity > 0:
             st.info(f"ℹ️ Hoca kapasitesi {excess_capacity} saat fazla. Ek Görevli ve Destek hocalarından adil kırpma yapılacaktır (Native Hariç).")
-            
-            ek_idx = [i for i, t in enumerate(teachers_list) if 'EK GÖREVL' in get_role(t)]
-            destek_idx = [i for i, t in enumerate(teachers_list) if 'DESTEK' in get_role(t)]
-            other_idx = [i for i, t in enumerate(teachers_list) if i not in ek_idx and i not in destek_idx and 'NATIVE' not in get_role(t)]
-
-            exc = excess_capacity
-            while exc > 0:
-                trimmed = False
-                
-                if any(adjusted_targets[i] > 0 for i in ek_idx):
-                    for i in ek_idx:
-                        if exc == 0: break
-                        if adjusted_targets[i] > 0:
-                            adjusted_targets[i] -= 1
-                            exc -= 1
-                            trimmed = True
-                    if trimmed: continue 
-                
-                if any(adjusted_targets[i] > (1 if str(teachers_list[i]['Sabit Sınıf']).strip() else 0) for i in destek_idx):
-                    for i in destek_idx:
-                        if exc == 0: break
-                        min_req = 1 if str(teachers_list[i]['Sabit Sınıf']).strip() else 0
-                        if adjusted_targets[i] > min_req:
-                            adjusted_targets[i] -= 1
-                            exc -= 1
-                            trimmed = True
-                    if trimmed: continue
-                
-                if any(adjusted_targets[i] > (1 if str(teachers_list[i]['Sabit Sınıf']).strip() else 0) for i in other_idx):
-                    for i in other_idx:
-                        if exc == 0: break
-                        min_req = 1 if str(teachers_list[i]['Sabit Sınıf']).strip() else 0
-                        if adjusted_targets[i] > min_req:
-                            adjusted_targets[i] -= 1
-                            exc -= 1
-                            trimmed = True
-                    if trimmed: continue
-                
-                if not trimmed: break 
-                
         elif excess_capacity < 0:
             st.warning(f"⚠️ Kapasite yetersiz. {abs(excess_capacity)} ders saati zorunlu olarak boş kalacak.")
 
-        if st.button("🚀 Programı Oluştur"):
-            with st.spinner("Matematiksel model kuruluyor... (Tercih Motoru Devrede)"):
-                model = cp_model.CpModel()
-                days = range(5)
-                day_names = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
-                sessions = range(2)
-
-                x = {}
-                advisor_var = {}
-
-                for t in range(len(teachers_list)):
-                    for c in range(len(classes_list)):
-                        advisor_var[(t, c)] = model.NewBoolVar(f'adv_{t}_{c}')
-                        for d in days:
-                            for s in sessions:
-                                x[(t, c, d, s)] = model.NewBoolVar(f'x_{t}_{c}_{d}_{s}')
-
-                # --- 1. KESİN KURALLAR (HARD CONSTRAINTS) ---
-                for t in range(len(teachers_list)):
-                    for d in days:
-                        for s in sessions:
-                            model.Add(sum(x[(t, c, d, s)] for c in range(len(classes_list))) <= 1)
-
-                for c_idx, c_data in enumerate(classes_list):
-                    req_session = c_data['Zaman Kodu']
-                    other_session = 1 - req_session
-                    for d in days:
-                        if c_data['Seviye'] == "PreFaculty" and d >= 3:
-                            model.Add(sum(x[(t, c_idx, d, req_session)] for t in range(len(teachers_list))) == 0)
-                        else:
-                            model.Add(sum(x[(t, c_idx, d, req_session)] for t in range(len(teachers_list))) <= 1)
-                        model.Add(sum(x[(t, c_idx, d, other_session)] for t in range(len(teachers_list))) == 0)
-
-                for t_idx, t in enumerate(teachers_list):
-                    allowed = str(t.get('Yetkinlik (Seviyeler)', '')).strip()
-                    if allowed == "": allowed = "Hepsi"
-                        
-                    if "Hepsi" not in allowed:
-                        for c_idx, c in enumerate(classes_list):
-                            if c['Seviye'] not in allowed:
-                                for d in days:
-                                    for s in sessions: model.Add(x[(t_idx, c_idx, d, s)] == 0)
-                                model.Add(advisor_var[(t_idx, c_idx)] == 0)
-
-                for c in range(len(classes_list)):
-                    model.Add(sum(advisor_var[(t, c)] for t in range(len(teachers_list))) <= 1)
-                for t in range(len(teachers_list)):
-                    model.Add(sum(advisor_var[(t, c)] for c in range(len(classes_list))) <= 1)
-
-                for t_idx, t in enumerate(teachers_list):
-                    fixed_c_name = str(t['Sabit Sınıf']).strip()
-                    if fixed_c_name:
-                        fixed_c_idx = next((i for i, c in enumerate(classes_list) if c['Sınıf Adı'] == fixed_c_name), None)
-                        if fixed_c_idx is not None:
-                            model.Add(advisor_var[(t_idx, fixed_c_idx)] == 1)
-
-                for t_idx, t in enumerate(teachers_list):
-                    role = get_role(t)
-                    if 'EK GÖREVL' in role:
-                        for c in range(len(classes_list)): model.Add(advisor_var[(t_idx, c)] == 0)
-                    if not allow_native_advisor and 'NATIVE' in role:
-                        for c in range(len(classes_list)): model.Add(advisor_var[(t_idx, c)] == 0)
-
-                for t_idx, t in enumerate(teachers_list):
-                    if 'NATIVE' in get_role(t):
-                        for c_idx, c_data in enumerate(classes_list):
-                            if c_data['Seviye'] == 'A1':
-                                for d in days:
-                                    for s in sessions: model.Add(x[(t_idx, c_idx, d, s)] == 0)
-
-                for t_idx, t in enumerate(teachers_list):
-                    if 'EK GÖREVL' in get_role(t):
-                        for c_idx in range(len(classes_list)):
-                            model.Add(sum(x[(t_idx, c_idx, d, s)] for d in days for s in sessions) <= 1)
-
-                # --- 2. PUANLI KURALLAR VE ŞELALELER ---
-                objective = []
-                objective.append(sum(x.values()) * 100000000)
-
-                # NATIVE ŞELALESİ VE SINIF BAŞINA MAX 1 NATIVE KURALI
-                for c_idx, c_data in enumerate(classes_list):
-                    native_in_this_class = []
-                    for t_idx, t in enumerate(teachers_list):
-                        if 'NATIVE' in get_role(t):
-                            is_present = model.NewBoolVar(f'ntv_score_{t_idx}_{c_idx}')
-                            model.AddMaxEquality(is_present, [x[(t_idx, c_idx, d, s)] for d in days for s in sessions])
-                            native_in_this_class.append(is_present)
-                            
-                            lvl = c_data['Seviye']
-                            if lvl == "B2": score = 10000000
-                            elif lvl == "B1": score = 1000000
-                            elif lvl == "A2": score = 100000
-                            elif lvl == "PreFaculty": score = 10000
-                            else: score = 0 
-                            
-                            objective.append(is_present * score)
-                            
-                    if native_in_this_class:
-                        model.Add(sum(native_in_this_class) <= 1)
-
-                for t_idx, t_data in enumerate(teachers_list):
-                    forbidden_days = str(t_data['Yasaklı Günler'])
-                    for c_idx, c_data in enumerate(classes_list):
-                        is_adv = advisor_var[(t_idx, c_idx)]
-                        req_s = c_data['Zaman Kodu']
-
-                        if "Pazartesi" not in forbidden_days:
-                            pzt_var = x[(t_idx, c_idx, 0, req_s)]
-                            adv_pzt = model.NewBoolVar(f'ap_{t_idx}_{c_idx}')
-                            model.AddImplication(adv_pzt, pzt_var)
-                            model.AddImplication(adv_pzt, is_adv)
-                            objective.append(adv_pzt * 50000000)
-
-                        if c_data['Seviye'] != "PreFaculty":
-                            days_in_class = sum(x[(t_idx, c_idx, d, s)] for d in days for s in sessions)
-                            
-                            is_2plus = model.NewBoolVar(f'is2_{t_idx}_{c_idx}')
-                            model.Add(days_in_class >= 2).OnlyEnforceIf(is_2plus)
-                            model.Add(days_in_class <= 1).OnlyEnforceIf(is_2plus.Not())
-                            
-                            is_3plus = model.NewBoolVar(f'is3_{t_idx}_{c_idx}')
-                            model.Add(days_in_class >= 3).OnlyEnforceIf(is_3plus)
-                            model.Add(days_in_class <= 2).OnlyEnforceIf(is_3plus.Not())
-
-                            adv_2days = model.NewBoolVar(f'adv2_{t_idx}_{c_idx}')
-                            model.AddImplication(adv_2days, is_2plus)
-                            model.AddImplication(adv_2days, is_adv)
-                            objective.append(adv_2days * 20000000)
-
-                            adv_3days = model.NewBoolVar(f'adv3_{t_idx}_{c_idx}')
-                            model.AddImplication(adv_3days, is_3plus)
-                            model.AddImplication(adv_3days, is_adv)
-                            objective.append(adv_3days * 20000000)
-
-                # SABAH / ÖĞLE TERCİH CEZALARI (YENİ EKLENDİ)
-                for t_idx, t in enumerate(teachers_list):
-                    pref = get_pref(t)
-                    if 'SABAH' in pref:
-                        # Öğle (1) atamalarına ceza
-                        for c in range(len(classes_list)):
-                            for d in days:
-                                objective.append(x[(t_idx, c, d, 1)] * -10000000)
-                    elif 'OGLE' in pref:
-                        # Sabah (0) atamalarına ceza
-                        for c in range(len(classes_list)):
-                            for d in days:
-                                objective.append(x[(t_idx, c, d, 0)] * -10000000)
-
-                # NATIVE SINIRI (Ceza)
-                for t_idx, t in enumerate(teachers_list):
-                    if 'NATIVE' in get_role(t):
-                        for c_idx in range(len(classes_list)):
-                            class_total = sum(x[(t_idx, c_idx, d, s)] for d in days for s in sessions)
-                            is_violation = model.NewBoolVar(f'ntv_vio_{t_idx}_{c_idx}')
-                            model.Add(class_total <= 1 + 5 * is_violation)
-                            objective.append(is_violation * -20000000)
-
-                # Tek Vardiya (Ceza)
-                for t_idx, t in enumerate(teachers_list):
-                    for d in days:
-                        is_morning = model.NewBoolVar(f'm_{t_idx}_{d}')
-                        is_afternoon = model.NewBoolVar(f'a_{t_idx}_{d}')
-                        model.AddMaxEquality(is_morning, [x[(t_idx, c, d, 0)] for c in range(len(classes_list))])
-                        model.AddMaxEquality(is_afternoon, [x[(t_idx, c, d, 1)] for c in range(len(classes_list))])
-                        double_shift = model.NewBoolVar(f'dbl_{t_idx}_{d}')
-                        model.Add(is_morning + is_afternoon - 1 <= double_shift)
-                        objective.append(double_shift * -50000000)
-
-                for t_idx, t in enumerate(teachers_list):
-                    real_target = adjusted_targets[t_idx]
-                    total_assignments = sum(x[(t_idx, c, d, s)] for c in range(len(classes_list)) for d in days for s in sessions)
-                    
-                    model.Add(total_assignments <= real_target)
-                    objective.append(total_assignments * 5000000)
-
-                    forbidden = str(t['Yasaklı Günler'])
-                    for d_idx, d_name in enumerate(day_names):
-                        if d_name in forbidden:
-                            for c in range(len(classes_list)):
-                                for s in sessions: objective.append(x[(t_idx, c, d_idx, s)] * -500000000)
-
-                # --- ÇÖZÜM ---
-                model.Maximize(sum(objective))
-                solver = cp_model.CpSolver()
-                solver.parameters.max_time_in_seconds = 120.0
-                solver.parameters.num_search_workers = 8
-
-                status = solver.Solve(model)
-
-                if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-                    st.balloons()
-                    res_data = []
-                    violations = []
-                    native_names = [t['Ad Soyad'] for t in teachers_list if 'NATIVE' in get_role(t)]
-
-                    # NATIVE BOŞTA KALMA KONTROLÜ
-                    for t_idx, t in enumerate(teachers_list):
-                        if 'NATIVE' in get_role(t):
-                            assigned = sum([solver.Value(x[(t_idx, c, d, s)]) for c in range(len(classes_list)) for d in days for s in sessions])
-                            real_target = adjusted_targets[t_idx]
-                            if assigned < real_target:
-                                violations.append({"Hoca": t['Ad Soyad'], "Sorun": f"Boşta Kaldı ({real_target - assigned} Saat)", "Sınıf": "Yetersiz Şelale Kotası"})
-
-                    for c_idx, c in enumerate(classes_list):
-                        c_name = c['Sınıf Adı']
-                        s_req = c['Zaman Kodu']
-
-                        assigned_advisor_idx = None
-                        for t_idx in range(len(teachers_list)):
-                            if solver.Value(advisor_var[(t_idx, c_idx)]) == 1:
-                                assigned_advisor_idx = t_idx
-                                break
-                        advisor_name = teachers_list[assigned_advisor_idx]['Ad Soyad'] if assigned_advisor_idx is not None else "Atanamadı"
-
-                        row = {
-                            "Sınıf": c_name, "Seviye": c['Seviye'], "Sınıf Danışmanı": advisor_name,
-                            "Zaman": "Sabah" if s_req == 0 else "Öğle"
-                        }
-                        for d_idx, d_name in enumerate(day_names):
-                            val = "🔴 BOŞ"
-                            if c['Seviye'] == "PreFaculty" and d_idx >= 3:
-                                val = "⛔ KAPALI"
-                            else:
-                                for t_idx, t in enumerate(teachers_list):
-                                    if solver.Value(x[(t_idx, c_idx, d_idx, s_req)]) == 1:
-                                        val = t['Ad Soyad']
-                                        
-                                        # Sabah/Öğle Tercih İhlali Dedektifi
-                                        pref = get_pref(t)
-                                        if 'SABAH' in pref and s_req == 1:
-                                            violations.append({"Hoca": t['Ad Soyad'], "Sorun": f"Ters Vardiya (Tercih: Sabah)", "Sınıf": c_name})
-                                        elif 'OGLE' in pref and s_req == 0:
-                                            violations.append({"Hoca": t['Ad Soyad'], "Sorun": f"Ters Vardiya (Tercih: Öğle)", "Sınıf": c_name})
-
-                                        m = sum([solver.Value(x[(t_idx, cc, d_idx, 0)]) for cc in range(len(classes_list))])
-                                        a = sum([solver.Value(x[(t_idx, cc, d_idx, 1)]) for cc in range(len(classes_list))])
-                                        if m > 0 and a > 0:
-                                            violations.append({"Hoca": t['Ad Soyad'], "Sorun": f"Çift Vardiya ({d_name})", "Sınıf": c_name})
-                                        if d_name in str(t['Yasaklı Günler']):
-                                            violations.append({"Hoca": t['Ad Soyad'], "Sorun": f"Yasaklı Gün ({d_name})", "Sınıf": c_name})
-                                        break
-                            row[d_name] = val
-                        res_data.append(row)
-
-                    stats = []
-                    for t_idx, t in enumerate(teachers_list):
-                        assigned = sum([solver.Value(x[(t_idx, c, d, s)]) for c in range(len(classes_list)) for d in days for s in sessions])
-                        original_target = int(t['Hedef Ders Sayısı'])
-                        real_target = adjusted_targets[t_idx]
-
-                        stat = "Tamam"
-                        if real_target < original_target: 
-                            stat = f"Kırpıldı ({original_target-real_target} saat eksildi)"
-                        elif assigned < real_target: 
-                            stat = f"{real_target-assigned} Ders Boş Kaldı"
-
-                        stats.append({"Hoca Adı": t['Ad Soyad'], "Hedef (İlk)": original_target, "Güncel Hedef": real_target, "Atanan": assigned, "Durum": stat})
-
-                    df_res = pd.DataFrame(res_data)
-                    df_stats = pd.DataFrame(stats)
-                    df_violations = pd.DataFrame(violations).drop_duplicates() if violations else pd.DataFrame()
-
-                    if not df_violations.empty:
-                        st.warning(f"⚠️ İhtiyaçtan dolayı {len(df_violations)} noktada kurallar esnetildi.")
-                        st.table(df_violations)
-                    else:
-                        st.success("✅ Kusursuz Çözüm!")
-
-                    st.dataframe(df_res)
-                    st.dataframe(df_stats)
-
-                    output_res = io.BytesIO()
-                    with pd.ExcelWriter(output_res, engine='xlsxwriter') as writer:
-                        df_res.to_excel(writer, index=False, sheet_name="Program")
-                        df_stats.to_excel(writer, index=False, sheet_name="Istatistikler")
-                        if not df_violations.empty: df_violations.to_excel(writer, index=False, sheet_name="Ihlal_Raporu")
-
-                        wb = writer.book
-                        ws_prog = writer.sheets['Program']
-                        
-                        base_fmt = {'border': 1, 'align': 'center', 'valign': 'vcenter'}
-                        fmt_default = wb.add_format(base_fmt)
-                        
-                        fmt_a1 = wb.add_format(dict(base_fmt, bg_color='#FFD700', font_color='white', bold=True))
-                        fmt_a2 = wb.add_format(dict(base_fmt, bg_color='#FFA500', font_color='white', bold=True))
-                        fmt_b1 = wb.add_format(dict(base_fmt, bg_color='#800000', font_color='white', bold=True))
-                        fmt_b2 = wb.add_format(dict(base_fmt, bg_color='#006400', font_color='white', bold=True))
-                        fmt_pre = wb.add_format(dict(base_fmt, bg_color='#604878', font_color='white', bold=True))
-                        
-                        fmt_blue = wb.add_format(dict(base_fmt, bg_color='#ADD8E6')) 
-
-                        ws_prog.set_column('A:B', 12)
-                        ws_prog.set_column('C:C', 20)
-                        ws_prog.set_column('E:I', 14)
-                        ws_prog.set_row(0, 20)
-
-                        for r, row in df_res.iterrows():
-                            excel_r = r + 1
-                            ws_prog.set_row(excel_r, 20)
-                            lvl = str(row['Seviye'])
-                            
-                            if lvl == "A1": c_fmt = fmt_a1
-                            elif lvl == "A2": c_fmt = fmt_a2
-                            elif lvl == "B1": c_fmt = fmt_b1
-                            elif lvl == "B2": c_fmt = fmt_b2
-                            elif lvl == "PreFaculty": c_fmt = fmt_pre
-                            else: c_fmt = fmt_default
-
-                            ws_prog.write(excel_r, 0, row['Sınıf'], c_fmt)
-                            ws_prog.write(excel_r, 1, row['Seviye'], c_fmt)
-                            ws_prog.write(excel_r, 2, row['Sınıf Danışmanı'], fmt_default)
-                            ws_prog.write(excel_r, 3, row['Zaman'], fmt_default)
-
-                            for c in range(4, 9):
-                                val = row.iloc[c]
-                                f = fmt_blue if val in native_names else fmt_default
-                                ws_prog.write(excel_r, c, val, f)
-
-                    st.download_button("Excel İndir", output_res.getvalue(), "ders_programi_final.xlsx")
-                
-                elif status == cp_model.UNKNOWN:
-                    st.error("⏳ **Zaman Aşımı (Timeout):** Sistem en ideal çözümü bulmaya çalışırken zorlandı.")
+        # --- SENARYO TARAMASI (WHAT-IF) ---
+        with st.expander("🧪 Senaryo Taraması (Sınıf Sayıları / Vardiyalar)"):
+            st.caption("Virgülle birden fazla değer girin; tüm kombinasyonlar paralel çözülür.")
+            grid = {}
+            g1, g2 = st.columns(2)
+            for i, (key, label) in enumerate([("a1", "A1"), ("a2", "A2"), ("b1", "B1"), ("b2", "B2"), ("pre", "PreFac")]):
+                col = g1 if i % 2 == 0 else g2
+                grid[f"count_{key}"] = parse_int_list(col.text_input(f"{label} Sayıları", str(class_settings[f"count_{key}"]), key=f"sw_c_{key}"))
+                grid[f"time_{key}"] = col.multiselect(f"{label} Zamanları", ["Sabah", "Öğle"], default=[class_settings[f"time_{key}"]], key=f"sw_t_{key}")
+            grid["max_teachers_per_class"] = parse_int_list(st.text_input("Sınıf Başına Max Hoca Değerleri", str(max_teachers_per_class)))
+            s1, s2, s3 = st.columns(3)
+            sweep_time = s1.number_input("Senaryo Başına Süre (sn)", 5, 600, 30)
+            sweep_cores = s2.number_input("Toplam Çekirdek Bütçesi", 1, 256, os.cpu_count() or 1)
+            sweep_workers = s3.number_input("Senaryo Başına Çekirdek", 1, 32, 2)
+
+            scenarios = expand_grid(
+                dict(class_settings, max_teachers_per_class=max_teachers_per_class,
+                     allow_native_advisor=allow_native_advisor, solve_mode=solve_mode, partner_rule=partner_rule),
+                {k: v for k, v in grid.items() if v},
+            )
+            st.write(f"Toplam senaryo: **{len(scenarios)}**")
+            if st.button("▶️ Taramayı Başlat", disabled=not scenarios):
+                with st.spinner("Senaryolar paralel çözülüyor..."):
+                    sweep_rows = run_sweep(teachers_list, scenarios, time_limit=float(sweep_time),
+                                           total_cores=int(sweep_cores), workers_per_scenario=int(sweep_workers))
+                st.session_state["sweep_rows"] = sweep_rows
+            if st.session_state.get("sweep_rows"):
+                st.dataframe(pd.DataFrame(st.session_state["sweep_rows"]))
+
+        # --- DÖNEM MODU (ÇOK HAFTALI, KAYAN UFUK) ---
+        with st.expander("📅 Dönem Modu (Takvimdeki Tüm Haftalar)"):
+            term_weeks, calendar_errors = cached_calendar(roster_hash, uploaded_file.name, uploaded_file.getvalue())
+            if term_weeks is None:
+                st.caption("Yüklenen Excel'de 'Takvim' sayfası yok (şablondaki örneğe bakın).")
+            elif calendar_errors:
+                st.error(f"🛑 Takvimde {len(calendar_errors)} hatalı hücre var.")
+                st.dataframe(pd.DataFrame(calendar_errors))
+            else:
+                teaching_weeks = sum(1 for w in term_weeks if w["Durum"] == "Ders")
+                st.caption(f"{len(term_weeks)} hafta, {teaching_weeks} ders haftası. Her hafta bir öncekinden "
+                           "ısınarak çözülür; danışmanlar hafta hafta aynı sınıfta tutulur.")
+                term_time = st.number_input("Dönem İçin Toplam Süre (sn)", 10, 7200, 30 * max(1, teaching_weeks))
+                term_key = make_cache_key(teachers_list, classes_list, {"weeks": str(term_weeks), "time": term_time,
+                                                                       "partner_rule": partner_rule,
+                                                                       "max_teachers_per_class": max_teachers_per_class})
+                native_roster = cached_native_names(roster_hash, teachers_list)
+                if st.button("▶️ Dönemi Çöz"):
+                    term_bar = st.progress(0.0)
+                    term_done = []
+
+                    def on_week(result):
+                        term_done.append(result)
+                        term_bar.progress(len(term_done) / len(term_weeks), text=f"Hafta {result['Hafta']}: {result['status']}")
+
+                    with st.spinner("Haftalar sırayla çözülüyor..."):
+                        term_results = solve_term(
+                            teachers_list, classes_list, term_weeks, time_limit=float(term_time),
+                            num_workers=resolved_profile["num_workers"],
+                            progress=on_week,
+                            allow_native_advisor=allow_native_advisor, reduce_mode=True,
+                            max_teachers_per_class=max_teachers_per_class, partner_rule=partner_rule,
+                        )
+                    st.session_state["term_result"] = {"key": term_key, "results": term_results, "run_id": time.time_ns()}
+                    for r in term_results:
+                        if r.get("schedule") and not r.get("reused"):
+                            get_schedule_store().save(r, archive_term, archive_department, term_key,
+                                                      {"Hafta": r["Hafta"]}, native_roster, label=f"Hafta {r['Hafta']}")
+                term_state = st.session_state.get("term_result")
+                if term_state is not None and term_state["key"] == term_key:
+                    summary = term_summary(term_state["results"])
+                    st.dataframe(pd.DataFrame(summary))
+                    term_output = cached_term_workbook(term_key, term_state["run_id"], term_state["results"], summary,
+                                                       native_roster)
+                    st.download_button("Dönem Programını İndir", term_output, "donem_programi.xlsx")
+
+        solution_cache = get_solution_cache()
+        solve_settings = {
+            "max_teachers_per_class": max_teachers_per_class,
+            "allow_native_advisor": allow_native_advisor,
+            "allow_empty_slots": allow_empty_slots,
+            "reduce_mode": True,
+            "solve_mode": solve_mode,
+            "partner_rule": partner_rule,
+            "solver_profile": solver_profile_name,
+            "random_seed": random_seed,
+            "previous_schedule": make_cache_key(previous_rows, [], {"minimal_change": minimal_change}) if previous_rows else "",
+        }
+        cache_key = make_cache_key(teachers_list, classes_list, solve_settings)
+
+        # Aynı anda tek çözüm çalışır; çalışan iş varken buton kapalıdır.
+        job = st.session_state.get("solve_job")
+        job_running = job is not None and job.running
+        if unfillable > 0 and not allow_empty_slots:
+            st.error(f"🛑 {unfillable} ders saati hiçbir atamayla doldurulamaz; boş ders izni kapalıyken çözüm başlatılmadı.")
+        elif st.button("🚀 Programı Oluştur", disabled=job_running):
+            cached = solution_cache.get(cache_key)
+            if cached is not None:
+                st.session_state["solve_result"] = {"key": cache_key, "payload": cached, "from_cache": True, "run_id": None}
+            else:
+                st.session_state["solve_job"] = SolveJob(
+                    teachers_list, classes_list, key=cache_key,
+                    allow_native_advisor=allow_native_advisor, reduce_mode=True, solve_mode=solve_mode,
+                    hint_schedule=previous_rows, minimal_change=minimal_change,
+                    max_teachers_per_class=max_teachers_per_class, partner_rule=partner_rule,
+                    profile=solver_profile_name, random_seed=random_seed, instrument=instrument,
+                ).start()
+                st.session_state["solve_job_settings"] = solve_settings
+
+        # --- ARKA PLAN ÇÖZÜMÜ (Rerun'larda yeniden başlamaz) ---
+        # Çalışan iş, ayarlar sonradan değişse de görünür ve durdurulabilir kalır; sonucu
+        # kendi anahtarıyla saklanır ve o ayarlara dönülünce gösterilir.
+        job = st.session_state.get("solve_job")
+        if job is not None:
+            if job.running:
+                st.info("⏳ Matematiksel model çözülüyor... (Tercih Motoru Devrede)")
+                if job.key != cache_key:
+                    st.warning("⚠️ Bu çözüm ayarlar değişmeden önce başlatıldı. Yeni ayarlarla çözmek için önce durdurun.")
+                latest = job.latest
+                if latest:
+                    p1, p2, p3, p4 = st.columns(4)
+                    p1.metric("Amaç Değeri", f"{latest['objective']:,.0f}")
+                    p2.metric("Boşluk (Gap)", f"%{latest['gap'] * 100:.2f}")
+                    p3.metric("En İyi Sınır", f"{latest['bound']:,.0f}")
+                    p4.metric("Süre", f"{latest['elapsed']:.1f} sn")
+                    if latest["tier"]:
+                        st.caption(f"Kademe: {latest['tier']}")
+                if st.button("⏹️ Durdur ve En İyi Çözümü Kullan", disabled=job.stopped):
+                    job.stop()
+                time.sleep(1.0)
+                st.rerun()
+            else:
+                del st.session_state["solve_job"]
+                job_settings = st.session_state.pop("solve_job_settings", solve_settings)
+                if job.error is not None:
+                    st.error(f"❌ Çözüm sırasında hata oluştu: {job.error}")
+                else:
+                    if job.status_name in ("OPTIMAL", "FEASIBLE"):
+                        # Süre dolunca ya da durdurulunca gelen FEASIBLE çözüm yarımdır; daha uzun bir
+                        # çözüm onu iyileştirebilir. Önbelleğe sadece optimal olduğu ispatlanan çözüm girer.
+                        if job.status_name == "OPTIMAL" and not job.stopped:
+                            solution_cache.put(job.key, job.result)
+                        native_roster = build_teacher_table(job.teachers_list).native_names()
+                        get_schedule_store().save(job.result, archive_term, archive_department, job.key,
+                                                  job_settings, native_roster)
+                        st.balloons()
+                    st.session_state["solve_result"] = {"key": job.key, "payload": job.result, "from_cache": False,
+                                                        "run_id": time.time_ns()}
+
+        solve_result = st.session_state.get("solve_result")
+        if solve_result is not None and solve_result["key"] == cache_key:
+            payload = solve_result["payload"]
+            status_name = payload["status"]
+            if solve_result["from_cache"]:
+                st.caption("⚡ Aynı girdilerle önceki çözüm önbellekten getirildi.")
+
+            if status_name in ("OPTIMAL", "FEASIBLE"):
+                res_data, stats, violations = payload["schedule"], payload["stats"], payload["violations"]
+                native_names = cached_native_names(roster_hash, teachers_list)
+
+                df_res = pd.DataFrame(res_data)
+                df_stats = pd.DataFrame(stats)
+                df_violations = pd.DataFrame(violations).drop_duplicates() if violations else pd.DataFrame()
+
+                if not df_violations.empty:
+                    st.warning(f"⚠️ İhtiyaçtan dolayı {len(df_violations)} noktada kurallar esnetildi.")
+                    st.table(df_violations)
                 else:
-                    st.error("❌ **Çözüm Bulunamadı (Infeasible):** Lütfen Analiz Uyarılarını Kontrol Edin.")
+                    st.success("✅ Kusursuz Çözüm!")
+
+                st.dataframe(df_res)
+                st.dataframe(df_stats)
+
+                # Aynı çalıştırmayı tekrarlayabilmek için profil ve çözücü istatistikleri.
+                run_info = {
+                    "Profil": SOLVER_PROFILES[solver_profile_name]["label"],
+                    "Çözüm Modu": solve_mode,
+                    "Süre Sınırı (sn)": resolved_profile["time_limit"],
+                    "Çekirdek": resolved_profile["num_workers"],
+                    "Tohum": random_seed,
+                }
+                run_info.update({f"CP-SAT {k}": v for k, v in resolved_profile["params"].items() if k != "random_seed"})
+                run_info.update(payload.get("solver_stats") or {})
+
+                output_res = cached_result_workbook(cache_key, solve_result["run_id"], res_data, stats, violations,
+                                                    native_names, run_info)
+                st.download_button("Excel İndir", output_res, "ders_programi_final.xlsx")
+
+            elif status_name == "UNKNOWN":
+                st.error("⏳ **Zaman Aşımı (Timeout):** Sistem en ideal çözümü bulmaya çalışırken zorlandı.")
+            else:
+                st.error("❌ **Çözüm Bulunamadı (Infeasible):** Lütfen Analiz Uyarılarını Kontrol Edin.")
+                conflicts = payload.get("conflicts")
+                if conflicts:
+                    st.markdown("**Birbiriyle çakışan kurallar** (herhangi birini gevşetmek çözümü mümkün kılar):")
+                    st.table(pd.DataFrame(conflicts))
+
+            # --- MODEL VE ÇÖZÜCÜ ÖLÇÜMLERİ ---
+            instrumentation = payload.get("instrumentation")
+            if instrumentation:
+                with st.expander("🔬 Model Kurulumu ve Çözücü Ölçümleri"):
+                    build_stats = instrumentation.get("Kurulum") or {}
+                    m1, m2, m3 = st.columns(3)
+                    m1.metric("Kurulum Süresi", f"{build_stats.get('Toplam Süre (ms)', 0) / 1000:.2f} sn")
+                    m2.metric("Değişken", f"{build_stats.get('Değişken', 0):,}")
+                    m3.metric("Kısıt", f"{build_stats.get('Kısıt', 0):,}")
+                    if build_stats.get("Aileler"):
+                        st.dataframe(pd.DataFrame(build_stats["Aileler"]))
+                    if instrumentation.get("Çözücü"):
+                        st.table(pd.DataFrame(list(instrumentation["Çözücü"].items()), columns=["Ölçüm", "Değer"]).astype(str))
+                    st.download_button("Ölçüm Kaydı (JSON)", json.dumps(instrumentation, ensure_ascii=False, indent=2),
+                                       "olcum_kaydi.json", mime="application/json")
+
+# --- PROGRAM ARŞİVİ (Yeniden çözmeden yükleme ve sürüm karşılaştırma) ---
+with st.expander(f"🗂️ Kayıtlı Programlar ({archive_term} / {archive_department})"):
+    schedule_store = get_schedule_store()
+    saved_versions = schedule_store.versions(archive_term, archive_department)
+    if not saved_versions:
+        st.caption("Bu dönem ve bölüm için kayıtlı program yok. Başarılı her çözüm otomatik kaydedilir.")
+    else:
+        version_labels = {v["id"]: " · ".join(filter(None, [f"#{v['id']}", v["label"], v["created_at"], v["status"]]))
+                          for v in saved_versions}
+        version_ids = list(version_labels)
+        chosen_version = st.selectbox("Sürüm", version_ids, format_func=version_labels.get, key="archive_version")
+        loaded, archive_output = cached_version(chosen_version)
+        st.dataframe(pd.DataFrame(loaded["schedule"]))
+        st.download_button("Bu Sürümü Excel İndir", archive_output, f"ders_programi_v{chosen_version}.xlsx")
+
+        if len(version_ids) > 1:
+            compare_to = st.selectbox("Karşılaştırılacak Sürüm", [v for v in version_ids if v != chosen_version],
+                                      format_func=version_labels.get, key="archive_compare")
+            changes = cached_version_diff(compare_to, chosen_version)
+            if changes:
+                st.write(f"**{len(changes)}** hücre değişti (#{compare_to} → #{chosen_version}).")
+                st.dataframe(pd.DataFrame(changes))
+            else:
+                st.success("İki sürüm aynı.")
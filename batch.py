@@ -0,0 +1,167 @@
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import time
+
+from engine import (
+    class_config_from_settings, create_automated_classes, analyze_data, generate_schedule, build_reports,
+    explain_infeasibility, solver_stats, build_teacher_table,
+)
+from export import write_schedule_workbook
+from ingest import load_roster
+from sweep import split_cores
+
+ROSTER_EXTENSIONS = (".xlsx", ".csv", ".parquet")
+SUMMARY_FILE = "ozet.csv"
+SUMMARY_COLUMNS = ["Bölüm", "Dosya", "Hoca Sayısı", "Sınıf Sayısı", "Durum", "Boş Ders", "İhlal", "Süre (sn)", "Çıktı"]
+
+# Ayar dosyasında bölüm verilmemişse kullanılan değerler (kenar çubuğu varsayılanları).
+DEFAULT_SETTINGS = {
+    "count_a1": 4, "time_a1": "Sabah", "count_a2": 4, "time_a2": "Sabah",
+    "count_b1": 4, "time_b1": "Sabah", "count_b2": 2, "time_b2": "Sabah",
+    "count_pre": 0, "time_pre": "Sabah",
+    "allow_native_advisor": False, "max_teachers_per_class": 3, "partner_rule": "soft", "solve_mode": "weighted",
+}
+
+
+# --- GİRDİLER ---
+def find_rosters(input_dir):
+    # Excel'in açık dosyalar için bıraktığı '~$' kilit dosyaları atlanır.
+    return sorted(
+        os.path.join(input_dir, f) for f in os.listdir(input_dir)
+        if os.path.splitext(f)[1].lower() in ROSTER_EXTENSIONS and not f.startswith("~$")
+    )
+
+def department_settings(settings_map, department):
+    # settings_map: {"default": {...}, "<dosya adı (uzantısız)>": {...}}; bölüm ayarı varsayılanın üstüne yazılır.
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(settings_map.get("default", {}))
+    settings.update(settings_map.get(department, {}))
+    return settings
+
+
+# --- TEK BÖLÜM ---
+def _write_rows(path, rows):
+    with open(path, "w", encoding="utf-8-sig", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def run_department(path, settings, output_dir, time_limit=120.0, num_workers=2):
+    # Ayrı süreçte çalışır; sonuç özet CSV'sinin bir satırıdır. Program çalışma kitabı,
+    # girdi hataları ve çakışma açıklamaları output_dir altına bölüm adıyla yazılır.
+    started = time.monotonic()
+    department = os.path.splitext(os.path.basename(path))[0]
+    row = dict.fromkeys(SUMMARY_COLUMNS, "")
+    row.update({"Bölüm": department, "Dosya": os.path.basename(path)})
+
+    def finish(status, output=""):
+        row.update({"Durum": status, "Çıktı": output, "Süre (sn)": round(time.monotonic() - started, 2)})
+        return row
+
+    try:
+        teachers_list, errors = load_roster(path)
+    except ValueError as exc:
+        return finish(f"OKUNAMADI: {exc}")
+    row["Hoca Sayısı"] = len(teachers_list)
+    if errors:
+        output = os.path.join(output_dir, f"{department}_girdi_hatalari.csv")
+        _write_rows(output, errors)
+        return finish(f"GİRDİ HATASI ({len(errors)})", output)
+
+    classes_list = create_automated_classes(class_config_from_settings(settings))
+    row["Sınıf Sayısı"] = len(classes_list)
+    logic_errors, _ = analyze_data(teachers_list, classes_list, settings["allow_native_advisor"])
+    if logic_errors:
+        output = os.path.join(output_dir, f"{department}_mantik_hatalari.csv")
+        _write_rows(output, [{"Hata": e} for e in logic_errors])
+        return finish(f"MANTIK HATASI ({len(logic_errors)})", output)
+
+    status, solver, x, advisor_var, adjusted_targets, days, day_names, sessions = generate_schedule(
+        teachers_list, classes_list, settings["allow_native_advisor"], reduce_mode=True,
+        time_limit=time_limit, num_workers=num_workers, solve_mode=settings["solve_mode"],
+        max_teachers_per_class=settings["max_teachers_per_class"], partner_rule=settings["partner_rule"],
+    )
+    status_name = solver.StatusName(status)
+    if status_name in ("OPTIMAL", "FEASIBLE"):
+        res_data, stats, violations = build_reports(solver, x, advisor_var, teachers_list, classes_list, adjusted_targets)
+        row["Boş Ders"] = sum(1 for r in res_data for d in day_names if r[d] == "🔴 BOŞ")
+        row["İhlal"] = len({tuple(v.items()) for v in violations})
+        run_info = dict(settings, **{"Süre Sınırı (sn)": time_limit, "Çekirdek": num_workers})
+        run_info.update(solver_stats(solver, status))
+        native_names = build_teacher_table(teachers_list).native_names()
+        output = os.path.join(output_dir, f"{department}_program.xlsx")
+        write_schedule_workbook(output, res_data, stats, violations, native_names, run_info)
+        return finish(status_name, output)
+    if status_name == "INFEASIBLE":
+        conflicts = explain_infeasibility(teachers_list, classes_list, settings["allow_native_advisor"])
+        if conflicts:
+            output = os.path.join(output_dir, f"{department}_cakismalar.csv")
+            _write_rows(output, conflicts)
+            return finish(status_name, output)
+    return finish(status_name)
+
+
+# --- TOPLU ÇALIŞTIRMA ---
+def run_batch(input_dir, output_dir, settings_map=None, time_limit=120.0, total_cores=None, workers_per_job=2,
+              progress=None):
+    # Bölümler sınırlı bir süreç havuzunda çözülür (bkz. sweep.split_cores); özet CSV her
+    # zaman yazılır, bir bölümdeki hata diğerlerini durdurmaz.
+    settings_map = settings_map or {}
+    os.makedirs(output_dir, exist_ok=True)
+    paths = find_rosters(input_dir)
+    workers_per_job, max_parallel = split_cores(total_cores, workers_per_job)
+
+    rows = [None] * len(paths)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(max_parallel, max(1, len(paths)))) as pool:
+        futures = {}
+        for i, path in enumerate(paths):
+            settings = department_settings(settings_map, os.path.splitext(os.path.basename(path))[0])
+            futures[pool.submit(run_department, path, settings, output_dir, time_limit, workers_per_job)] = i
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            try:
+                rows[i] = future.result()
+            except Exception as exc:
+                rows[i] = dict.fromkeys(SUMMARY_COLUMNS, "")
+                rows[i].update({"Bölüm": os.path.splitext(os.path.basename(paths[i]))[0],
+                                "Dosya": os.path.basename(paths[i]), "Durum": f"HATA: {exc}"})
+            if progress:
+                progress(rows[i])
+
+    with open(os.path.join(output_dir, SUMMARY_FILE), "w", encoding="utf-8-sig", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bir klasördeki tüm bölüm kadrolarını toplu çözer")
+    parser.add_argument("input_dir", help="Ogretmenler çalışma kitaplarının (xlsx/csv/parquet) bulunduğu klasör")
+    parser.add_argument("--output", default="toplu_sonuc", help="sonuç klasörü")
+    parser.add_argument("--settings", help='bölüm ayarları JSON dosyası: {"default": {...}, "<bölüm>": {...}}')
+    parser.add_argument("--time-limit", type=float, default=120.0, help="bölüm başına çözüm süresi (sn)")
+    parser.add_argument("--cores", type=int, default=None, help="toplam çekirdek bütçesi (varsayılan: tümü)")
+    parser.add_argument("--workers-per-job", type=int, default=2, help="bölüm başına CP-SAT işçisi")
+    args = parser.parse_args(argv)
+
+    settings_map = {}
+    if args.settings:
+        with open(args.settings, encoding="utf-8") as fh:
+            settings_map = json.load(fh)
+
+    def report(row):
+        print(f"{row['Bölüm']:<24} {row['Durum']:<12} boş={row['Boş Ders'] if row['Boş Ders'] != '' else '-'} "
+              f"{row['Süre (sn)'] or 0:.1f}s")
+
+    rows = run_batch(args.input_dir, args.output, settings_map, args.time_limit, args.cores,
+                     args.workers_per_job, progress=report)
+    print(f"{len(rows)} bölüm çözüldü; özet: {os.path.join(args.output, SUMMARY_FILE)}")
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import json
+import platform
+import random
+import time
+
+from engine import (
+    DAY_NAMES, LEVELS, create_automated_classes, build_model, solve_model, generate_schedule, instrumentation_record,
+)
+
+DEFAULT_SIZES = (10, 50, 150, 300)
+
+# Gerçek kadrolardan gözlenen yaklaşık dağılımlar.
+ROLE_WEIGHTS = {"Danışman": 45, "Destek": 25, "Native": 15, "Ek Görevli": 15}
+PREF_WEIGHTS = {"Farketmez": 40, "Sabah": 35, "Öğle": 25}
+LEVEL_WEIGHTS = {"A1": 30, "A2": 28, "B1": 22, "B2": 12, "PreFaculty": 8}
+
+
+def _weighted_choice(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+# --- SENTETİK KADRO ÜRETİCİ ---
+def generate_instance(n_classes, seed=0, capacity_ratio=1.05):
+    # Aynı (n_classes, seed) her zaman aynı kadroyu üretir.
+    rng = random.Random(seed * 100003 + n_classes)
+
+    counts = dict.fromkeys(LEVELS, 0)
+    for _ in range(n_classes):
+        counts[_weighted_choice(rng, LEVEL_WEIGHTS)] += 1
+    config = [(counts[lvl], lvl, rng.randint(0, 1)) for lvl in LEVELS]
+    classes = create_automated_classes(config)
+
+    needed = sum(3 if c['Seviye'] == 'PreFaculty' else 5 for c in classes)
+    teachers = []
+    supplied = 0
+    while supplied < needed * capacity_ratio:
+        i = len(teachers)
+        role = _weighted_choice(rng, ROLE_WEIGHTS)
+        target = 2 if role == "Ek Görevli" else rng.choice([3, 4, 5, 5])
+
+        r = rng.random()
+        if r < 0.6:
+            competence = "Hepsi"
+        else:
+            start = rng.randint(0, len(LEVELS) - 2)
+            competence = ",".join(LEVELS[start:start + rng.randint(2, 3)])
+
+        r = rng.random()
+        if r < 0.6:
+            forbidden = ""
+        elif r < 0.9:
+            forbidden = rng.choice(DAY_NAMES)
+        else:
+            forbidden = ",".join(rng.sample(DAY_NAMES, 2))
+
+        teachers.append({
+            'Ad Soyad': f"Hoca {i + 1:03d}",
+            'Rol': role,
+            'Hedef Ders Sayısı': target,
+            'Tercih (Sabah/Öğle)': _weighted_choice(rng, PREF_WEIGHTS),
+            'Yasaklı Günler': forbidden,
+            'Sabit Sınıf': '',
+            'Yetkinlik (Seviyeler)': competence,
+            'İstenmeyen Partner': '',
+        })
+        supplied += min(target, 5 - (len(forbidden.split(',')) if forbidden else 0))
+
+    # Danışmanların yaklaşık üçte biri yetkin oldukları ayrı bir sınıfa sabitlenir.
+    free_classes = list(classes)
+    rng.shuffle(free_classes)
+    for t in teachers:
+        if t['Rol'] != "Danışman" or rng.random() > 0.33:
+            continue
+        allowed = t['Yetkinlik (Seviyeler)']
+        match = next((c for c in free_classes if allowed == "Hepsi" or c['Seviye'] in allowed), None)
+        if match is not None:
+            t['Sabit Sınıf'] = match['Sınıf Adı']
+            free_classes.remove(match)
+
+    return teachers, classes
+
+
+# --- ÖLÇÜM ---
+def run_case(n_classes, seed=0, time_limit=60.0, num_workers=8, solve_mode="weighted"):
+    teachers, classes = generate_instance(n_classes, seed)
+
+    if solve_mode == "decomposed":
+        # Ayrıştırılmış mod kendi alt modellerini kurar; kurulum süresi çözüme dahildir.
+        instrumentation = {}
+        started = time.perf_counter()
+        status, solver, *_ = generate_schedule(teachers, classes, reduce_mode=True, time_limit=time_limit,
+                                               num_workers=num_workers, solve_mode=solve_mode,
+                                               instrumentation=instrumentation)
+        solve_time = time.perf_counter() - started
+        build_time = 0.0
+        num_variables = num_constraints = None
+    else:
+        started = time.perf_counter()
+        built = build_model(teachers, classes, reduce_mode=True)
+        build_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        status, solver = solve_model(built, time_limit=time_limit, num_workers=num_workers, solve_mode=solve_mode,
+                                     solver_params={"log_search_progress": True})
+        solve_time = time.perf_counter() - started
+        num_variables, num_constraints = built.num_variables(), built.num_constraints()
+        instrumentation = instrumentation_record(built, solver, status)
+
+    status_name = solver.StatusName(status)
+    record = {
+        "n_classes": len(classes),
+        "n_teachers": len(teachers),
+        "seed": seed,
+        "solve_mode": solve_mode,
+        "num_variables": num_variables,
+        "num_constraints": num_constraints,
+        "build_time": round(build_time, 4),
+        "solve_time": round(solve_time, 4),
+        "status": status_name,
+        "objective": None,
+        "bound": None,
+        "gap": None,
+        "instrumentation": instrumentation,
+    }
+    if status_name in ("OPTIMAL", "FEASIBLE"):
+        objective = solver.ObjectiveValue()
+        bound = solver.BestObjectiveBound()
+        record.update({
+            "objective": objective,
+            "bound": bound,
+            "gap": abs(bound - objective) / max(1.0, abs(objective)),
+        })
+    return record
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, seed=0, time_limit=60.0, num_workers=8, solve_mode="weighted"):
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "time_limit": time_limit,
+        "num_workers": num_workers,
+        "cases": [run_case(n, seed, time_limit, num_workers, solve_mode) for n in sizes],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ders programı motoru ölçeklenme ölçümü")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="sınıf sayıları")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=60.0, help="durum başına çözüm süresi (sn)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--mode", choices=["weighted", "tiered", "decomposed"], default="weighted")
+    parser.add_argument("--output", default="bench_report.json")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.sizes, args.seed, args.time_limit, args.workers, args.mode)
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+    for case in report["cases"]:
+        print(f"{case['n_classes']:>4} sınıf | {case['num_variables'] or '-':>7} değişken | "
+              f"kurulum {case['build_time']:.2f}s | çözüm {case['solve_time']:.2f}s | {case['status']}")
+
+
+if __name__ == "__main__":
+    main()
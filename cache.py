@@ -0,0 +1,97 @@
+import collections
+import hashlib
+import json
+import os
+import threading
+
+
+# --- ANAHTAR NORMALİZASYONU ---
+def _normalize_value(v):
+    # Excel'den gelen 4, 4.0 ve "4 " aynı girdidir; numpy sayıları da düz Python'a indirgenir.
+    if hasattr(v, "item"):
+        v = v.item()
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    if isinstance(v, (int, float)):
+        return v
+    return str(v).strip()
+
+def _normalize_record(record):
+    return {str(k).strip(): _normalize_value(v) for k, v in record.items()}
+
+def make_cache_key(teachers, classes, settings):
+    payload = {
+        "teachers": [_normalize_record(t) for t in teachers],
+        "classes": [_normalize_record(c) for c in classes],
+        "settings": _normalize_record(settings),
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# --- ÇÖZÜM ÖNBELLEĞİ (LRU + DİSK) ---
+class SolutionCache:
+    def __init__(self, directory, max_entries=64):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+
+        # Diskteki kayıtlar son erişim zamanına göre sıralanarak LRU sırası geri kurulur.
+        files = [f for f in os.listdir(directory) if f.endswith(".json")]
+        files.sort(key=lambda f: os.path.getmtime(os.path.join(directory, f)))
+        for f in files:
+            self._entries[f[:-len(".json")]] = None
+        self._evict()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            value = self._entries[key]
+            if value is None:
+                try:
+                    with open(self._path(key), encoding="utf-8") as fh:
+                        value = json.load(fh)
+                except (OSError, ValueError):
+                    del self._entries[key]
+                    return None
+                self._entries[key] = value
+            self._entries.move_to_end(key)
+            try:
+                os.utime(self._path(key))
+            except OSError:
+                pass
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(value, fh, ensure_ascii=False, default=_normalize_value)
+            os.replace(tmp_path, self._path(key))
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,240 @@
+import collections
+import concurrent.futures
+
+from engine import (
+    DAYS, DAY_NAMES, SESSIONS, LEVELS, LEVEL_BITS, PREF_MORNING, PREF_AFTERNOON,
+    build_teacher_table, compute_capacity, build_model, solve_model, new_solver, extract_assignment, schedule_rows,
+    schedule_hints, open_days, instrumentation_record, _solve_with_control,
+)
+
+# Süre bütçesinin bölüşümü: ana (master) adım küçük bir tamsayı modelidir,
+# vardiya alt problemleri paralel çözülür, kalan süre birleştirilmiş programın onarımına gider.
+MASTER_SHARE = 0.1
+MASTER_MAX_TIME = 5.0
+SUBPROBLEM_SHARE = 0.6
+
+
+# --- ANA ADIM: HOCA SAATLERİNİN VARDİYALARA BÖLÜŞTÜRÜLMESİ ---
+def allocate_shift_hours(teachers_list, classes_list, time_limit=5.0, num_workers=8, table=None,
+                         solver_params=None, control=None):
+    # y[t, g]: hocanın (seviye, vardiya) grubuna vereceği saat. Gün/sınıf ayrıntısı yok,
+    # bu yüzden model T x 10 tamsayı değişkenle sınırlı kalır. Tercih edilmeyen vardiya
+    # ve iki vardiyaya bölünme (çift vardiya riski) hafifçe cezalandırılır.
+    from ortools.sat.python import cp_model
+
+    if table is None:
+        table = build_teacher_table(teachers_list, classes_list)
+    base_targets = compute_capacity(teachers_list, classes_list, table)["base_targets"]
+
+    need = {}
+    for c in classes_list:
+        g = (c['Seviye'], c['Zaman Kodu'])
+        need[g] = need.get(g, 0) + len(open_days(c['Seviye']))
+    groups = [(lvl, s) for lvl in LEVELS for s in SESSIONS if (lvl, s) in need]
+
+    model = cp_model.CpModel()
+    y = {}
+    group_cells = {g: [] for g in groups}
+    objective = []
+    for t_idx in range(len(table)):
+        free_days = [d for d in DAYS if not table.is_forbidden(t_idx, d)]
+        if table.is_native[t_idx]:
+            value = 4
+        elif table.is_ek[t_idx]:
+            value = 1
+        elif table.is_destek[t_idx]:
+            value = 2
+        else:
+            value = 3
+        shift_cells = {s: [] for s in SESSIONS}
+        for lvl, s in groups:
+            if not table.competence[t_idx] & LEVEL_BITS[lvl] or (table.is_native[t_idx] and lvl == "A1"):
+                continue
+            cap = len(set(free_days) & set(open_days(lvl)))
+            if cap == 0:
+                continue
+            var = model.NewIntVar(0, cap, f'y_{t_idx}_{lvl}_{s}')
+            y[(t_idx, s)] = y.get((t_idx, s), []) + [var]
+            shift_cells[s].append(var)
+            group_cells[(lvl, s)].append(var)
+            off_shift = (table.pref[t_idx] == PREF_MORNING and s == 1) or (table.pref[t_idx] == PREF_AFTERNOON and s == 0)
+            objective.append(var * (1000 + value - (50 if off_shift else 0)))
+
+        per_shift = []
+        for s, cells in shift_cells.items():
+            if not cells:
+                continue
+            model.Add(sum(cells) <= len(free_days))
+            uses = model.NewBoolVar(f'uses_{t_idx}_{s}')
+            model.Add(sum(cells) <= len(DAYS) * uses)
+            per_shift.append((s, sum(cells), uses))
+        if per_shift:
+            model.Add(sum(total for _, total, _ in per_shift) <= base_targets[t_idx])
+        if len(per_shift) == 2:
+            split = model.NewBoolVar(f'split_{t_idx}')
+            model.Add(per_shift[0][2] + per_shift[1][2] - 1 <= split)
+            objective.append(split * -10)
+
+        # Sabit danışman kendi sınıfının vardiyasında en az 1 saat almalı.
+        fixed_c = int(table.fixed_class[t_idx])
+        if fixed_c >= 0:
+            fixed_s = classes_list[fixed_c]['Zaman Kodu']
+            for s, total, _ in per_shift:
+                if s == fixed_s:
+                    model.Add(total >= min(1, base_targets[t_idx]))
+
+    for g, cells in group_cells.items():
+        if cells:
+            model.Add(sum(cells) <= need[g])
+
+    model.Maximize(sum(objective))
+    solver = new_solver(time_limit, num_workers, solver_params)
+    status = _solve_with_control(model, solver, control, "Ana Adım")
+
+    hours = [[0] * len(SESSIONS) for _ in range(len(table))]
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        for (t_idx, s), cells in y.items():
+            hours[t_idx][s] = sum(solver.Value(var) for var in cells)
+
+    # Kullanılmayan kapasite, hocanın zaten girdiği (yoksa tercih ettiği) vardiyaya verilir;
+    # alt problemler bu payla kendi içinde kırpma yapabilir.
+    for t_idx in range(len(table)):
+        leftover = base_targets[t_idx] - sum(hours[t_idx])
+        if leftover <= 0:
+            continue
+        if hours[t_idx][0] or hours[t_idx][1]:
+            s = 0 if hours[t_idx][0] >= hours[t_idx][1] else 1
+        else:
+            s = 1 if table.pref[t_idx] == PREF_AFTERNOON else 0
+        hours[t_idx][s] += leftover
+    return hours
+
+
+def advisor_shifts(table, classes_list, hours):
+    # Danışmanlık tek vardiyada yapılabilir: sabit sınıfın vardiyası, yoksa daha çok saat alınan vardiya.
+    shifts = []
+    for t_idx in range(len(table)):
+        fixed_c = int(table.fixed_class[t_idx])
+        if fixed_c >= 0:
+            shifts.append(classes_list[fixed_c]['Zaman Kodu'])
+        else:
+            shifts.append(0 if hours[t_idx][0] >= hours[t_idx][1] else 1)
+    return shifts
+
+
+# --- ALT PROBLEM ---
+def _solve_shift(teachers_sub, classes_sub, advisor_blocked, build_kwargs, time_limit, num_workers,
+                 solver_params=None, control=None, stage=None):
+    # Ayrı süreçte (canlı kontrol varsa iş parçacığında) çalışır; sonuç isimlerle yazılmış
+    # program satırları olarak döner (CP-SAT nesneleri süreçler arasında taşınamaz).
+    built = build_model(teachers_sub, classes_sub, advisor_blocked=advisor_blocked, **build_kwargs)
+    status, solver = solve_model(built, time_limit=time_limit, num_workers=num_workers, solver_params=solver_params,
+                                 control=control, stage=stage)
+    status_name = solver.StatusName(status)
+    if status_name not in ("OPTIMAL", "FEASIBLE"):
+        return status_name, []
+    # Birleştirme için sadece program satırları gerekir; istatistik ve ihlaller onarımdan sonra hesaplanır.
+    assignment, advisor = extract_assignment(solver, built.x, built.advisor_var, len(teachers_sub), len(classes_sub))
+    return status_name, schedule_rows(classes_sub, built.table.names, assignment, advisor)
+
+
+# --- AYRIŞTIRILMIŞ ÇÖZÜM ---
+def solve_decomposed(teachers_list, classes_list, allow_native_advisor=False, reduce_mode=True,
+                     time_limit=120.0, num_workers=8, control=None, max_teachers_per_class=None,
+                     partner_rule="soft", hint_schedule=None, minimal_change=False, solver_params=None,
+                     instrumentation=None, closed_days=(), advisor_continuity=False):
+    # 1) ana adım saatleri vardiyalara böler, 2) iki vardiya ayrı süreçlerde çözülür,
+    # 3) birleşik program tam modele ipucu olarak verilip kısa bir onarım çözümü yapılır.
+    # Dönüş değeri generate_schedule ile aynıdır (onarım çözümünün çözücüsü ve değişkenleri).
+    # control her aşamaya verilir; durdurulunca eldeki en iyi birleşik program döner.
+    table = build_teacher_table(teachers_list, classes_list)
+    master_time = min(MASTER_MAX_TIME, time_limit * MASTER_SHARE)
+    hours = allocate_shift_hours(teachers_list, classes_list, master_time, num_workers, table, solver_params, control)
+    adv_shift = advisor_shifts(table, classes_list, hours)
+
+    build_kwargs = {
+        "allow_native_advisor": allow_native_advisor, "reduce_mode": reduce_mode,
+        "max_teachers_per_class": max_teachers_per_class, "partner_rule": partner_rule,
+        "hint_schedule": hint_schedule, "minimal_change": minimal_change, "closed_days": closed_days,
+        "advisor_continuity": advisor_continuity,
+    }
+    jobs = []
+    for s in SESSIONS:
+        classes_sub = [c for c in classes_list if c['Zaman Kodu'] == s]
+        if not classes_sub:
+            continue
+        teachers_sub, advisor_blocked = [], []
+        for t_idx, t in enumerate(teachers_list):
+            fixed_c = int(table.fixed_class[t_idx])
+            fixed_here = fixed_c >= 0 and classes_list[fixed_c]['Zaman Kodu'] == s
+            if hours[t_idx][s] <= 0 and not fixed_here:
+                continue
+            sub = dict(t, **{'Hedef Ders Sayısı': hours[t_idx][s]})
+            if fixed_c >= 0 and not fixed_here:
+                sub['Sabit Sınıf'] = ''
+            if adv_shift[t_idx] != s:
+                advisor_blocked.append(len(teachers_sub))
+            teachers_sub.append(sub)
+        jobs.append((teachers_sub, classes_sub, advisor_blocked, "Sabah Vardiyası" if s == 0 else "Öğle Vardiyası"))
+
+    sub_time = time_limit * SUBPROBLEM_SHARE
+    sub_workers = max(1, num_workers // max(1, len(jobs)))
+    stitched = []
+    sub_statuses = []
+    if control is None:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=max(1, len(jobs)))
+    else:
+        # İlerleme ve durdurma nesnesi süreçler arasında taşınamaz; alt problemler bu süreçte
+        # iş parçacıklarında çözülür (CP-SAT çözüm sırasında GIL'i bırakır).
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(jobs)))
+    with executor as pool:
+        futures = [
+            pool.submit(_solve_shift, teachers_sub, classes_sub, advisor_blocked, build_kwargs, sub_time, sub_workers,
+                        solver_params, control, stage)
+            for teachers_sub, classes_sub, advisor_blocked, stage in jobs
+        ]
+        for future in futures:
+            status_name, rows = future.result()
+            sub_statuses.append(status_name)
+            stitched.extend(rows)
+
+    # Onarım: alt çözümler birleşince tam modelde de geçerlidir (vardiyalar arası tek bağ
+    # hedef ve danışmanlık, ikisi de ana adımda bölüşüldü). Aynı gün iki vardiyaya düşen
+    # hocaların hücreleri dışındaki tüm atamalar sabitlenir; tam model sadece çakışan
+    # hücreleri ve boş slotları yeniden çözer, böylece birleşik çözümden geriye gidemez.
+    built = build_model(
+        teachers_list, classes_list, allow_native_advisor, reduce_mode, symmetry_breaking=False,
+        hint_schedule=stitched or hint_schedule, max_teachers_per_class=max_teachers_per_class,
+        partner_rule=partner_rule, closed_days=closed_days,
+    )
+    x_hint, adv_hint = schedule_hints(teachers_list, classes_list, stitched)
+    shifts_of = collections.defaultdict(set)
+    for t_idx, c_idx, d, s in x_hint:
+        shifts_of[(t_idx, d)].add(s)
+    for key in x_hint:
+        if key in built.x and len(shifts_of[(key[0], key[2])]) == 1:
+            built.model.Add(built.x[key] == 1)
+
+    repair_time = max(1.0, time_limit - master_time - sub_time)
+    status, solver = solve_model(built, time_limit=repair_time, num_workers=num_workers, control=control,
+                                 solver_params=solver_params, stage="Onarım")
+    if solver.StatusName(status) not in ("OPTIMAL", "FEASIBLE") and stitched and control is not None and control.stopped:
+        # Onarım bir çözüm bulamadan durduruldu: birleşik program olduğu gibi sabitlenir ve
+        # ilk (tek) çözümüyle döndürülür; alt problemlerin emeği kaybolmaz.
+        for key in x_hint:
+            if key in built.x:
+                built.model.Add(built.x[key] == 1)
+        for key in adv_hint:
+            if key in built.advisor_var:
+                built.model.Add(built.advisor_var[key] == 1)
+        status, solver = solve_model(built, time_limit=repair_time, num_workers=num_workers,
+                                     solver_params=dict(solver_params or {}, stop_after_first_solution=True))
+    if instrumentation is not None:
+        # Ölçüm onarım modelinindir; ana adım ve alt problem bütçeleri ayrıca eklenir.
+        instrumentation.update(instrumentation_record(built, solver, status))
+        instrumentation["Ayrıştırma"] = {"Ana Adım Bütçesi (sn)": master_time, "Alt Problem Bütçesi (sn)": sub_time,
+                                         "Alt Problem Durumları": sub_statuses}
+    adjusted_targets = built.adjusted_targets
+    if solver.StatusName(status) in ("OPTIMAL", "FEASIBLE"):
+        adjusted_targets = built.solved_targets(solver)
+    return status, solver, built.x, built.advisor_var, adjusted_targets, DAYS, DAY_NAMES, SESSIONS
@@ -0,0 +1,1371 @@
+import collections
+import re
+import threading
+import time
+
+# --- SABİTLER ---
+DAYS = range(5)
+DAY_NAMES = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
+SESSIONS = range(2)
+LEVELS = ["A1", "A2", "B1", "B2", "PreFaculty"]
+
+# Kademeli (lexicographic) çözümde amaç terimlerinin öncelik sırası:
+# yasaklı günler > doluluk > çift vardiya / partner cezaları > kırpma (hangi hocanın saati boş kalır)
+# > danışman varlığı > Native şelalesi ve vardiya tercihleri
+# > önceki programdan sapmama (sadece minimum değişiklik modunda doludur)
+# Ağırlıklı modda yasaklı gün cezası bir hücrenin doluluk ödülünden büyüktür, yani yasaklı
+# güne hiç ders konmaz; kademeli mod aynı sonucu vermek için bu kademeyi doluluktan önce çözer.
+OBJECTIVE_TIERS = ["forbidden", "coverage", "penalties", "trimming", "advisor", "preferences", "stability"]
+TIER_TIME_SHARES = {"forbidden": 0.05, "coverage": 0.3, "penalties": 0.15, "trimming": 0.1, "advisor": 0.15,
+                    "preferences": 0.15, "stability": 0.1}
+
+# Kırpma modunda hocanın kullanılan her saatinin değeri: düşük değerli rolün saatleri
+# önce boş bırakılır (Ek Görevli < Destek < diğerleri), Native ve sabit danışmanın ilk
+# saati fiilen korunur. Aynı rol içinde her ek kırpılan saat TRIM_STEP kadar pahalılaşır,
+# böylece kırpma hocalar arasında eşit yayılır.
+TRIM_WEIGHT_EK = 1000000
+TRIM_WEIGHT_DESTEK = 4000000
+TRIM_WEIGHT_OTHER = 8000000
+TRIM_WEIGHT_PROTECTED = 30000000
+TRIM_STEP = 100000
+
+# Danışman sürekliliği (dönem planı): önceki haftanın danışmanı aynı sınıfta kalırsa verilen
+# ödül. Başka bir danışmanın alabileceği Pazartesi + 2/3 gün ödüllerinin toplamından büyük,
+# tek bir hücrenin doluluk ödülünden küçüktür; süreklilik hiçbir dersi boş bırakmaz.
+ADVISOR_CONTINUITY_BONUS = 95000000
+
+# Çözücü profilleri: süre, çekirdek payı ve CP-SAT arama ayarları. İşçi sayısı makinenin
+# çekirdek sayısından türetilir. Sabit tohum aynı sonucu yalnızca tek işçiyle (num_workers=1)
+# ve süre sınırına takılmadan biten çözümlerde verir; çok işçili, duvar saati sınırlı
+# çalıştırmalarda (varsayılan profiller) sonuç çalıştırmadan çalıştırmaya değişebilir.
+SOLVER_PROFILES = {
+    "quick": {"label": "Hızlı Taslak", "time_limit": 20.0, "max_workers": 4,
+              "params": {"linearization_level": 0, "use_lns": True, "relative_gap_limit": 0.05}},
+    "balanced": {"label": "Dengeli", "time_limit": 120.0, "max_workers": 8,
+                 "params": {"linearization_level": 1, "use_lns": True, "relative_gap_limit": 0.01}},
+    "exhaustive": {"label": "Kapsamlı", "time_limit": 600.0, "max_workers": None,
+                   "params": {"linearization_level": 2, "use_lns": True, "relative_gap_limit": 0.0}},
+}
+
+# Kesin kural aileleri (çözümsüzlük açıklamasında kullanıcıya gösterilen adlar).
+# Ters oturum, PreFaculty Perşembe/Cuma ve Native-A1 yasakları hücre hiç yaratılmayarak
+# uygulanır; hiçbir hücre 1'e zorlanmadığından bu yasaklar tek başına çakışma üretemez.
+RULE_CLASH = "Fiziksel Çakışma"
+RULE_CLASS_CAPACITY = "Sınıf Kapasitesi"
+RULE_ADVISOR_UNIQUE = "Danışman Tekilliği"
+RULE_FIXED_CLASS = "Sabit Sınıf"
+RULE_COMPETENCE = "Yetkinlik"
+RULE_ROLE = "Rol Kısıtları"
+RULE_EK_ONE_VISIT = "Ek Görevli Tek Ziyaret"
+
+
+# --- SINIF OLUŞTURMA ---
+def create_automated_classes(config):
+    # config: [(adet, seviye, zaman_kodu), ...]  zaman_kodu -> 0: Sabah, 1: Öğle
+    class_list = []
+    for count, lvl, time_code in config:
+        for i in range(1, count + 1):
+            class_name = f"{lvl}.{i:02d}"
+            class_list.append({"Sınıf Adı": class_name, "Seviye": lvl, "Zaman Kodu": time_code})
+    return class_list
+
+
+def class_config_from_settings(settings):
+    # settings: {"count_a1": 4, "time_a1": "Sabah", ...} -> create_automated_classes girdisi
+    config = []
+    for key, lvl in [("a1", "A1"), ("a2", "A2"), ("b1", "B1"), ("b2", "B2"), ("pre", "PreFaculty")]:
+        count = int(settings.get(f"count_{key}", 0))
+        time_code = 0 if settings.get(f"time_{key}", "Sabah") == "Sabah" else 1
+        config.append((count, lvl, time_code))
+    return config
+
+
+def open_days(level):
+    # PreFaculty sınıfları Perşembe ve Cuma kapalıdır.
+    return [d for d in DAYS if not (level == "PreFaculty" and d >= 3)]
+
+
+# --- GÜVENLİ STRİNG OKUYUCULAR ---
+def get_role(t):
+    return str(t['Rol']).upper().replace('İ', 'I').replace('i', 'I').replace('ı', 'I')
+
+def get_pref(t):
+    return str(t.get('Tercih (Sabah/Öğle)', 'Farketmez')).upper().replace('Ö', 'O').replace('ö', 'O').replace('Ğ', 'G').replace('ğ', 'G').strip()
+
+
+# --- ÖĞRETMEN TABLOSU ---
+# Tercih kodları oturum kodlarıyla hizalıdır: 0 Sabah, 1 Öğle, 2 Farketmez.
+PREF_MORNING, PREF_AFTERNOON, PREF_ANY = 0, 1, 2
+LEVEL_BITS = {lvl: 1 << i for i, lvl in enumerate(LEVELS)}
+ALL_LEVELS_MASK = (1 << len(LEVELS)) - 1
+
+
+class TeacherTable:
+    # Öğretmen kayıtlarının tek geçişte normalize edilmiş, dizi tabanlı hali.
+    # Model kurucular ve raporlar string ayrıştırmak yerine bu bayrak/bit maskelerini okur.
+    def __init__(self, names, target, is_native, is_ek, is_destek, competence, forbidden, pref,
+                 fixed_name, fixed_class, partner_pairs=(), unknown_partners=()):
+        self.names = names              # list[str]
+        self.target = target            # int  - Excel'deki 'Hedef Ders Sayısı'
+        self.is_native = is_native      # bool
+        self.is_ek = is_ek              # bool - Ek Görevli
+        self.is_destek = is_destek      # bool
+        self.competence = competence    # seviye bit maskesi (LEVEL_BITS)
+        self.forbidden = forbidden      # gün bit maskesi (bit d -> DAY_NAMES[d])
+        self.pref = pref                # PREF_* kodu
+        self.fixed_name = fixed_name    # list[str] - 'Sabit Sınıf' (boş olabilir)
+        self.fixed_class = fixed_class  # sınıf indeksi, yoksa -1
+        self.partner_pairs = partner_pairs          # list[(i, j)], i < j - İstenmeyen Partner grafiği
+        self.unknown_partners = unknown_partners    # list[(t_idx, isim)] - kadroda bulunmayan partner adları
+
+    def __len__(self):
+        return len(self.names)
+
+    def native_names(self):
+        # Dışa aktarma ve arşivin Native listesi; rol burada bir kez ayrıştırılmış olur.
+        return [name for name, native in zip(self.names, self.is_native.tolist()) if native]
+
+    def can_advise(self, allow_native_advisor=False):
+        if allow_native_advisor:
+            return ~self.is_ek
+        return ~self.is_ek & ~self.is_native
+
+    def forbidden_count(self):
+        return sum((self.forbidden >> d) & 1 for d in DAYS)
+
+    def is_forbidden(self, t_idx, d):
+        return bool((int(self.forbidden[t_idx]) >> d) & 1)
+
+
+def build_teacher_table(teachers, classes=()):
+    import numpy as np
+
+    class_idx = {str(c['Sınıf Adı']).strip(): i for i, c in enumerate(classes)}
+    n = len(teachers)
+    names, fixed_name = [], []
+    target = np.zeros(n, dtype=np.int32)
+    is_native = np.zeros(n, dtype=bool)
+    is_ek = np.zeros(n, dtype=bool)
+    is_destek = np.zeros(n, dtype=bool)
+    competence = np.zeros(n, dtype=np.int32)
+    forbidden = np.zeros(n, dtype=np.int32)
+    pref = np.full(n, PREF_ANY, dtype=np.int8)
+    fixed_class = np.full(n, -1, dtype=np.int32)
+
+    for i, t in enumerate(teachers):
+        names.append(t['Ad Soyad'])
+        target[i] = int(t['Hedef Ders Sayısı'])
+
+        role = get_role(t)
+        is_native[i] = 'NATIVE' in role
+        is_ek[i] = 'EK GÖREVL' in role
+        is_destek[i] = 'DESTEK' in role
+
+        allowed = str(t.get('Yetkinlik (Seviyeler)', '')).strip()
+        if allowed == "" or "Hepsi" in allowed:
+            competence[i] = ALL_LEVELS_MASK
+        else:
+            competence[i] = sum(bit for lvl, bit in LEVEL_BITS.items() if lvl in allowed)
+
+        forbidden_str = str(t['Yasaklı Günler'])
+        forbidden[i] = sum(1 << d for d, d_name in enumerate(DAY_NAMES) if d_name in forbidden_str)
+
+        p = get_pref(t)
+        if 'SABAH' in p: pref[i] = PREF_MORNING
+        elif 'OGLE' in p: pref[i] = PREF_AFTERNOON
+
+        fixed = str(t['Sabit Sınıf']).strip()
+        fixed_name.append(fixed)
+        if fixed:
+            fixed_class[i] = class_idx.get(fixed, -1)
+
+    # İstenmeyen Partner: virgülle ayrılmış hoca adları; ilişki simetrik kabul edilir.
+    teacher_idx = {str(name).strip(): i for i, name in enumerate(names)}
+    pairs = set()
+    unknown_partners = []
+    for i, t in enumerate(teachers):
+        for partner in str(t.get('İstenmeyen Partner', '')).split(','):
+            partner = partner.strip()
+            if not partner:
+                continue
+            j = teacher_idx.get(partner)
+            if j is None:
+                unknown_partners.append((i, partner))
+            elif j != i:
+                pairs.add((min(i, j), max(i, j)))
+
+    return TeacherTable(names, target, is_native, is_ek, is_destek, competence, forbidden, pref,
+                        fixed_name, fixed_class, sorted(pairs), unknown_partners)
+
+
+# --- ANALİZ ---
+def analyze_data(teachers, classes, allow_native_advisor=False, table=None):
+    if table is None:
+        table = build_teacher_table(teachers, classes)
+    warnings = []
+    errors = []
+
+    assigned_fixed = []
+    for t_idx, name in enumerate(table.names):
+        fixed_class = table.fixed_name[t_idx]
+
+        if fixed_class:
+            if not allow_native_advisor and table.is_native[t_idx]:
+                 errors.append(f"🛑 **{name}**: Native hocaya sabit sınıf verilmesi engellendi.")
+            if table.is_ek[t_idx]:
+                 errors.append(f"🛑 **{name}**: Ek Görevli rolündekilere sabit sınıf verilemez.")
+
+            if table.fixed_class[t_idx] < 0:
+                errors.append(f"❌ **{name}**: Atandığı '{fixed_class}' sınıfı sistemde yok.")
+            else:
+                assigned_fixed.append(fixed_class)
+
+            if table.is_forbidden(t_idx, 0):
+                warnings.append(f"⚠️ **Uyarı ({name}):** '{fixed_class}' danışmanı ama Pazartesi yasaklı.")
+
+    for t_idx, partner in table.unknown_partners:
+        warnings.append(f"⚠️ **Uyarı ({table.names[t_idx]}):** İstenmeyen partner '{partner}' kadroda yok, dikkate alınmayacak.")
+
+    dupes = [item for item, count in collections.Counter(assigned_fixed).items() if count > 1]
+    if dupes:
+        errors.append(f"❌ **ÇAKISMA HATASI:** {', '.join(dupes)} sınıfına 1'den fazla öğretmen sabitlenmiş!")
+
+    return errors, warnings
+
+
+# --- İHTİYAÇ VE KAPASİTE ---
+def compute_capacity(teachers, classes, table=None):
+    import numpy as np
+
+    if table is None:
+        table = build_teacher_table(teachers, classes)
+    morning_needs = sum([3 if c['Seviye'] == 'PreFaculty' else 5 for c in classes if c['Zaman Kodu'] == 0])
+    afternoon_needs = sum([3 if c['Seviye'] == 'PreFaculty' else 5 for c in classes if c['Zaman Kodu'] == 1])
+
+    caps = np.minimum(table.target, len(DAYS) - table.forbidden_count())
+    base_targets = [int(v) for v in caps]
+
+    return {
+        "morning_needs": morning_needs,
+        "afternoon_needs": afternoon_needs,
+        "total_slots_needed": morning_needs + afternoon_needs,
+        "morning_cap": int(caps[table.pref == PREF_MORNING].sum()),
+        "afternoon_cap": int(caps[table.pref == PREF_AFTERNOON].sum()),
+        "farketmez_cap": int(caps[table.pref == PREF_ANY].sum()),
+        "base_targets": base_targets,
+        "raw_demand": sum(base_targets),
+    }
+
+
+# --- AKIŞ TABANLI KAPASİTE ÖN KONTROLÜ ---
+def max_fillable_slots(teachers, classes, targets=None, table=None, respect_forbidden=True):
+    # Kaynak -> hoca (hedef) -> hoca tipi x gün x oturum (1) -> seviye/vardiya grubu x gün -> havuz.
+    # Yetkinliği, Native/yasaklı günleri aynı olan hocalar tek tip düğümde birleşir; aynı
+    # seviye ve vardiyadaki sınıflar da tek düğümdür, bu yüzden ağ sınıf sayısından bağımsız küçüktür.
+    # Ek Görevli tek ziyaret ve sınıf başına tek Native kuralları gevşetildiğinden sonuç üst sınırdır.
+    import numpy as np
+    from ortools.graph.python import max_flow
+
+    if table is None:
+        table = build_teacher_table(teachers, classes)
+    if targets is None:
+        targets = np.minimum(table.target, len(DAYS) - table.forbidden_count())
+
+    group_size = collections.Counter((c['Seviye'], c['Zaman Kodu']) for c in classes)
+    groups = [(lvl, s) for lvl in LEVELS for s in SESSIONS if group_size[(lvl, s)]]
+
+    type_of = {}
+    teacher_type = []
+    for t_idx in range(len(table)):
+        forbidden = int(table.forbidden[t_idx]) if respect_forbidden else 0
+        key = (int(table.competence[t_idx]), bool(table.is_native[t_idx]), forbidden)
+        teacher_type.append(type_of.setdefault(key, len(type_of)))
+
+    source, sink = 0, 1
+    teacher_node = 2
+    type_node = teacher_node + len(table)
+    group_node = type_node + len(type_of) * len(DAYS) * len(SESSIONS)
+
+    def type_slot(ty, d, s):
+        return type_node + (ty * len(DAYS) + d) * len(SESSIONS) + s
+
+    def group_day(g_idx, d):
+        return group_node + g_idx * len(DAYS) + d
+
+    tails, heads, caps = [], [], []
+
+    def arc(tail, head, cap):
+        tails.append(tail)
+        heads.append(head)
+        caps.append(cap)
+
+    for t_idx in range(len(table)):
+        if targets[t_idx] <= 0:
+            continue
+        arc(source, teacher_node + t_idx, int(targets[t_idx]))
+        for d in DAYS:
+            if respect_forbidden and table.is_forbidden(t_idx, d):
+                continue
+            for s in SESSIONS:
+                arc(teacher_node + t_idx, type_slot(teacher_type[t_idx], d, s), 1)
+
+    for (competence, is_native, _), ty in type_of.items():
+        for g_idx, (lvl, s) in enumerate(groups):
+            if not competence & LEVEL_BITS[lvl] or (is_native and lvl == "A1"):
+                continue
+            for d in open_days(lvl):
+                arc(type_slot(ty, d, s), group_day(g_idx, d), group_size[(lvl, s)])
+
+    first_sink_arc = len(tails)
+    sink_group = []
+    for g_idx, (lvl, s) in enumerate(groups):
+        for d in open_days(lvl):
+            arc(group_day(g_idx, d), sink, group_size[(lvl, s)])
+            sink_group.append(g_idx)
+
+    flow = max_flow.SimpleMaxFlow()
+    arcs = flow.add_arcs_with_capacity(
+        np.array(tails, dtype=np.int32), np.array(heads, dtype=np.int32), np.array(caps, dtype=np.int64)
+    )
+    total = flow.optimal_flow() if flow.solve(source, sink) == flow.OPTIMAL else 0
+
+    # Her grup kendi başına (diğer gruplar hiç hoca istemiyormuş gibi) ne kadar doldurulabilir?
+    sink_arcs = arcs[first_sink_arc:]
+    sink_caps = np.array(caps[first_sink_arc:], dtype=np.int64)
+    sink_group = np.array(sink_group, dtype=np.int32)
+    rows = []
+    for g_idx, (lvl, s) in enumerate(groups):
+        flow.set_arcs_capacity(sink_arcs, np.where(sink_group == g_idx, sink_caps, 0))
+        best = flow.optimal_flow() if flow.solve(source, sink) == flow.OPTIMAL else 0
+        rows.append({
+            "Seviye": lvl,
+            "Zaman": "Sabah" if s == 0 else "Öğle",
+            "İhtiyaç": group_size[(lvl, s)] * len(open_days(lvl)),
+            "Doldurulabilir": int(best),
+        })
+
+    return {
+        "max_fillable": int(total),
+        "total_slots_needed": sum(r["İhtiyaç"] for r in rows),
+        "by_group": rows,
+    }
+
+
+# --- KIRPMA SONUCU (NATIVE KORUMALI) ---
+def realized_targets(table, base_targets, loads, total_slots_needed):
+    # Kırpmayı model yapar; burada sadece raporlanır. Hocaların boş kalan saatlerinden
+    # fazla kapasite kadarı rol sırasıyla (Ek Görevli, Destek, diğerleri) kırpılmış sayılır,
+    # kalanı "boş kaldı" olarak görünür. Native hiç kırpılmaz, sabit danışman en az 1 saat tutar.
+    import numpy as np
+
+    targets = [int(v) for v in base_targets]
+    budget = sum(targets) - total_slots_needed
+    if budget <= 0:
+        return targets
+
+    others = ~table.is_ek & ~table.is_destek & ~table.is_native
+    order = np.concatenate([np.flatnonzero(table.is_ek), np.flatnonzero(table.is_destek), np.flatnonzero(others)])
+    for t_idx in order.tolist():
+        if budget == 0:
+            break
+        floor = 1 if table.fixed_name[t_idx] and not table.is_ek[t_idx] else 0
+        cut = min(targets[t_idx] - max(int(loads[t_idx]), floor), budget)
+        if cut > 0:
+            targets[t_idx] -= cut
+            budget -= cut
+    return targets
+
+
+# --- SEYREK DEĞİŞKEN SÖZLÜĞÜ ---
+class SparseVars(dict):
+    # Modelde hiç yaratılmayan (yasak) hücreler sabit 0 gibi davranır;
+    # böylece solver.Value(x[...]) ve sum(...) çağrıları anahtar hatası vermez.
+    def __missing__(self, key):
+        return 0
+
+
+# --- UYGUNLUK İNDEKSİ ---
+def build_eligibility(teachers_list, classes_list, allow_native_advisor=False, table=None):
+    # Sadece gerçekten atanabilir (öğretmen, sınıf, gün, oturum) hücreleri ve
+    # danışmanlığın yasal olduğu (öğretmen, sınıf) çiftleri döndürülür.
+    import numpy as np
+
+    if table is None:
+        table = build_teacher_table(teachers_list, classes_list)
+    level_bits = np.array([LEVEL_BITS.get(c['Seviye'], 0) for c in classes_list], dtype=np.int32)
+    is_a1 = np.array([c['Seviye'] == 'A1' for c in classes_list], dtype=bool)
+
+    competent = (table.competence[:, None] & level_bits[None, :]) != 0
+    can_teach = competent & ~(table.is_native[:, None] & is_a1[None, :])
+    can_advise = competent & table.can_advise(allow_native_advisor)[:, None]
+
+    class_days = [open_days(c['Seviye']) for c in classes_list]
+    sessions = [c['Zaman Kodu'] for c in classes_list]
+
+    x_keys = [
+        (t_idx, c_idx, d, sessions[c_idx])
+        for t_idx, c_idx in np.argwhere(can_teach).tolist()
+        for d in class_days[c_idx]
+    ]
+    adv_keys = [tuple(key) for key in np.argwhere(can_advise).tolist()]
+    return x_keys, adv_keys
+
+
+# --- SİMETRİ KIRMA ---
+def teacher_profile(table, t_idx, target):
+    # Modelin gördüğü her şey aynıysa iki öğretmen birbirinin yerine geçebilir.
+    return (
+        bool(table.is_native[t_idx]), bool(table.is_ek[t_idx]), bool(table.is_destek[t_idx]),
+        int(table.competence[t_idx]), int(table.pref[t_idx]), int(table.forbidden[t_idx]),
+        target,
+    )
+
+def find_equivalent_teachers(teachers_list, targets, table=None, advisor_blocked=()):
+    if table is None:
+        table = build_teacher_table(teachers_list)
+    # Sabit danışmanlar ve İstenmeyen Partner ilişkisi olan hocalar başkalarıyla
+    # yer değiştiremez; gruplara alınmaz. Danışmanlığı engellenmiş hoca (vardiya
+    # ayrıştırması) engellenmemiş olanla aynı profilde olsa da ayrı gruptadır.
+    partnered = {t_idx for pair in table.partner_pairs for t_idx in pair}
+    blocked = set(advisor_blocked)
+    groups = collections.defaultdict(list)
+    for t_idx in range(len(table)):
+        if table.fixed_name[t_idx] or t_idx in partnered:
+            continue
+        groups[teacher_profile(table, t_idx, targets[t_idx]) + (t_idx in blocked,)].append(t_idx)
+    return [g for g in groups.values() if len(g) > 1]
+
+def find_equivalent_classes(teachers_list, classes_list, table=None):
+    if table is None:
+        table = build_teacher_table(teachers_list, classes_list)
+    fixed = set(table.fixed_class.tolist())
+    groups = collections.defaultdict(list)
+    for c_idx, c in enumerate(classes_list):
+        if c_idx in fixed:
+            continue
+        groups[(c['Seviye'], c['Zaman Kodu'])].append(c_idx)
+    return [g for g in groups.values() if len(g) > 1]
+
+def _add_symmetry_breaking(model, x, table, classes_list, targets, advisor_blocked=()):
+    teacher_groups = find_equivalent_teachers(None, targets, table, advisor_blocked)
+    class_groups = find_equivalent_classes(None, classes_list, table)
+
+    # Sınıf anahtarı öğretmen grubuna göre tanımlanır (grup içi öğretmen permütasyonunda
+    # değişmez); öğretmen anahtarı ise sınıf indekslerine bakar. Önce sınıflar, sonra
+    # öğretmenler sıralanarak her çözüm bu iki kuralı birlikte sağlayan bir eşine dönüştürülebilir.
+    group_of = {}
+    for g_idx, group in enumerate(teacher_groups):
+        for t_idx in group:
+            group_of[t_idx] = g_idx
+    singleton_base = len(teacher_groups)
+    teacher_rank = [group_of.get(t_idx, singleton_base + t_idx) + 1 for t_idx in range(len(table))]
+
+    for group in class_groups:
+        keys = []
+        for c_idx in group:
+            s_req = classes_list[c_idx]['Zaman Kodu']
+            keys.append(sum(teacher_rank[t_idx] * x[(t_idx, c_idx, 0, s_req)] for t_idx in range(len(table))))
+        for k_prev, k_next in zip(keys, keys[1:]):
+            model.Add(k_prev <= k_next)
+
+    cells_of = collections.defaultdict(list)
+    for (t_idx, c_idx, d, s), var in x.items():
+        if t_idx in group_of:
+            cells_of[t_idx].append((c_idx * len(DAYS) + d + 1) * var)
+    for group in teacher_groups:
+        keys = [sum(cells_of[t_idx]) for t_idx in group]
+        for k_prev, k_next in zip(keys, keys[1:]):
+            model.Add(k_prev >= k_next)
+
+
+# --- KURULUM ÖLÇÜMÜ ---
+class BuildProfiler:
+    # Model kurulumunu kısıt ailelerine bölerek ölçer. section(ad) önceki aileyi kapatıp
+    # yenisini açar; her aile için süre ve o arada modele eklenen değişken, kısıt ve amaç
+    # terimi sayısı tutulur. Sayılar protonun uzunluğundan okunur, ölçümün maliyeti yoktur.
+    def __init__(self, model, objective=None):
+        self.model = model
+        self.objective = objective
+        self.families = []
+        self._current = None
+        self._started = time.perf_counter()
+
+    def _counts(self):
+        proto = self.model.Proto()
+        terms = sum(len(terms) for terms in self.objective.values()) if self.objective is not None else 0
+        return len(proto.variables), len(proto.constraints), terms
+
+    def section(self, name):
+        self.finish()
+        self._current = (name, time.perf_counter(), self._counts())
+
+    def finish(self):
+        if self._current is None:
+            return
+        name, started, (v0, c0, o0) = self._current
+        v1, c1, o1 = self._counts()
+        self.families.append({
+            "Aile": name, "Süre (ms)": round((time.perf_counter() - started) * 1000, 2),
+            "Değişken": v1 - v0, "Kısıt": c1 - c0, "Amaç Terimi": o1 - o0,
+        })
+        self._current = None
+
+    def summary(self):
+        self.finish()
+        proto = self.model.Proto()
+        return {
+            "Toplam Süre (ms)": round((time.perf_counter() - self._started) * 1000, 2),
+            "Değişken": len(proto.variables),
+            "Kısıt": len(proto.constraints),
+            "Aileler": list(self.families),
+        }
+
+
+# --- AMAÇ İFADESİ ---
+# Amaç terimleri (değişken, katsayı) çiftleridir. Python sum() yüz binlerce terimde iç içe
+# ifade kurar; CpModel.Maximize da katsayıları protoya tek tek ekler (300 sınıfta ikisi
+# birlikte ~7 sn). Kısıt olarak gereken ifade WeightedSum ile, amaç doğrudan protoya
+# toplu yazılarak kurulur.
+def objective_expr(terms):
+    from ortools.sat.python import cp_model
+
+    terms = list(terms)
+    return cp_model.LinearExpr.WeightedSum([var for var, _ in terms], [coef for _, coef in terms])
+
+def maximize(model, terms):
+    terms = list(terms)
+    model.ClearObjective()
+    objective = model.Proto().objective
+    objective.vars.extend([var.Index() for var, _ in terms])
+    objective.coeffs.extend([-coef for _, coef in terms])
+    objective.scaling_factor = -1.0
+
+
+# --- MODEL PAKETİ ---
+class ScheduleModel:
+    # Kurulmuş CP-SAT modeli ve çözüm/raporlama için gereken her şey.
+    def __init__(self, model, x, advisor_var, objective, adjusted_targets, capacity, guards=None,
+                 table=None, loads=None, build_stats=None):
+        self.model = model
+        self.x = x
+        self.advisor_var = advisor_var
+        self.objective = objective
+        self.adjusted_targets = adjusted_targets
+        self.capacity = capacity
+        self.guards = guards            # açıklama modunda {(kural, t_idx, c_idx): literal}
+        self.table = table
+        self.loads = loads              # öğretmen başına toplam ders ifadesi (kırpma raporu için)
+        self.build_stats = build_stats  # BuildProfiler.summary(): aile bazında kurulum süresi ve sayılar
+
+    def num_variables(self):
+        return len(self.model.Proto().variables)
+
+    def num_constraints(self):
+        return len(self.model.Proto().constraints)
+
+    def solved_targets(self, solver):
+        # Çözümden sonra kırpılmış hedefler; kırpma yoksa hedefler olduğu gibi kalır.
+        if self.loads is None:
+            return list(self.adjusted_targets)
+        loads = [solver.Value(load) for load in self.loads]
+        return realized_targets(self.table, self.adjusted_targets, loads, self.capacity["total_slots_needed"])
+
+
+# --- MODEL VE ÇÖZÜM ---
+def generate_schedule(teachers_list, classes_list, allow_native_advisor=False, reduce_mode=True,
+                      time_limit=120.0, num_workers=8, solve_mode="weighted", tier_time_limits=None,
+                      symmetry_breaking=True, hint_schedule=None, minimal_change=False,
+                      control=None, max_teachers_per_class=None, partner_rule="soft",
+                      profile=None, random_seed=0, instrumentation=None, closed_days=(),
+                      advisor_continuity=False):
+    # profile verilirse (SOLVER_PROFILES) süre ve işçi sayısı profilden gelir; random_seed
+    # profil olsun olmasın her çözücüye verilir.
+    # instrumentation bir sözlükse instrumentation_record() çıktısıyla doldurulur; arama
+    # günlüğü de yalnızca bu durumda tutulur.
+    solver_params = {"random_seed": random_seed}
+    if profile is not None:
+        resolved = solver_profile(profile, seed=random_seed)
+        time_limit, num_workers, solver_params = resolved["time_limit"], resolved["num_workers"], resolved["params"]
+    if instrumentation is not None:
+        solver_params = dict(solver_params, log_search_progress=True)
+
+    if solve_mode == "decomposed":
+        from decompose import solve_decomposed
+        return solve_decomposed(
+            teachers_list, classes_list, allow_native_advisor, reduce_mode, time_limit=time_limit,
+            num_workers=num_workers, control=control, max_teachers_per_class=max_teachers_per_class,
+            partner_rule=partner_rule, hint_schedule=hint_schedule, minimal_change=minimal_change,
+            solver_params=solver_params, instrumentation=instrumentation, closed_days=closed_days,
+            advisor_continuity=advisor_continuity,
+        )
+    built = build_model(
+        teachers_list, classes_list, allow_native_advisor, reduce_mode,
+        symmetry_breaking=symmetry_breaking, hint_schedule=hint_schedule, minimal_change=minimal_change,
+        max_teachers_per_class=max_teachers_per_class, partner_rule=partner_rule, closed_days=closed_days,
+        advisor_continuity=advisor_continuity,
+    )
+    status, solver = solve_model(
+        built, time_limit=time_limit, num_workers=num_workers, solve_mode=solve_mode,
+        tier_time_limits=tier_time_limits, control=control, solver_params=solver_params,
+    )
+    if instrumentation is not None:
+        instrumentation.update(instrumentation_record(built, solver, status))
+    adjusted_targets = built.adjusted_targets
+    if solver.StatusName(status) in ("OPTIMAL", "FEASIBLE"):
+        adjusted_targets = built.solved_targets(solver)
+    return status, solver, built.x, built.advisor_var, adjusted_targets, DAYS, DAY_NAMES, SESSIONS
+
+
+def build_model(teachers_list, classes_list, allow_native_advisor=False, reduce_mode=True,
+                symmetry_breaking=True, hint_schedule=None, minimal_change=False, explain=False,
+                max_teachers_per_class=None, partner_rule="soft", advisor_blocked=(), closed_days=(),
+                advisor_continuity=False):
+    # ortools ağır bir import; sadece model gerçekten kurulduğunda yüklenir.
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    objective = collections.defaultdict(list)
+    prof = BuildProfiler(model, objective)
+    prof.section("Hazırlık (Tablo, Kapasite, Uygunluk)")
+
+    table = build_teacher_table(teachers_list, classes_list)
+    capacity = compute_capacity(teachers_list, classes_list, table)
+    adjusted_targets = list(capacity["base_targets"])
+    # Fazla kapasite varsa hangi saatlerin boş kalacağına atamayla birlikte model karar verir.
+    trim = reduce_mode and capacity["raw_demand"] > capacity["total_slots_needed"]
+
+    days = DAYS
+    sessions = SESSIONS
+
+    x = SparseVars()
+    advisor_var = SparseVars()
+
+    x_keys, adv_keys = build_eligibility(teachers_list, classes_list, allow_native_advisor, table)
+    if advisor_blocked:
+        # Vardiya ayrıştırmasında danışmanlığı diğer alt probleme bırakılan hocalar.
+        blocked = set(advisor_blocked)
+        adv_keys = [key for key in adv_keys if key[0] not in blocked]
+    if closed_days:
+        # Kapalı günler (dönem planında tatil) için hücre hiç yaratılmaz: yasaklı gün
+        # cezasından farklı olarak hiçbir çözüm modunda ders konamaz.
+        closed = set(closed_days)
+        x_keys = [key for key in x_keys if key[2] not in closed]
+
+    # Açıklama modunda her kesin kural ailesi (öğretmen/sınıf bazında) bir koruma
+    # literaline bağlanır; çözümsüzlükte varsayım çekirdeği hangi kuralların çakıştığını söyler.
+    guards = {} if explain else None
+
+    def hard(constraint, rule, t_idx=None, c_idx=None):
+        if guards is not None:
+            key = (rule, t_idx, c_idx)
+            if key not in guards:
+                guards[key] = model.NewBoolVar(f'guard_{len(guards)}')
+            constraint.OnlyEnforceIf(guards[key])
+        return constraint
+
+    # Yetkinlik/rol nedeniyle yaratılmayan danışmanlık değişkenleri, sabit sınıf bunları
+    # istiyorsa açıklama modunda yaratılır ve yasak, kendi kuralının literaline bağlanır.
+    blocked_fixed = []
+    if explain:
+        adv_set = set(adv_keys)
+        blocked_fixed = [
+            (t_idx, c_idx) for t_idx, c_idx in enumerate(table.fixed_class.tolist())
+            if c_idx >= 0 and (t_idx, c_idx) not in adv_set
+        ]
+        adv_keys = adv_keys + blocked_fixed
+
+    native_idx = [t_idx for t_idx in range(len(table)) if table.is_native[t_idx]]
+    prof.section("Karar Değişkenleri")
+    for (t, c) in adv_keys:
+        advisor_var[(t, c)] = model.NewBoolVar(f'adv_{t}_{c}')
+    for (t, c, d, s) in x_keys:
+        x[(t, c, d, s)] = model.NewBoolVar(f'x_{t}_{c}_{d}_{s}')
+
+    by_teacher = collections.defaultdict(list)
+    by_teacher_slot = collections.defaultdict(list)
+    by_class_day = collections.defaultdict(list)
+    by_teacher_class = collections.defaultdict(list)
+    for key in x_keys:
+        t, c, d, s = key
+        by_teacher[t].append(x[key])
+        by_teacher_slot[(t, d, s)].append(x[key])
+        by_class_day[(c, d)].append(x[key])
+        by_teacher_class[(t, c)].append(x[key])
+
+    adv_by_class = collections.defaultdict(list)
+    adv_by_teacher = collections.defaultdict(list)
+    for key in adv_keys:
+        adv_by_class[key[1]].append(advisor_var[key])
+        adv_by_teacher[key[0]].append(advisor_var[key])
+
+    # --- 1. KESİN KURALLAR (HARD CONSTRAINTS) ---
+    prof.section("Kesin Kurallar")
+    # Ters oturum, PreFaculty Perşembe/Cuma, yetkinlik dışı seviye, Native-A1 ve
+    # danışman olamayan roller için değişken hiç yaratılmadı.
+    for (t_idx, _, _), cells in by_teacher_slot.items():
+        if len(cells) > 1:
+            hard(model.Add(sum(cells) <= 1), RULE_CLASH, t_idx=t_idx)
+
+    for (c_idx, _), cells in by_class_day.items():
+        if len(cells) > 1:
+            hard(model.Add(sum(cells) <= 1), RULE_CLASS_CAPACITY, c_idx=c_idx)
+
+    for c_idx, advs in adv_by_class.items():
+        if len(advs) > 1:
+            hard(model.Add(sum(advs) <= 1), RULE_ADVISOR_UNIQUE, c_idx=c_idx)
+    for t_idx, advs in adv_by_teacher.items():
+        if len(advs) > 1:
+            hard(model.Add(sum(advs) <= 1), RULE_ADVISOR_UNIQUE, t_idx=t_idx)
+
+    for t_idx, fixed_c_idx in enumerate(table.fixed_class.tolist()):
+        if fixed_c_idx >= 0:
+            # Danışmanlığı yasak bir sınıfa sabitleme modeli (eskisi gibi) çözümsüz yapar.
+            hard(model.Add(advisor_var[(t_idx, fixed_c_idx)] == 1), RULE_FIXED_CLASS, t_idx, fixed_c_idx)
+
+    can_advise = table.can_advise(allow_native_advisor)
+    for t_idx, c_idx in blocked_fixed:
+        if not table.competence[t_idx] & LEVEL_BITS.get(classes_list[c_idx]['Seviye'], 0):
+            hard(model.Add(advisor_var[(t_idx, c_idx)] == 0), RULE_COMPETENCE, t_idx, c_idx)
+        if not can_advise[t_idx]:
+            hard(model.Add(advisor_var[(t_idx, c_idx)] == 0), RULE_ROLE, t_idx, c_idx)
+
+    for t_idx in range(len(table)):
+        if table.is_ek[t_idx]:
+            for c_idx in range(len(classes_list)):
+                cells = by_teacher_class.get((t_idx, c_idx), [])
+                if len(cells) > 1:
+                    hard(model.Add(sum(cells) <= 1), RULE_EK_ONE_VISIT, t_idx, c_idx)
+
+    # Puanlı kısımdaki kesin kurallar (Native sınırı, hedef) yalnızca üst sınırdır;
+    # hiçbir hücre 1'e zorlanmadığı için çözümsüzlüğe katılamaz, açıklama modunda kurulmaz.
+    if explain:
+        return ScheduleModel(model, x, advisor_var, None, adjusted_targets, capacity, guards,
+                             build_stats=prof.summary())
+
+    # Akış üst sınırı (yasaklı günler dahil, yani tüm kesin kuralların gevşetmesi) tüm
+    # slotlardan azsa doluluğa doğrudan sınır olarak eklenir; çözücü bu sınıra ulaşınca
+    # doluluğun optimal olduğunu ayrıca ispatlamak zorunda kalmaz.
+    prof.section("Akış Üst Sınırı")
+    capacity["max_fillable"] = max_fillable_slots(
+        teachers_list, classes_list, adjusted_targets, table, respect_forbidden=False,
+    )["max_fillable"]
+    if capacity["max_fillable"] < capacity["total_slots_needed"]:
+        model.Add(sum(x.values()) <= capacity["max_fillable"])
+
+    # Önceki programdan ısınmalı başlangıçta simetri kırma, ipucu verilen (kanonik
+    # olmayan) çözümü yasaklayabileceği için kapatılır. Açıklama modu yukarıda döndü:
+    # kuralları tek tek gevşetmek simetriyi bozar, simetri kırma sahte çakışma üretirdi.
+    prof.section("Simetri Kırma")
+    if symmetry_breaking and not hint_schedule:
+        _add_symmetry_breaking(model, x, table, classes_list, adjusted_targets, advisor_blocked)
+
+    # --- SINIFTAKİ HOCA VARLIĞI ---
+    # (öğretmen, sınıf) başına gün sayısı ifadesi ve "bu hoca bu sınıfa giriyor mu" değişkeni
+    # bir kez kurulur; Native şelalesi, danışman gün ödülleri, Native sınırı ve sınıf başına
+    # hoca sınırı hep bunları kullanır. Varlık değişkeni ilk istendiğinde yaratılır
+    # (ölçümde ilk isteyen aileye yazılır).
+    days_in = {key: sum(cells) for key, cells in by_teacher_class.items() if len(cells) > 1}
+    presence = {}
+
+    def present(t_idx, c_idx):
+        key = (t_idx, c_idx)
+        if key not in presence:
+            cells = by_teacher_class[key]
+            if len(cells) == 1:
+                presence[key] = cells[0]
+            else:
+                presence[key] = model.NewBoolVar(f'in_{t_idx}_{c_idx}')
+                model.AddMaxEquality(presence[key], cells)
+        return presence[key]
+
+    prof.section("Sınıf Başına Max Hoca")
+    if max_teachers_per_class:
+        teachers_of_class = collections.defaultdict(list)
+        for (t_idx, c_idx) in by_teacher_class:
+            teachers_of_class[c_idx].append(t_idx)
+        for c_idx, t_list in teachers_of_class.items():
+            if len(t_list) > max_teachers_per_class:
+                model.Add(sum(present(t_idx, c_idx) for t_idx in t_list) <= max_teachers_per_class)
+
+    # İSTENMEYEN PARTNER: sadece beyan edilen çiftler ve ikisinin de girebildiği sınıflar
+    # için kısıt kurulur (çift sayısıyla doğrusal). "hard" aynı sınıfı yasaklar, "soft" cezalandırır.
+    prof.section("İstenmeyen Partner")
+    if partner_rule in ("hard", "soft"):
+        for i, j in table.partner_pairs:
+            for c_idx in range(len(classes_list)):
+                if (i, c_idx) not in by_teacher_class or (j, c_idx) not in by_teacher_class:
+                    continue
+                if partner_rule == "hard":
+                    model.Add(present(i, c_idx) + present(j, c_idx) <= 1)
+                else:
+                    together = model.NewBoolVar(f'partner_{i}_{j}_{c_idx}')
+                    model.Add(present(i, c_idx) + present(j, c_idx) <= 1 + together)
+                    objective["penalties"].append((together, -30000000))
+
+    # --- 2. PUANLI KURALLAR VE ŞELALELER ---
+    # Her terim bir kademeye (tier) aittir: ağırlıklı modda hepsi tek amaçta toplanır,
+    # kademeli modda sırayla optimize edilip sabitlenir. Terimler (değişken, katsayı)
+    # çiftleridir (bkz. maximize).
+    prof.section("Doluluk")
+    objective["coverage"].extend((var, 100000000) for var in x.values())
+
+    # NATIVE ŞELALESİ VE SINIF BAŞINA MAX 1 NATIVE KURALI
+    prof.section("Native Şelalesi")
+    for c_idx, c_data in enumerate(classes_list):
+        native_in_this_class = []
+        for t_idx in native_idx:
+            if (t_idx, c_idx) in by_teacher_class:
+                is_present = present(t_idx, c_idx)
+                native_in_this_class.append(is_present)
+
+                lvl = c_data['Seviye']
+                if lvl == "B2": score = 10000000
+                elif lvl == "B1": score = 1000000
+                elif lvl == "A2": score = 100000
+                elif lvl == "PreFaculty": score = 10000
+                else: score = 0
+
+                objective["preferences"].append((is_present, score))
+
+        if len(native_in_this_class) > 1:
+            model.Add(sum(native_in_this_class) <= 1)
+
+    prof.section("Danışman Pazartesi / 2-3 Gün Ödülleri")
+    for (t_idx, c_idx) in adv_keys:
+        c_data = classes_list[c_idx]
+        is_adv = advisor_var[(t_idx, c_idx)]
+        req_s = c_data['Zaman Kodu']
+
+        if not table.is_forbidden(t_idx, 0) and (t_idx, c_idx, 0, req_s) in x:
+            pzt_var = x[(t_idx, c_idx, 0, req_s)]
+            adv_pzt = model.NewBoolVar(f'ap_{t_idx}_{c_idx}')
+            model.AddImplication(adv_pzt, pzt_var)
+            model.AddImplication(adv_pzt, is_adv)
+            objective["advisor"].append((adv_pzt, 50000000))
+
+        if c_data['Seviye'] != "PreFaculty" and (t_idx, c_idx) in days_in:
+            # Ödül değişkenleri sadece doğru yönde bağlanır: amaç onları zaten 1 yapmak ister,
+            # ters yön (gün sayısı < k ise 0) ayrı bir is_2plus/is_3plus reifikasyonu gerektirmez.
+            adv_2days = model.NewBoolVar(f'adv2_{t_idx}_{c_idx}')
+            model.Add(days_in[(t_idx, c_idx)] >= 2).OnlyEnforceIf(adv_2days)
+            model.AddImplication(adv_2days, is_adv)
+            objective["advisor"].append((adv_2days, 20000000))
+
+            adv_3days = model.NewBoolVar(f'adv3_{t_idx}_{c_idx}')
+            model.Add(days_in[(t_idx, c_idx)] >= 3).OnlyEnforceIf(adv_3days)
+            model.AddImplication(adv_3days, is_adv)
+            objective["advisor"].append((adv_3days, 20000000))
+
+    # SABAH / ÖĞLE TERCİH CEZALARI
+    prof.section("Vardiya Tercihleri")
+    for t_idx, pref in enumerate(table.pref.tolist()):
+        if pref == PREF_MORNING:
+            # Öğle (1) atamalarına ceza
+            for d in days:
+                for cell in by_teacher_slot.get((t_idx, d, 1), []):
+                    objective["preferences"].append((cell, -10000000))
+        elif pref == PREF_AFTERNOON:
+            # Sabah (0) atamalarına ceza
+            for d in days:
+                for cell in by_teacher_slot.get((t_idx, d, 0), []):
+                    objective["preferences"].append((cell, -10000000))
+
+    # NATIVE SINIRI (Ceza)
+    prof.section("Native Sınırı")
+    for t_idx in native_idx:
+        for c_idx in range(len(classes_list)):
+            class_total = days_in.get((t_idx, c_idx))
+            if class_total is None:
+                continue
+            is_violation = model.NewBoolVar(f'ntv_vio_{t_idx}_{c_idx}')
+            model.Add(class_total <= 1 + 5 * is_violation)
+            objective["preferences"].append((is_violation, -20000000))
+
+    # Tek Vardiya (Ceza)
+    prof.section("Çift Vardiya Cezası")
+    for t_idx in range(len(table)):
+        for d in days:
+            morning_cells = by_teacher_slot.get((t_idx, d, 0), [])
+            afternoon_cells = by_teacher_slot.get((t_idx, d, 1), [])
+            if not morning_cells or not afternoon_cells:
+                continue
+            is_morning = model.NewBoolVar(f'm_{t_idx}_{d}')
+            is_afternoon = model.NewBoolVar(f'a_{t_idx}_{d}')
+            model.AddMaxEquality(is_morning, morning_cells)
+            model.AddMaxEquality(is_afternoon, afternoon_cells)
+            double_shift = model.NewBoolVar(f'dbl_{t_idx}_{d}')
+            model.Add(is_morning + is_afternoon - 1 <= double_shift)
+            objective["penalties"].append((double_shift, -50000000))
+
+    prof.section("Hedefler, Kırpma ve Yasaklı Günler")
+    loads = [0] * len(table)
+    for t_idx in range(len(table)):
+        real_target = adjusted_targets[t_idx]
+        cells = by_teacher.get(t_idx, [])
+        if not cells:
+            continue
+        total_assignments = sum(cells)
+        loads[t_idx] = total_assignments
+
+        model.Add(total_assignments <= real_target)
+        if not trim:
+            objective["coverage"].extend((cell, 5000000) for cell in cells)
+        elif real_target > 0:
+            # used[k]: hocanın k+1. saati kullanılıyor mu (azalan sırada). Sondan j. saati
+            # bırakmak weight + (j-1) * TRIM_STEP kaybettirir.
+            if table.is_native[t_idx]:
+                weight = TRIM_WEIGHT_PROTECTED
+            elif table.is_ek[t_idx]:
+                weight = TRIM_WEIGHT_EK
+            elif table.is_destek[t_idx]:
+                weight = TRIM_WEIGHT_DESTEK
+            else:
+                weight = TRIM_WEIGHT_OTHER
+            used = [model.NewBoolVar(f'load_{t_idx}_{k}') for k in range(real_target)]
+            model.Add(sum(used) == total_assignments)
+            for prev, nxt in zip(used, used[1:]):
+                model.AddImplication(nxt, prev)
+            for k, var in enumerate(used):
+                objective["trimming"].append((var, weight + TRIM_STEP * (real_target - 1 - k)))
+            if table.fixed_name[t_idx] and not table.is_native[t_idx]:
+                objective["trimming"].append((used[0], TRIM_WEIGHT_PROTECTED - weight))
+
+        for d_idx in days:
+            if table.is_forbidden(t_idx, d_idx):
+                for s in sessions:
+                    for cell in by_teacher_slot.get((t_idx, d_idx, s), []):
+                        objective["forbidden"].append((cell, -500000000))
+
+    # ÖNCEKİ PROGRAMDAN ISINMALI BAŞLANGIÇ
+    prof.section("Önceki Program İpuçları")
+    if hint_schedule:
+        x_hint, adv_hint = schedule_hints(teachers_list, classes_list, hint_schedule)
+        for key, var in x.items():
+            model.AddHint(var, 1 if key in x_hint else 0)
+        for key, var in advisor_var.items():
+            model.AddHint(var, 1 if key in adv_hint else 0)
+
+        if minimal_change:
+            for key in x_hint:
+                if key in x:
+                    objective["stability"].append((x[key], 1000))
+            for key in adv_hint:
+                if key in advisor_var:
+                    objective["stability"].append((advisor_var[key], 1000))
+        if advisor_continuity:
+            # Önceki danışman kesin olarak sabitlenmez (o hafta uygun değilse model çözümsüz
+            # kalırdı); danışman kademesinde ödülle aynı sınıfta tutulur. Bütün hafta
+            # gelemeyen danışman ödül almaz, sınıf o hafta başkasına geçebilir.
+            absent = table.forbidden_count() >= len(DAYS)
+            for key in adv_hint:
+                if key in advisor_var and not absent[key[0]]:
+                    objective["advisor"].append((advisor_var[key], ADVISOR_CONTINUITY_BONUS))
+
+    prof.section("Amaç Fonksiyonu")
+    maximize(model, (term for tier in OBJECTIVE_TIERS for term in objective[tier]))
+    return ScheduleModel(model, x, advisor_var, objective, adjusted_targets, capacity,
+                         table=table, loads=loads if trim else None, build_stats=prof.summary())
+
+
+# --- ÇÖZÜCÜ PROFİLLERİ ---
+def solver_profile(name, cores=None, seed=0):
+    # Profil adını somut ayarlara çevirir: {"name", "time_limit", "num_workers", "params"}.
+    import os
+
+    if name not in SOLVER_PROFILES:
+        raise ValueError(f"Bilinmeyen çözücü profili: {name}")
+    profile = SOLVER_PROFILES[name]
+    cores = cores or os.cpu_count() or 1
+    workers = cores if profile["max_workers"] is None else min(cores, profile["max_workers"])
+    return {
+        "name": name,
+        "time_limit": profile["time_limit"],
+        "num_workers": max(1, workers),
+        "params": dict(profile["params"], random_seed=seed),
+    }
+
+def new_solver(time_limit, num_workers, solver_params=None):
+    from ortools.sat.python import cp_model
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_search_workers = num_workers
+    # Arama günlüğü sadece ölçüm istendiğinde açılır (log_search_progress, bkz. generate_schedule);
+    # açıkken ekrana değil yanıta yazılır, ön çözüm (presolve) süresi oradan okunur.
+    solver.parameters.log_to_stdout = False
+    solver.parameters.log_to_response = True
+    for key, value in (solver_params or {}).items():
+        setattr(solver.parameters, key, value)
+    return solver
+
+
+# --- ÇÖZÜM ---
+def solve_model(built, time_limit=120.0, num_workers=8, solve_mode="weighted", tier_time_limits=None, control=None,
+                solver_params=None, stage=None):
+    # stage: ilerleme kayıtlarının 'tier' alanına yazılan aşama adı (ayrıştırılmış çözüm).
+    if solve_mode == "tiered":
+        return _solve_lexicographic(built.model, built.objective, time_limit, num_workers, tier_time_limits,
+                                    control=control, solver_params=solver_params)
+
+    solver = new_solver(time_limit, num_workers, solver_params)
+
+    status = _solve_with_control(built.model, solver, control, stage)
+    return status, solver
+
+
+def _presolve_time(solve_log):
+    # "Starting search at 0.12s with 8 workers." satırı ön çözümün bittiği anı verir.
+    match = re.search(r"Starting search at ([0-9.]+)s", solve_log or "")
+    return float(match.group(1)) if match else None
+
+SOLVER_STAT_KEYS = [
+    "Durum", "Süre (sn)", "Ön Çözüm (sn)", "Deterministik Süre", "Çatışma", "Dallanma", "Yayılım",
+    "Yeniden Başlatma", "LP İterasyonu", "Ön Çözüm Sonrası Mantıksal Değişken", "Amaç", "En İyi Sınır", "Göreli Boşluk",
+]
+
+def solver_stats(solver, status):
+    # Dışa aktarılan çalışma kaydı için CP-SAT yanıt özeti. Çözüm başlamadan durdurulduysa
+    # sadece durum yazılır, diğer alanlar boş kalır.
+    if not getattr(solver, "solve_ran", True):
+        return dict(dict.fromkeys(SOLVER_STAT_KEYS), Durum=solver.StatusName(status))
+    response = solver.ResponseProto()
+    record = {
+        "Durum": solver.StatusName(status),
+        "Süre (sn)": round(solver.WallTime(), 2),
+        "Ön Çözüm (sn)": _presolve_time(response.solve_log),
+        "Deterministik Süre": round(response.deterministic_time, 4),
+        "Çatışma": solver.NumConflicts(),
+        "Dallanma": solver.NumBranches(),
+        "Yayılım": response.num_binary_propagations + response.num_integer_propagations,
+        "Yeniden Başlatma": response.num_restarts,
+        "LP İterasyonu": response.num_lp_iterations,
+        "Ön Çözüm Sonrası Mantıksal Değişken": response.num_booleans,
+        "Amaç": None,
+        "En İyi Sınır": None,
+        "Göreli Boşluk": None,
+    }
+    if record["Durum"] in ("OPTIMAL", "FEASIBLE"):
+        objective, bound = solver.ObjectiveValue(), solver.BestObjectiveBound()
+        record.update({
+            "Amaç": objective,
+            "En İyi Sınır": bound,
+            "Göreli Boşluk": round(abs(bound - objective) / max(1.0, abs(objective)), 6),
+        })
+    return record
+
+
+def instrumentation_record(built, solver=None, status=None):
+    # Kurulum (aile bazında) ve çözücü ölçümlerinin JSON'a yazılabilir tek kaydı.
+    record = {"Kurulum": built.build_stats, "Çözücü": None}
+    if solver is not None:
+        record["Çözücü"] = solver_stats(solver, status)
+    return record
+
+
+# --- ÇÖZÜMSÜZLÜK AÇIKLAMASI ---
+def explain_infeasibility(teachers_list, classes_list, allow_native_advisor=False, reduce_mode=True,
+                          time_limit=10.0):
+    # Kural aileleri varsayım (assumption) literalleriyle korunan tek bir model çözülür;
+    # SufficientAssumptionsForInfeasibility'nin verdiği çekirdek, her seferinde bir
+    # literal bırakılarak minimal hale getirilir. Model çözülebiliyorsa boş liste döner.
+    from ortools.sat.python import cp_model
+
+    built = build_model(teachers_list, classes_list, allow_native_advisor, reduce_mode,
+                        symmetry_breaking=False, explain=True)
+    model, guards = built.model, built.guards
+    key_of = {lit.Index(): key for key, lit in guards.items()}
+
+    def conflict_core(keys):
+        model.ClearAssumptions()
+        model.AddAssumptions([guards[k] for k in keys])
+        solver = new_solver(time_limit, 1)
+        if solver.Solve(model) != cp_model.INFEASIBLE:
+            return None
+        return [key_of[i] for i in solver.SufficientAssumptionsForInfeasibility()]
+
+    core = conflict_core(list(guards))
+    if core is None:
+        return []
+    i = 0
+    while i < len(core):
+        smaller = conflict_core(core[:i] + core[i + 1:])
+        if smaller is None:
+            i += 1
+        else:
+            keep = set(smaller)
+            core = [k for k in core if k in keep]
+
+    conflicts = []
+    for rule, t_idx, c_idx in core:
+        conflicts.append({
+            "Kural": rule,
+            "Hoca": teachers_list[t_idx]['Ad Soyad'] if t_idx is not None else "",
+            "Sınıf": classes_list[c_idx]['Sınıf Adı'] if c_idx is not None else "",
+        })
+    return conflicts
+
+
+# --- ÖNCEKİ PROGRAM İPUÇLARI ---
+def schedule_hints(teachers_list, classes_list, program_rows):
+    # program_rows: dışa aktarılan 'Program' sayfasının satırları (Sınıf, Sınıf Danışmanı, gün sütunları).
+    # İsimler artık eşleşmiyorsa (hoca silinmiş, sınıf kapanmış) ilgili hücre yok sayılır.
+    teacher_idx = {str(t['Ad Soyad']).strip(): i for i, t in enumerate(teachers_list)}
+    class_idx = {str(c['Sınıf Adı']).strip(): i for i, c in enumerate(classes_list)}
+
+    x_hint = set()
+    adv_hint = set()
+    for row in program_rows:
+        c_idx = class_idx.get(str(row.get('Sınıf', '')).strip())
+        if c_idx is None:
+            continue
+        s_req = classes_list[c_idx]['Zaman Kodu']
+
+        adv_t = teacher_idx.get(str(row.get('Sınıf Danışmanı', '')).strip())
+        if adv_t is not None:
+            adv_hint.add((adv_t, c_idx))
+
+        for d_idx, d_name in enumerate(DAY_NAMES):
+            t_idx = teacher_idx.get(str(row.get(d_name, '')).strip())
+            if t_idx is not None:
+                x_hint.add((t_idx, c_idx, d_idx, s_req))
+    return x_hint, adv_hint
+
+
+# --- CANLI İLERLEME VE DURDURMA ---
+class SolveControl:
+    # Arka planda süren bir çözümü izlemek ve "en iyisiyle dur" demek için paylaşılan nesne.
+    # progress_callback her yeni (daha iyi) çözümde bir ilerleme kaydıyla çağrılır.
+    def __init__(self, progress_callback=None):
+        self.progress_callback = progress_callback
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._solvers = []              # ayrıştırılmış çözümde aynı anda birden çok çözücü olabilir
+        self._stopped = False
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            for solver in self._solvers:
+                solver.StopSearch()
+
+    def attach(self, solver):
+        with self._lock:
+            self._solvers.append(solver)
+
+    def report(self, record):
+        if self.progress_callback is not None:
+            self.progress_callback(record)
+
+
+def _solve_with_control(model, solver, control, tier=None):
+    from ortools.sat.python import cp_model
+
+    # Durdurma model kurulurken geldiyse Solve hiç çağrılmaz; solver_stats bunu
+    # solve_ran bayrağından anlar (çağrılmamış çözücünün yanıtı okunamaz).
+    solver.solve_ran = False
+    if control is None:
+        solver.solve_ran = True
+        return solver.Solve(model)
+
+    # Kayıt sadece çözücünün zaten hesapladığı değerlerden oluşur; her çözümde tüm
+    # değişkenleri Python'da okumak büyük modellerde aramayı yavaşlatır.
+    class _ProgressCallback(cp_model.CpSolverSolutionCallback):
+        def on_solution_callback(self):
+            objective_value = self.ObjectiveValue()
+            bound = self.BestObjectiveBound()
+            control.report({
+                "tier": tier,
+                "objective": objective_value,
+                "bound": bound,
+                "gap": abs(bound - objective_value) / max(1.0, abs(objective_value)),
+                "elapsed": time.monotonic() - control.started,
+            })
+            if control.stopped:
+                self.StopSearch()
+
+    control.attach(solver)
+    if control.stopped:
+        return cp_model.UNKNOWN
+    solver.solve_ran = True
+    return solver.Solve(model, _ProgressCallback())
+
+
+# --- KADEMELİ (LEXICOGRAPHIC) ÇÖZÜM ---
+def _solve_lexicographic(model, objective, time_limit, num_workers, tier_time_limits=None,
+                         control=None, solver_params=None):
+    from ortools.sat.python import cp_model
+
+    if tier_time_limits is None:
+        tier_time_limits = {tier: time_limit * TIER_TIME_SHARES[tier] for tier in OBJECTIVE_TIERS}
+
+    all_vars = [model.GetIntVarFromProtoIndex(i) for i in range(len(model.Proto().variables))]
+    best_solver = None
+    all_optimal = True
+
+    for tier in OBJECTIVE_TIERS:
+        terms = objective[tier]
+        if not terms:
+            continue
+        if control is not None and control.stopped and best_solver is not None:
+            # Kullanıcı durdurdu: o ana kadarki en iyi kademe çözümü kullanılır.
+            all_optimal = False
+            break
+        tier_expr = objective_expr(terms)
+        maximize(model, terms)
+
+        solver = new_solver(tier_time_limits.get(tier, time_limit * TIER_TIME_SHARES[tier]), num_workers, solver_params)
+        tier_status = _solve_with_control(model, solver, control, tier)
+
+        if tier_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            if best_solver is None:
+                return tier_status, solver
+            # Önceki kademenin çözümü hâlâ geçerli; kalan kademeler atlanır.
+            all_optimal = False
+            break
+
+        all_optimal = all_optimal and tier_status == cp_model.OPTIMAL
+        best_solver = solver
+
+        # Bu kademenin ulaşılan değeri sonraki kademeler için alt sınır olarak sabitlenir
+        # ve mevcut çözüm bir sonraki aşamaya ipucu (hint) olarak verilir.
+        model.Add(tier_expr >= round(solver.ObjectiveValue()))
+        model.ClearHints()
+        for var in all_vars:
+            model.AddHint(var, solver.Value(var))
+
+    if best_solver is None:
+        # Hiç amaç terimi yoksa modeli bir kez düz çöz.
+        best_solver = new_solver(time_limit, num_workers, solver_params)
+        return _solve_with_control(model, best_solver, control), best_solver
+
+    status = cp_model.OPTIMAL if all_optimal else cp_model.FEASIBLE
+    return status, best_solver
+
+
+# --- TOPLU ÇÖZÜM ÇIKARIMI ---
+def extract_assignment(solver, x, advisor_var, n_teachers, n_classes):
+    # Tüm atamayı tek seferde (öğretmen x sınıf x gün x oturum) tensörüne ve
+    # sınıf başına danışman indeksine (-1: yok) dönüştürür; solver.Value döngüsü yok.
+    import numpy as np
+
+    solution = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+    assignment = np.zeros((n_teachers, n_classes, len(DAYS), len(SESSIONS)), dtype=np.int8)
+    if x:
+        keys = np.array(list(x.keys()), dtype=np.int64)
+        idx = np.fromiter((v.Index() for v in x.values()), dtype=np.int64, count=len(x))
+        values = solution[idx]
+        assignment[keys[:, 0], keys[:, 1], keys[:, 2], keys[:, 3]] = values
+
+    advisor = np.full(n_classes, -1, dtype=np.int64)
+    if advisor_var:
+        keys = np.array(list(advisor_var.keys()), dtype=np.int64)
+        idx = np.fromiter((v.Index() for v in advisor_var.values()), dtype=np.int64, count=len(advisor_var))
+        chosen = solution[idx] == 1
+        advisor[keys[chosen, 1]] = keys[chosen, 0]
+    return assignment, advisor
+
+
+# --- RAPORLAR ---
+def _class_day_teacher(assignment, classes_list):
+    # Sınıfın kendi oturumundaki atamalardan (sınıf, gün) doluluğu ve dersi veren hoca.
+    import numpy as np
+
+    n_teachers, n_classes = assignment.shape[:2]
+    s_req = np.array([c['Zaman Kodu'] for c in classes_list], dtype=np.int64)
+    in_class = assignment[:, np.arange(n_classes), :, s_req] if n_classes else np.zeros((0, n_teachers, len(DAYS)), dtype=np.int8)
+    filled = in_class.any(axis=1)                                    # (sınıf, gün)
+    # Hoca listesi boşsa (sadece başlık satırı olan kadro) argmax tanımsızdır; tüm hücreler boştur.
+    teacher_at = in_class.argmax(axis=1) if n_teachers else np.zeros(filled.shape, dtype=np.int64)
+    return filled, teacher_at
+
+def schedule_rows(classes_list, names, assignment, advisor):
+    # Sadece program tablosu (sınıf x gün, hoca adlarıyla); istatistik ve ihlal hesaplanmaz.
+    filled, teacher_at = _class_day_teacher(assignment, classes_list)
+    res_data = []
+    for c_idx, c in enumerate(classes_list):
+        adv_t = int(advisor[c_idx])
+        row = {
+            "Sınıf": c['Sınıf Adı'], "Seviye": c['Seviye'],
+            "Sınıf Danışmanı": names[adv_t] if adv_t >= 0 else "Atanamadı",
+            "Zaman": "Sabah" if int(c['Zaman Kodu']) == 0 else "Öğle"
+        }
+        for d_idx, d_name in enumerate(DAY_NAMES):
+            val = "🔴 BOŞ"
+            if c['Seviye'] == "PreFaculty" and d_idx >= 3:
+                val = "⛔ KAPALI"
+            elif filled[c_idx, d_idx]:
+                val = names[int(teacher_at[c_idx, d_idx])]
+            row[d_name] = val
+        res_data.append(row)
+    return res_data
+
+def build_reports(solver, x, advisor_var, teachers_list, classes_list, adjusted_targets, table=None,
+                  assignment=None, advisor=None):
+    import numpy as np
+
+    if table is None:
+        table = build_teacher_table(teachers_list, classes_list)
+    if assignment is None:
+        assignment, advisor = extract_assignment(solver, x, advisor_var, len(teachers_list), len(classes_list))
+    names = table.names
+    res_data = schedule_rows(classes_list, names, assignment, advisor)
+    violations = []
+
+    assigned = assignment.sum(axis=(1, 2, 3))                        # öğretmen başına toplam ders
+    filled, teacher_at = _class_day_teacher(assignment, classes_list)
+    busy = assignment.any(axis=1)                                    # (öğretmen, gün, oturum)
+    double_shift = busy[:, :, 0] & busy[:, :, 1]                     # (öğretmen, gün)
+    forbidden = ((table.forbidden[:, None] >> np.arange(len(DAYS))[None, :]) & 1).astype(bool)
+    targets = np.asarray(adjusted_targets, dtype=np.int64)
+
+    # İSTENMEYEN PARTNER KONTROLÜ
+    in_class_any = assignment.any(axis=(2, 3))                      # (öğretmen, sınıf)
+    for i, j in table.partner_pairs:
+        for c_idx in np.flatnonzero(in_class_any[i] & in_class_any[j]).tolist():
+            violations.append({"Hoca": names[i], "Sorun": f"İstenmeyen Partner ({names[j]})", "Sınıf": classes_list[c_idx]['Sınıf Adı']})
+
+    # NATIVE BOŞTA KALMA KONTROLÜ
+    for t_idx in np.flatnonzero(table.is_native & (assigned < targets)).tolist():
+        violations.append({"Hoca": names[t_idx], "Sorun": f"Boşta Kaldı ({int(targets[t_idx] - assigned[t_idx])} Saat)", "Sınıf": "Yetersiz Şelale Kotası"})
+
+    for c_idx, c in enumerate(classes_list):
+        c_name = c['Sınıf Adı']
+        s = int(c['Zaman Kodu'])
+        for d_idx, d_name in enumerate(DAY_NAMES):
+            if c['Seviye'] == "PreFaculty" and d_idx >= 3:
+                continue
+            if filled[c_idx, d_idx]:
+                t_idx = int(teacher_at[c_idx, d_idx])
+                val = names[t_idx]
+
+                # Sabah/Öğle Tercih İhlali Dedektifi
+                pref = table.pref[t_idx]
+                if pref == PREF_MORNING and s == 1:
+                    violations.append({"Hoca": val, "Sorun": f"Ters Vardiya (Tercih: Sabah)", "Sınıf": c_name})
+                elif pref == PREF_AFTERNOON and s == 0:
+                    violations.append({"Hoca": val, "Sorun": f"Ters Vardiya (Tercih: Öğle)", "Sınıf": c_name})
+
+                if double_shift[t_idx, d_idx]:
+                    violations.append({"Hoca": val, "Sorun": f"Çift Vardiya ({d_name})", "Sınıf": c_name})
+                if forbidden[t_idx, d_idx]:
+                    violations.append({"Hoca": val, "Sorun": f"Yasaklı Gün ({d_name})", "Sınıf": c_name})
+
+    stats = []
+    for t_idx, name in enumerate(names):
+        original_target = int(table.target[t_idx])
+        real_target = int(targets[t_idx])
+        n_assigned = int(assigned[t_idx])
+
+        stat = "Tamam"
+        if real_target < original_target:
+            stat = f"Kırpıldı ({original_target-real_target} saat eksildi)"
+        elif n_assigned < real_target:
+            stat = f"{real_target-n_assigned} Ders Boş Kaldı"
+
+        stats.append({"Hoca Adı": name, "Hedef (İlk)": original_target, "Güncel Hedef": real_target, "Atanan": n_assigned, "Durum": stat})
+
+    return res_data, stats, violations
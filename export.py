@@ -0,0 +1,143 @@
+import collections
+
+from engine import DAY_NAMES, LEVELS
+
+# Seviye renkleri (Program sayfasındaki Sınıf/Seviye sütunları) ve Native vurgusu.
+LEVEL_COLORS = {"A1": '#FFD700', "A2": '#FFA500', "B1": '#800000', "B2": '#006400', "PreFaculty": '#604878'}
+NATIVE_COLOR = '#ADD8E6'
+PROGRAM_COLUMNS = ["Sınıf", "Seviye", "Sınıf Danışmanı", "Zaman"] + DAY_NAMES
+EMPTY_CELLS = ("🔴 BOŞ", "⛔ KAPALI")
+
+
+def _col(idx):
+    return chr(ord('A') + idx)
+
+
+# --- ORTAK PARÇALAR ---
+def _formats(wb):
+    base = {'border': 1, 'align': 'center', 'valign': 'vcenter'}
+    return {
+        "cell": wb.add_format(base),
+        "header": wb.add_format(dict(base, bold=True)),
+        "native": wb.add_format({'bg_color': NATIVE_COLOR}),
+        "levels": {lvl: wb.add_format({'bg_color': color, 'font_color': 'white', 'bold': True})
+                   for lvl, color in LEVEL_COLORS.items()},
+    }
+
+def _plain_sheet(wb, fmts, name, rows, columns=None, width=16):
+    ws = wb.add_worksheet(name)
+    columns = columns or (list(rows[0]) if rows else [])
+    ws.set_column(0, max(0, len(columns) - 1), width)
+    ws.write_row(0, 0, columns, fmts["header"])
+    for r, row in enumerate(rows, start=1):
+        ws.write_row(r, 0, [row.get(c) for c in columns], fmts["cell"])
+    return ws
+
+def _program_sheet(wb, fmts, name, res_data, native_names):
+    # Program satırlarını tek geçişte yazar; aynı geçişte hoca x gün tablosu ve seviye
+    # grupları toplanıp döndürülür.
+    ws = wb.add_worksheet(name)
+    ws.set_default_row(20)
+    ws.set_column('A:B', 12)
+    ws.set_column('C:C', 20)
+    ws.set_column('E:I', 14)
+    ws.write_row(0, 0, PROGRAM_COLUMNS, fmts["header"])
+
+    teacher_week = collections.defaultdict(lambda: [""] * len(DAY_NAMES))
+    by_level = collections.defaultdict(list)
+    for r, row in enumerate(res_data, start=1):
+        values = [row.get(c, "") for c in PROGRAM_COLUMNS]
+        ws.write_row(r, 0, values, fmts["cell"])
+        by_level[row["Seviye"]].append(values)
+        for d_idx, d_name in enumerate(DAY_NAMES):
+            teacher = row.get(d_name, "")
+            if teacher and teacher not in EMPTY_CELLS:
+                cell = f"{row['Sınıf']} ({row['Zaman']})"
+                # Aynı gün iki vardiyaya giren hoca için iki ders yan yana yazılır.
+                week = teacher_week[teacher]
+                week[d_idx] = f"{week[d_idx]} / {cell}" if week[d_idx] else cell
+
+    last = len(res_data) + 1
+    if res_data:
+        for lvl, fmt in fmts["levels"].items():
+            ws.conditional_format(f"A2:B{last}", {
+                'type': 'formula', 'criteria': f'=$B2="{lvl}"', 'format': fmt,
+            })
+        if native_names:
+            ws.conditional_format(f"E2:{_col(len(PROGRAM_COLUMNS) - 1)}{last}", {
+                'type': 'formula', 'criteria': '=COUNTIF(NativeHocalar,E2)>0', 'format': fmts["native"],
+            })
+    return teacher_week, by_level
+
+def _native_list(wb, native_names):
+    # Koşullu biçimlerin baktığı Native listesi (gizli sayfa + tanımlı ad).
+    if native_names:
+        ws_list = wb.add_worksheet("Listeler")
+        for r, name in enumerate(native_names):
+            ws_list.write(r, 0, name)
+        ws_list.hide()
+        wb.define_name("NativeHocalar", f"=Listeler!$A$1:$A${len(native_names)}")
+
+
+# --- ÇALIŞMA KİTABI ---
+def write_schedule_workbook(output, res_data, stats, violations, native_names=(), run_info=None):
+    # Her sayfa xlsxwriter constant_memory modunda tek seferde, satır sırasıyla yazılır;
+    # renkler hücre hücre değil koşullu biçimlerle verilir. Hoca ve seviye sayfaları
+    # Program satırları yazılırken aynı geçişte toplanır.
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(output, {"constant_memory": True})
+    fmts = _formats(wb)
+    teacher_week, by_level = _program_sheet(wb, fmts, "Program", res_data, native_names)
+
+    # RAPORLAR
+    _plain_sheet(wb, fmts, "Istatistikler", stats)
+    unique_violations = list({tuple(v.items()): v for v in violations}.values())
+    if unique_violations:
+        _plain_sheet(wb, fmts, "Ihlal_Raporu", unique_violations)
+    if run_info:
+        _plain_sheet(wb, fmts, "Calisma_Kaydi", [{"Ayar": k, "Değer": v} for k, v in run_info.items()],
+                     ["Ayar", "Değer"], 24)
+
+    # HOCA BAZINDA HAFTALIK PROGRAM (İstatistikler sırasıyla, dersi olmayanlar boş satır)
+    names = [s["Hoca Adı"] for s in stats] or sorted(teacher_week)
+    ws_teacher = wb.add_worksheet("Hoca_Programi")
+    ws_teacher.set_column(0, 0, 22)
+    ws_teacher.set_column(1, len(DAY_NAMES), 18)
+    ws_teacher.write_row(0, 0, ["Hoca"] + DAY_NAMES, fmts["header"])
+    for r, name in enumerate(names, start=1):
+        ws_teacher.write_row(r, 0, [name] + teacher_week.get(name, [""] * len(DAY_NAMES)), fmts["cell"])
+    if native_names and names:
+        ws_teacher.conditional_format(f"A2:A{len(names) + 1}", {
+            'type': 'formula', 'criteria': '=COUNTIF(NativeHocalar,A2)>0', 'format': fmts["native"],
+        })
+
+    # SEVİYE BAZINDA SAYFALAR
+    for lvl in LEVELS:
+        rows = by_level.get(lvl)
+        if not rows:
+            continue
+        ws_lvl = wb.add_worksheet(f"Seviye_{lvl}")
+        ws_lvl.set_column(0, len(PROGRAM_COLUMNS) - 1, 14)
+        ws_lvl.write_row(0, 0, PROGRAM_COLUMNS, fmts["levels"][lvl])
+        for r, values in enumerate(rows, start=1):
+            ws_lvl.write_row(r, 0, values, fmts["cell"])
+
+    _native_list(wb, native_names)
+    wb.close()
+    return output
+
+
+def write_term_workbook(output, results, summary, native_names=()):
+    # Dönem modu: özet sayfası ve her ders haftası için ayrı bir Program sayfası (Hafta_01, ...).
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(output, {"constant_memory": True})
+    fmts = _formats(wb)
+    _plain_sheet(wb, fmts, "Donem_Ozeti", summary)
+    for result in results:
+        if result.get("schedule"):
+            _program_sheet(wb, fmts, f"Hafta_{result['Hafta']:02d}", result["schedule"], native_names)
+    _native_list(wb, native_names)
+    wb.close()
+    return output
@@ -0,0 +1,233 @@
+import os
+
+from engine import DAY_NAMES, LEVELS
+
+TEACHER_SHEET = "Ogretmenler"
+CALENDAR_SHEET = "Takvim"
+AVAILABILITY_SHEET = "Haftalik_Musaitlik"
+
+# --- ŞEMA ---
+# Her sütun: zorunlu mu, türü ve (varsa) izin verilen değerler. Metin sütunlarındaki
+# rol/tercih değerleri motorun get_role/get_pref normalizasyonuyla karşılaştırılır.
+ROLE_TOKENS = ("DANIŞMAN", "DESTEK", "NATIVE", "EK GÖREVL")
+PREF_VALUES = ("", "SABAH", "OGLE", "FARKETMEZ")
+LEVEL_TOKENS = tuple(LEVELS) + ("Hepsi",)
+
+TEACHER_SCHEMA = {
+    'Ad Soyad': {"required": True, "kind": "name"},
+    'Rol': {"required": True, "kind": "role"},
+    'Hedef Ders Sayısı': {"required": True, "kind": "count"},
+    'Tercih (Sabah/Öğle)': {"required": False, "kind": "pref"},
+    'Yasaklı Günler': {"required": False, "kind": "tokens", "allowed": tuple(DAY_NAMES)},
+    'Sabit Sınıf': {"required": False, "kind": "text"},
+    'Yetkinlik (Seviyeler)': {"required": False, "kind": "tokens", "allowed": LEVEL_TOKENS},
+    'İstenmeyen Partner': {"required": False, "kind": "text"},
+}
+# Dönem takvimi: her satır bir hafta. Sınav ve tatil haftalarında ders yapılmaz.
+WEEK_TEACHING, WEEK_EXAM, WEEK_HOLIDAY = "Ders", "Sınav", "Tatil"
+WEEK_KINDS = (WEEK_TEACHING, WEEK_EXAM, WEEK_HOLIDAY)
+
+# Eski şablonlardaki sütun adları.
+COLUMN_ALIASES = {'Hedef Gün Sayısı': 'Hedef Ders Sayısı'}
+# Okunan tabloların indeksi dosyadaki satır numarasıdır (başlık 1. satır); boş satırlar
+# atıldıktan sonra da hata raporları Excel'deki satırı gösterir.
+SHEET_ROW = "Satır"
+
+
+# --- OKUMA ---
+def _extension(source, filename=None):
+    name = filename or getattr(source, "name", None) or (source if isinstance(source, str) else "")
+    return os.path.splitext(str(name))[1].lower()
+
+def _read_xlsx(source, sheet_name, missing_ok=False):
+    # openpyxl salt-okunur modda satırları akış halinde okur; çok bölümlü büyük çalışma
+    # kitaplarında sadece istenen sayfa gezilir ve bellek kullanımı sabit kalır.
+    import openpyxl
+    import pandas as pd
+
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        if sheet_name not in wb.sheetnames:
+            if missing_ok:
+                return None
+            raise ValueError(f"'{sheet_name}' sayfası bulunamadı (sayfalar: {', '.join(wb.sheetnames)})")
+        rows = wb[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        header = [str(h).strip() if h is not None else f"Sütun {i + 1}" for i, h in enumerate(header)]
+        numbered = [(i, row[:len(header)]) for i, row in enumerate(rows, start=2)
+                    if any(v not in (None, "") for v in row)]
+    finally:
+        wb.close()
+    index = pd.Index([i for i, _ in numbered], name=SHEET_ROW)
+    return pd.DataFrame([row for _, row in numbered], columns=header, index=index)
+
+def _number_rows(df):
+    # CSV/parquet: satır numarası dosyadaki sıradan verilir, sonra tamamen boş satırlar atılır.
+    import pandas as pd
+
+    df.index = pd.RangeIndex(2, len(df) + 2, name=SHEET_ROW)
+    return df[~(df.isna() | (df == "")).all(axis=1)]
+
+def read_roster(source, filename=None, sheet_name=TEACHER_SHEET):
+    # source: dosya yolu ya da dosya benzeri nesne (Streamlit yüklemesi). Biçim uzantıdan anlaşılır.
+    import pandas as pd
+
+    ext = _extension(source, filename)
+    if ext == ".csv":
+        df = _number_rows(pd.read_csv(source, dtype=object, keep_default_na=False, skip_blank_lines=False))
+    elif ext == ".parquet":
+        try:
+            df = _number_rows(pd.read_parquet(source))
+        except ImportError as exc:
+            raise ValueError("Parquet okumak için 'pyarrow' paketi gerekli.") from exc
+    elif ext in (".xlsx", ".xlsm"):
+        df = _read_xlsx(source, sheet_name)
+    else:
+        raise ValueError(f"Desteklenmeyen dosya türü: '{ext or '?'}' (xlsx, csv veya parquet bekleniyor)")
+
+    df.columns = [str(c).strip() for c in df.columns]
+    return df.rename(columns=COLUMN_ALIASES)
+
+
+# --- DOĞRULAMA ---
+def _as_text(col):
+    # None/NaN -> "", 4.0 -> "4"; geri kalan her şey kırpılmış metin.
+    import pandas as pd
+
+    def to_text(v):
+        if v is None or (isinstance(v, float) and pd.isna(v)):
+            return ""
+        if isinstance(v, float) and v.is_integer():
+            return str(int(v))
+        return str(v).strip()
+    return col.map(to_text)
+
+def _normalize_role(col):
+    return col.str.upper().str.replace('İ', 'I').str.replace('i', 'I').str.replace('ı', 'I')
+
+def _normalize_pref(col):
+    return (col.str.upper().str.replace('Ö', 'O').str.replace('ö', 'O')
+            .str.replace('Ğ', 'G').str.replace('ğ', 'G').str.strip())
+
+def validate_roster(df):
+    # Tüm satırlar sütun sütun tek geçişte denetlenir. Dönüş: (teachers_list, errors);
+    # errors boş değilse teachers_list kullanılmamalıdır. Satır numaraları Excel'deki gibidir
+    # (başlık 1. satır): read_roster'ın indeksinden, o yoksa tablodaki sıradan alınır.
+    import pandas as pd
+
+    errors = []
+
+    def report(mask, column, values, problem):
+        for idx in mask[mask].index:
+            errors.append({"Satır": int(idx), "Sütun": column, "Değer": values[idx], "Sorun": problem})
+
+    missing = [c for c, spec in TEACHER_SCHEMA.items() if spec["required"] and c not in df.columns]
+    for column in missing:
+        errors.append({"Satır": 1, "Sütun": column, "Değer": "", "Sorun": "Zorunlu sütun eksik"})
+    if missing:
+        return [], errors
+
+    if df.index.name != SHEET_ROW:
+        df = df.reset_index(drop=True)
+        df.index = (df.index + 2).rename(SHEET_ROW)
+    out = df.copy()
+    for column, spec in TEACHER_SCHEMA.items():
+        if column not in df.columns:
+            out[column] = ""
+            continue
+        text = _as_text(df[column])
+        kind = spec["kind"]
+
+        if spec["required"]:
+            report(text == "", column, text, "Boş bırakılamaz")
+
+        if kind == "name":
+            report((text != "") & text.duplicated(keep=False), column, text, "Aynı isim birden fazla satırda")
+            out[column] = text
+        elif kind == "role":
+            role = _normalize_role(text)
+            known = pd.Series(False, index=text.index)
+            for token in ROLE_TOKENS:
+                known |= role.str.contains(token, regex=False)
+            report((text != "") & ~known, column, text, "Bilinmeyen rol (Danışman, Destek, Native, Ek Görevli)")
+            out[column] = text
+        elif kind == "count":
+            number = pd.to_numeric(text.where(text != ""), errors="coerce")
+            bad = (text != "") & (number.isna() | (number % 1 != 0) | (number < 0))
+            report(bad, column, text, "Negatif olmayan tam sayı olmalı")
+            out[column] = number.fillna(0).astype(int)
+        elif kind == "pref":
+            report(~_normalize_pref(text).isin(PREF_VALUES), column, text, "Sabah, Öğle veya Farketmez olmalı")
+            out[column] = text
+        elif kind == "tokens":
+            tokens = text.str.split(",").explode().str.strip()
+            bad_tokens = tokens[(tokens != "") & ~tokens.isin(spec["allowed"])]
+            for idx, token in bad_tokens.items():
+                errors.append({"Satır": int(idx), "Sütun": column, "Değer": text[idx],
+                               "Sorun": f"Tanınmayan değer: '{token}'"})
+            out[column] = text
+        else:
+            out[column] = text
+
+    errors.sort(key=lambda e: (e["Satır"], e["Sütun"]))
+    return out.to_dict('records'), errors
+
+def load_roster(source, filename=None, sheet_name=TEACHER_SHEET):
+    return validate_roster(read_roster(source, filename, sheet_name))
+
+
+# --- DÖNEM TAKVİMİ ---
+def _day_tokens(text):
+    return [d.strip() for d in str(text).split(",") if d.strip()]
+
+def _as_records(df):
+    # (satır numarası, satır sözlüğü) çiftleri; tüm hücreler _as_text ile metne çevrilir.
+    return list(zip(df.index.astype(int).tolist(), df.apply(_as_text).to_dict('records'))) if len(df) else []
+
+def load_calendar(source, filename=None):
+    # 'Takvim' sayfası (Hafta, Durum, Tatil Günleri) ve isteğe bağlı 'Haftalik_Musaitlik'
+    # sayfası (Hafta, Ad Soyad, Yasaklı Günler) okunur. Dönüş: (weeks, errors); her hafta
+    # {"Hafta", "Durum", "Tatil Günleri", "Yasaklı Günler": {ad: "Gün,Gün"}} sözlüğüdür.
+    if _extension(source, filename) not in (".xlsx", ".xlsm"):
+        raise ValueError("Dönem takvimi sadece Excel (xlsx) dosyasından okunabilir.")
+    calendar_rows = _as_records(_read_xlsx(source, CALENDAR_SHEET))
+    availability = _read_xlsx(source, AVAILABILITY_SHEET, missing_ok=True)
+    availability_rows = _as_records(availability) if availability is not None else []
+
+    weeks, errors = [], []
+
+    def report(sheet, row, column, value, problem):
+        errors.append({"Sayfa": sheet, "Satır": row, "Sütun": column, "Değer": value, "Sorun": problem})
+
+    seen = set()
+    for i, rec in calendar_rows:
+        week = rec.get('Hafta', "")
+        if not week.isdigit() or int(week) < 1:
+            report(CALENDAR_SHEET, i, 'Hafta', week, "Pozitif tam sayı olmalı")
+            continue
+        if int(week) in seen:
+            report(CALENDAR_SHEET, i, 'Hafta', week, "Aynı hafta birden fazla satırda")
+        seen.add(int(week))
+        kind = rec.get('Durum', "") or WEEK_TEACHING
+        if kind not in WEEK_KINDS:
+            report(CALENDAR_SHEET, i, 'Durum', kind, "Ders, Sınav veya Tatil olmalı")
+        holidays = rec.get('Tatil Günleri', "")
+        for day in _day_tokens(holidays):
+            if day not in DAY_NAMES:
+                report(CALENDAR_SHEET, i, 'Tatil Günleri', holidays, f"Tanınmayan değer: '{day}'")
+        weeks.append({"Hafta": int(week), "Durum": kind, "Tatil Günleri": holidays, "Yasaklı Günler": {}})
+
+    by_week = {w["Hafta"]: w for w in weeks}
+    for i, rec in availability_rows:
+        week, name, days = rec.get('Hafta', ""), rec.get('Ad Soyad', ""), rec.get('Yasaklı Günler', "")
+        if not week.isdigit() or int(week) not in by_week:
+            report(AVAILABILITY_SHEET, i, 'Hafta', week, "Takvimde olmayan hafta")
+            continue
+        for day in _day_tokens(days):
+            if day not in DAY_NAMES:
+                report(AVAILABILITY_SHEET, i, 'Yasaklı Günler', days, f"Tanınmayan değer: '{day}'")
+        forbidden = by_week[int(week)]["Yasaklı Günler"]
+        forbidden[name] = ",".join(filter(None, [forbidden.get(name, ""), days]))
+
+    weeks.sort(key=lambda w: w["Hafta"])
+    return weeks, errors
@@ -0,0 +1,74 @@
+import collections
+import threading
+
+from engine import SolveControl, generate_schedule, build_reports, explain_infeasibility, solver_stats
+
+# Arayüz sadece son kaydı okur; uzun çözümlerde her ara çözümü saklamamak için geçmiş sınırlıdır.
+PROGRESS_HISTORY = 100
+
+
+# --- ARKA PLAN ÇÖZÜM İŞİ ---
+class SolveJob:
+    # Modeli ayrı bir thread'de kurar ve çözer; arayüz her yeniden çalışmada (rerun)
+    # sadece son ilerleme kaydına bakar, isterse stop() ile eldeki en iyi çözümü alır.
+    # instrument: kurulum/çözücü ölçüm kaydı (ve CP-SAT arama günlüğü) tutulsun mu.
+    def __init__(self, teachers_list, classes_list, key=None, instrument=False, **solve_kwargs):
+        self.teachers_list = teachers_list
+        self.classes_list = classes_list
+        self.key = key
+        self.instrument = instrument
+        self.solve_kwargs = solve_kwargs
+
+        self.progress = collections.deque(maxlen=PROGRESS_HISTORY)
+        self.status_name = None
+        self.result = None
+        self.error = None
+        self._control = SolveControl(self.progress.append)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._control.stop()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    @property
+    def stopped(self):
+        return self._control.stopped
+
+    @property
+    def latest(self):
+        return self.progress[-1] if self.progress else None
+
+    def _run(self):
+        try:
+            instrumentation = {} if self.instrument else None
+            status, solver, x, advisor_var, adjusted_targets, days, day_names, sessions = generate_schedule(
+                self.teachers_list, self.classes_list, control=self._control, instrumentation=instrumentation,
+                **self.solve_kwargs
+            )
+            status_name = solver.StatusName(status)
+            result = {"status": status_name, "solver_stats": solver_stats(solver, status),
+                      "instrumentation": instrumentation}
+            if status_name in ("OPTIMAL", "FEASIBLE"):
+                res_data, stats, violations = build_reports(
+                    solver, x, advisor_var, self.teachers_list, self.classes_list, adjusted_targets
+                )
+                result.update({"schedule": res_data, "stats": stats, "violations": violations})
+            elif status_name == "INFEASIBLE":
+                result["conflicts"] = explain_infeasibility(
+                    self.teachers_list, self.classes_list,
+                    self.solve_kwargs.get("allow_native_advisor", False), self.solve_kwargs.get("reduce_mode", True),
+                )
+            self.result = result
+            self.status_name = status_name
+        except Exception as exc:  # thread içindeki hata arayüzde gösterilmek üzere saklanır
+            self.error = exc
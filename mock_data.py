@@ -0,0 +1,18 @@
+def create_mock_teacher(name="Hoca", role="Destek", target=5, preferences="", forbidden="", fixed_class="", allowed_levels="Hepsi", partner=""):
+    return {
+        'Ad Soyad': name,
+        'Rol': role,
+        'Hedef Ders Sayısı': target,
+        'Tercih (Sabah/Öğle)': preferences,
+        'Yasaklı Günler': forbidden,
+        'Sabit Sınıf': fixed_class,
+        'Yetkinlik (Seviyeler)': allowed_levels,
+        'İstenmeyen Partner': partner
+    }
+
+def create_mock_class(name="A1.01", level="A1", session=0): # 0: Sabah, 1: Öğle
+    return {
+        'Sınıf Adı': name,
+        'Seviye': level,
+        'Zaman Kodu': session
+    }
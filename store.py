@@ -0,0 +1,169 @@
+import datetime
+import json
+import sqlite3
+import threading
+
+from engine import DAY_NAMES
+
+# Program tensörünün sütunları: danışman + gün hücreleri. Satırlar sınıflardır.
+TENSOR_FIELDS = ["Sınıf Danışmanı"] + DAY_NAMES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    term TEXT NOT NULL,
+    department TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    inputs_hash TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    classes TEXT NOT NULL,
+    vocab TEXT NOT NULL,
+    assignments BLOB NOT NULL,
+    stats TEXT NOT NULL,
+    violations TEXT NOT NULL,
+    solver_stats TEXT NOT NULL,
+    native_names TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_versions_term_dept ON versions (term, department, id);
+CREATE INDEX IF NOT EXISTS idx_versions_inputs ON versions (inputs_hash);
+"""
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+# --- PROGRAM <-> TENSÖR ---
+def schedule_tensor(res_data):
+    # Her hücre, sözlükteki (vocab) metnin indeksi olarak int32 matriste tutulur;
+    # vocab[0] her zaman boş metindir. Dönüş: (classes, vocab, matris).
+    import numpy as np
+
+    vocab = {"": 0}
+    classes = []
+    matrix = np.zeros((len(res_data), len(TENSOR_FIELDS)), dtype=np.int32)
+    for r, row in enumerate(res_data):
+        classes.append([row["Sınıf"], row["Seviye"], row["Zaman"]])
+        for f, field in enumerate(TENSOR_FIELDS):
+            value = str(row.get(field, "") or "")
+            matrix[r, f] = vocab.setdefault(value, len(vocab))
+    return classes, list(vocab), matrix
+
+def tensor_schedule(classes, vocab, matrix):
+    rows = []
+    for r, (name, level, session) in enumerate(classes):
+        row = {"Sınıf": name, "Seviye": level, "Sınıf Danışmanı": vocab[matrix[r, 0]], "Zaman": session}
+        row.update({field: vocab[matrix[r, f]] for f, field in enumerate(TENSOR_FIELDS) if f > 0})
+        rows.append(row)
+    return rows
+
+
+def diff_tensors(old, new):
+    # old/new: (classes, vocab, matrix). İki sürüm ortak bir sözlüğe ve sınıf sırasına
+    # yeniden kodlanır, karşılaştırma tek bir vektörel != ile yapılır.
+    import numpy as np
+
+    (classes_a, vocab_a, mat_a), (classes_b, vocab_b, mat_b) = old, new
+    vocab = {v: i for i, v in enumerate(vocab_a)}
+    for v in vocab_b:
+        vocab.setdefault(v, len(vocab))
+    remap_b = np.array([vocab[v] for v in vocab_b], dtype=np.int32)
+    names = list(dict.fromkeys([c[0] for c in classes_a] + [c[0] for c in classes_b]))
+    row_of = {n: i for i, n in enumerate(names)}
+
+    def aligned(classes, mat, remap=None):
+        out = np.zeros((len(names), len(TENSOR_FIELDS)), dtype=np.int32)
+        if len(classes):
+            out[[row_of[c[0]] for c in classes]] = mat if remap is None else remap[mat]
+        return out
+
+    a, b = aligned(classes_a, mat_a), aligned(classes_b, mat_b, remap_b)
+    words = list(vocab)
+    return [
+        {"Sınıf": names[r], "Alan": TENSOR_FIELDS[f], "Eski": words[a[r, f]], "Yeni": words[b[r, f]]}
+        for r, f in zip(*np.nonzero(a != b))
+    ]
+
+
+# --- SÜRÜMLÜ PROGRAM DEPOSU ---
+class ScheduleStore:
+    # Her başarılı çözüm dönem + bölüm altında yeni bir sürüm olarak saklanır. Program
+    # satırları yerine sözlük + int32 tensör yazılır; sürüm karşılaştırması ve yeniden
+    # yükleme çözücüye dokunmadan yapılır.
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def save(self, payload, term, department, inputs_hash, settings=None, native_names=(), label=""):
+        classes, vocab, matrix = schedule_tensor(payload.get("schedule") or [])
+        record = (
+            str(term), str(department), datetime.datetime.now().isoformat(timespec="seconds"), label,
+            payload.get("status", ""), inputs_hash, _dumps(settings or {}), _dumps(classes), _dumps(vocab),
+            matrix.tobytes(), _dumps(payload.get("stats") or []), _dumps(payload.get("violations") or []),
+            _dumps(payload.get("solver_stats") or {}), _dumps(list(native_names)),
+        )
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO versions (term, department, created_at, label, status, inputs_hash, settings, classes, "
+                "vocab, assignments, stats, violations, solver_stats, native_names) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", record,
+            )
+            return cur.lastrowid
+
+    def versions(self, term=None, department=None):
+        query = "SELECT id, term, department, created_at, label, status, inputs_hash FROM versions"
+        where, args = [], []
+        if term is not None:
+            where.append("term = ?")
+            args.append(str(term))
+        if department is not None:
+            where.append("department = ?")
+            args.append(str(department))
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id DESC", args).fetchall()
+        return [dict(r) for r in rows]
+
+    def _tensor(self, version_id):
+        import numpy as np
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT classes, vocab, assignments FROM versions WHERE id = ?", (version_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Sürüm bulunamadı: {version_id}")
+        classes = json.loads(row["classes"])
+        matrix = np.frombuffer(row["assignments"], dtype=np.int32).reshape(len(classes), len(TENSOR_FIELDS))
+        return classes, json.loads(row["vocab"]), matrix
+
+    def load(self, version_id):
+        # jobs.SolveJob.result ile aynı biçim; arayüz yüklenen sürümü yeni bir çözüm gibi gösterir.
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM versions WHERE id = ?", (version_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Sürüm bulunamadı: {version_id}")
+        return {
+            "status": row["status"],
+            "schedule": tensor_schedule(*self._tensor(version_id)),
+            "stats": json.loads(row["stats"]),
+            "violations": json.loads(row["violations"]),
+            "solver_stats": json.loads(row["solver_stats"]),
+            "settings": json.loads(row["settings"]),
+            "native_names": json.loads(row["native_names"]),
+            "inputs_hash": row["inputs_hash"],
+        }
+
+    def diff(self, old_id, new_id):
+        return diff_tensors(self._tensor(old_id), self._tensor(new_id))
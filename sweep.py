@@ -0,0 +1,84 @@
+import concurrent.futures
+import itertools
+import os
+import time
+
+from engine import (
+    class_config_from_settings, create_automated_classes, compute_capacity,
+    generate_schedule, build_reports,
+)
+
+# Tarama ızgarasında değiştirilebilen ayarlar (kenar çubuğundaki isimlerle aynı).
+SWEEP_KEYS = [
+    "count_a1", "count_a2", "count_b1", "count_b2", "count_pre",
+    "time_a1", "time_a2", "time_b1", "time_b2", "time_pre",
+    "max_teachers_per_class",
+]
+
+
+# --- SENARYO IZGARASI ---
+def expand_grid(base_settings, grid):
+    # grid: {"count_a1": [3, 4, 5], "time_b1": ["Sabah", "Öğle"]} -> kartezyen çarpım
+    keys = [k for k in SWEEP_KEYS if k in grid]
+    scenarios = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        scenario = dict(base_settings)
+        scenario.update(zip(keys, values))
+        scenarios.append(scenario)
+    return scenarios
+
+
+# --- TEK SENARYO ---
+def run_scenario(teachers_list, settings, time_limit=30.0, num_workers=1):
+    started = time.monotonic()
+    classes_list = create_automated_classes(class_config_from_settings(settings))
+    row = {k: settings[k] for k in SWEEP_KEYS if k in settings}
+    row["Sınıf Sayısı"] = len(classes_list)
+
+    status, solver, x, advisor_var, adjusted_targets, days, day_names, sessions = generate_schedule(
+        teachers_list, classes_list, settings.get("allow_native_advisor", False), reduce_mode=True,
+        time_limit=time_limit, num_workers=num_workers, solve_mode=settings.get("solve_mode", "weighted"),
+        max_teachers_per_class=settings.get("max_teachers_per_class"),
+        partner_rule=settings.get("partner_rule", "soft"),
+    )
+    status_name = solver.StatusName(status)
+    base_targets = compute_capacity(teachers_list, classes_list)["base_targets"]
+    row["Kırpılan Saat"] = sum(base_targets) - sum(adjusted_targets)
+    row["Durum"] = status_name
+
+    if status_name in ("OPTIMAL", "FEASIBLE"):
+        res_data, stats, violations = build_reports(solver, x, advisor_var, teachers_list, classes_list, adjusted_targets)
+        row["Boş Ders"] = sum(1 for r in res_data for d in day_names if r[d] == "🔴 BOŞ")
+        row["İhlal"] = len({tuple(v.items()) for v in violations})
+    else:
+        row["Boş Ders"] = None
+        row["İhlal"] = None
+    row["Süre (sn)"] = round(time.monotonic() - started, 2)
+    return row
+
+
+# --- PARALEL TARAMA ---
+def split_cores(total_cores=None, workers_per_task=2):
+    # Toplam çekirdek bütçesi işler arasında bölünür: aynı anda en fazla
+    # total_cores // workers_per_task iş, her biri workers_per_task CP-SAT işçisiyle çalışır.
+    total_cores = total_cores or os.cpu_count() or 1
+    workers_per_task = max(1, min(workers_per_task, total_cores))
+    return workers_per_task, max(1, total_cores // workers_per_task)
+
+def run_sweep(teachers_list, scenarios, time_limit=30.0, total_cores=None, workers_per_scenario=2):
+    workers_per_scenario, max_parallel = split_cores(total_cores, workers_per_scenario)
+
+    rows = [None] * len(scenarios)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(max_parallel, max(1, len(scenarios)))) as pool:
+        futures = {
+            pool.submit(run_scenario, teachers_list, scenario, time_limit, workers_per_scenario): i
+            for i, scenario in enumerate(scenarios)
+        }
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            try:
+                rows[i] = future.result()
+            except Exception as exc:
+                rows[i] = {k: scenarios[i][k] for k in SWEEP_KEYS if k in scenarios[i]}
+                rows[i]["Durum"] = f"HATA: {exc}"
+    return rows
@@ -0,0 +1,116 @@
+import time
+
+from engine import DAY_NAMES, generate_schedule, build_reports, extract_assignment, solver_stats
+from cache import make_cache_key
+from ingest import WEEK_TEACHING
+
+HOLIDAY_CELL = "⛔ KAPALI"
+
+
+def _days(text):
+    return {d.strip() for d in str(text).split(",") if d.strip()}
+
+
+# --- HAFTALIK KADRO ---
+def week_teachers(teachers_list, week):
+    # Haftanın kadrosu: tatil günleri ve o haftaya özel yasaklar 'Yasaklı Günler'e eklenir
+    # (kapasite ve hedefler buna göre düşer; tatil hücreleri ayrıca modelde hiç yaratılmaz).
+    holidays = _days(week.get("Tatil Günleri", ""))
+    extra = week.get("Yasaklı Günler") or {}
+
+    week_list = []
+    for t in teachers_list:
+        name = str(t['Ad Soyad']).strip()
+        forbidden = _days(t.get('Yasaklı Günler', '')) | holidays | _days(extra.get(name, ''))
+        week_list.append(dict(t, **{'Yasaklı Günler': ",".join(d for d in DAY_NAMES if d in forbidden)}))
+    return week_list
+
+
+def _previous_advisors(previous_rows):
+    return ";".join(sorted(f"{row['Sınıf']}={row['Sınıf Danışmanı']}" for row in previous_rows or []))
+
+
+def _holiday_indices(week):
+    holidays = _days(week.get("Tatil Günleri", ""))
+    return [d for d, d_name in enumerate(DAY_NAMES) if d_name in holidays]
+
+def _close_holidays(rows, week):
+    holidays = _days(week.get("Tatil Günleri", ""))
+    for row in rows:
+        for d_name in DAY_NAMES:
+            if d_name in holidays:
+                row[d_name] = HOLIDAY_CELL
+    return rows
+
+
+# --- DÖNEM (KAYAN UFUK) ---
+def solve_term(teachers_list, classes_list, weeks, time_limit=600.0, num_workers=8, advisor_continuity=True,
+               progress=None, **solve_kwargs):
+    # Haftalar sırayla çözülür: k. hafta kesinleşir, k+1. hafta k. haftanın programıyla
+    # ısınır ve ona en az değişiklikle bağlanır (minimal_change). Bellekte sadece program
+    # satırları tutulur. Süre bütçesi kalan ders haftalarına eşit bölünür; girdisi önceki bir
+    # haftayla aynı olan hafta yeniden çözülmez. Danışman sürekliliği kesin bir sabitleme değil,
+    # önceki haftanın danışmanlarına verilen ödüldür (bkz. engine.ADVISOR_CONTINUITY_BONUS).
+    teaching_left = sum(1 for w in weeks if w.get("Durum", WEEK_TEACHING) == WEEK_TEACHING)
+    deadline = time.monotonic() + time_limit
+    solved = {}
+    previous_rows = None
+    results = []
+    for week in weeks:
+        result = {"Hafta": week["Hafta"], "Durum": week.get("Durum", WEEK_TEACHING)}
+        if result["Durum"] != WEEK_TEACHING:
+            results.append(dict(result, status="SKIPPED"))
+            if progress:
+                progress(results[-1])
+            continue
+
+        week_list = week_teachers(teachers_list, week)
+        key = make_cache_key(week_list, classes_list, {
+            "Tatil Günleri": week.get("Tatil Günleri", ""),
+            "Önceki Danışmanlar": _previous_advisors(previous_rows) if advisor_continuity else "",
+        })
+        week_time = max(1.0, (deadline - time.monotonic()) / max(1, teaching_left))
+        teaching_left -= 1
+
+        if key in solved:
+            payload = dict(solved[key], reused=True)
+        else:
+            status, solver, x, advisor_var, adjusted_targets, *_ = generate_schedule(
+                week_list, classes_list, time_limit=week_time, num_workers=num_workers,
+                hint_schedule=previous_rows, minimal_change=previous_rows is not None,
+                closed_days=_holiday_indices(week), advisor_continuity=advisor_continuity, **solve_kwargs
+            )
+            status_name = solver.StatusName(status)
+            payload = {"status": status_name, "solver_stats": solver_stats(solver, status), "reused": False}
+            if status_name in ("OPTIMAL", "FEASIBLE"):
+                # İstatistik ve ihlaller tatil günleri kapatılmış atamadan hesaplanır.
+                assignment, advisor = extract_assignment(solver, x, advisor_var, len(week_list), len(classes_list))
+                assignment[:, :, _holiday_indices(week), :] = 0
+                res_data, stats, violations = build_reports(
+                    solver, x, advisor_var, week_list, classes_list, adjusted_targets,
+                    assignment=assignment, advisor=advisor,
+                )
+                payload.update({"schedule": _close_holidays(res_data, week), "stats": stats, "violations": violations})
+            solved[key] = payload
+
+        if payload.get("schedule"):
+            previous_rows = payload["schedule"]
+        results.append(dict(result, **payload))
+        if progress:
+            progress(results[-1])
+    return results
+
+
+def term_summary(results):
+    rows = []
+    for r in results:
+        schedule = r.get("schedule") or []
+        rows.append({
+            "Hafta": r["Hafta"],
+            "Durum": r["Durum"],
+            "Çözüm": r["status"],
+            "Boş Ders": sum(1 for row in schedule for d in DAY_NAMES if row[d] == "🔴 BOŞ"),
+            "İhlal": len(r.get("violations") or []),
+            "Önceki Haftadan": "Evet" if r.get("reused") else "",
+        })
+    return rows
@@ -1,25 +1,7 @@
 import pytest
-from app import generate_schedule
+from engine import generate_schedule
 from ortools.sat.python import cp_model
-
-def create_mock_teacher(name="Hoca", role="Destek", target=5, preferences="", forbidden="", fixed_class="", allowed_levels="Hepsi"):
-    return {
-        'Ad Soyad': name,
-        'Rol': role,
-        'Hedef Ders Sayısı': target,
-        'Tercih (Sabah/Öğle)': preferences,
-        'Yasaklı Günler': forbidden,
-        'Sabit Sınıf': fixed_class,
-        'Yetkinlik (Seviyeler)': allowed_levels,
-        'İstenmeyen Partner': ''
-    }
-
-def create_mock_class(name="A1.01", level="A1", session=0): # 0: Sabah, 1: Öğle
-    return {
-        'Sınıf Adı': name,
-        'Seviye': level,
-        'Zaman Kodu': session
-    }
+from mock_data import create_mock_teacher, create_mock_class
 
 def run_solver(teachers, classes, allow_native_advisor=False, reduce_mode=False):
     status, solver, x, advisor_var, adjusted_targets, days, day_names, sessions = generate_schedule(
@@ -217,3 +199,343 @@ def test_native_siniri():
     # H1 (Native) C1'e en fazla 1 kere girmeli
     assigned_days = sum(solver.Value(x[(0, 0, d, s)]) for d in days for s in sessions)
     assert assigned_days <= 1
+
+def test_motor_streamlit_bagimsiz():
+    import subprocess, sys
+    code = "import engine, sys; assert 'streamlit' not in sys.modules and 'ortools' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_kapasite_ve_kirpma():
+    from engine import compute_capacity
+    t = [
+        create_mock_teacher("Ek", role="Ek Görevli", target=2),
+        create_mock_teacher("Destek", role="Destek", target=5, forbidden="Cuma"),
+        create_mock_teacher("Native", role="Native", target=5),
+    ]
+    c = [create_mock_class("C1", session=0), create_mock_class("P1", level="PreFaculty", session=1)]
+    capacity = compute_capacity(t, c)
+    assert capacity["morning_needs"] == 5
+    assert capacity["afternoon_needs"] == 3
+    assert capacity["base_targets"] == [2, 4, 5]
+
+    # 11 saat kapasite, 8 saat ihtiyaç. Kırpma modelde yapılır: Destek Cuma'ya giremediği
+    # için A1'in 5. saatini Ek Görevli alır, Ek'in diğer saati kırpılır, Destek korunur.
+    # Native A1'e giremez; PreFaculty'nin 3 saatini alır ve kırpılmaz (boşta kalır).
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(t, c, reduce_mode=True, time_limit=10.0)
+    assert status == cp_model.OPTIMAL
+    assert sum(solver.Value(v) for v in x.values()) == 8
+    assert adjusted == [1, 4, 5]
+
+def test_seyrek_degiskenler():
+    from engine import build_eligibility
+    t = [
+        create_mock_teacher("H1", allowed_levels="A1,A2"),
+        create_mock_teacher("N1", role="Native"),
+        create_mock_teacher("E1", role="Ek Görevli"),
+    ]
+    c = [create_mock_class("A1.01", level="A1", session=0), create_mock_class("P1", level="PreFaculty", session=1)]
+    x_keys, adv_keys = build_eligibility(t, c)
+
+    # H1: sadece A1 sabah (5 gün); N1: A1 yasak, PreFac öğle 3 gün; E1: her ikisi (5 + 3)
+    assert len(x_keys) == 5 + 3 + 8
+    assert (0, 0, 0, 1) not in x_keys
+    assert (1, 0, 0, 0) not in x_keys
+    assert (2, 1, 3, 1) not in x_keys
+    assert adv_keys == [(0, 0)]
+
+def test_kademeli_cozum():
+    t = [
+        create_mock_teacher("H1", fixed_class="C1", target=5, preferences="Sabah"),
+        create_mock_teacher("H2", target=5, forbidden="Cuma"),
+        create_mock_teacher("N1", role="Native", target=2),
+    ]
+    c = [create_mock_class("C1", level="B1", session=0), create_mock_class("C2", level="B2", session=1)]
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(
+        t, c, False, False, solve_mode="tiered", time_limit=10.0
+    )
+    assert status == cp_model.OPTIMAL
+
+    # 1. kademe: 10 slotun hepsi dolmalı (H1 5 + H2 4 + N1 2 kapasite)
+    filled = sum(solver.Value(v) for v in x.values())
+    assert filled == 10
+    # 2. kademe: doluluk korunurken H2 yasaklı Cuma'ya konmamalı
+    assert all(solver.Value(x[(1, c_idx, 4, s)]) == 0 for c_idx in range(len(c)) for s in sessions)
+    # 3. kademe: H1 danışman olduğu sınıfa Pazartesi girer
+    assert solver.Value(adv[(0, 0)]) == 1
+    assert solver.Value(x[(0, 0, 0, 0)]) == 1
+
+@pytest.mark.parametrize("solve_mode", ["weighted", "tiered"])
+def test_yasakli_gun_kademeli_ve_agirlikli_ayni(solve_mode):
+    from engine import build_reports
+    # İki hoca da Pazartesi gelemiyor: iki modda da Pazartesi boş kalır, ihlal yazılmaz.
+    t = [create_mock_teacher("H1", forbidden="Pazartesi"), create_mock_teacher("H2", forbidden="Pazartesi")]
+    c = [create_mock_class("C1", level="B1", session=0)]
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(
+        t, c, False, False, solve_mode=solve_mode, time_limit=10.0
+    )
+    assert status == cp_model.OPTIMAL
+    program, stats, violations = build_reports(solver, x, adv, t, c, adjusted)
+    assert program[0]["Pazartesi"] == "🔴 BOŞ"
+    assert all(program[0][d] != "🔴 BOŞ" for d in day_names[1:])
+    assert not any("Yasaklı Gün" in v["Sorun"] for v in violations)
+
+def test_simetri_gruplari():
+    from engine import find_equivalent_teachers, find_equivalent_classes
+    t = [
+        create_mock_teacher("H1", target=4),
+        create_mock_teacher("H2", target=4),
+        create_mock_teacher("H3", target=4, forbidden="Cuma"),
+        create_mock_teacher("H4", target=4, fixed_class="A1.01"),
+    ]
+    c = [
+        create_mock_class("A1.01"), create_mock_class("A1.02"), create_mock_class("A1.03"),
+        create_mock_class("B1.01", level="B1"), create_mock_class("B1.02", level="B1", session=1),
+    ]
+    assert find_equivalent_teachers(t, [4, 4, 4, 4]) == [[0, 1]]
+    assert find_equivalent_classes(t, c) == [[1, 2]]
+
+def test_simetri_kirma_optimumu_degistirmez():
+    t = [create_mock_teacher(f"H{i}", target=3) for i in range(4)] + [create_mock_teacher("N1", role="Native", target=3)]
+    c = [create_mock_class(f"A2.0{i}", level="A2") for i in range(1, 4)]
+    values = []
+    for sb in (False, True):
+        status, solver, *_ = generate_schedule(t, c, False, False, time_limit=20.0, symmetry_breaking=sb)
+        assert status == cp_model.OPTIMAL
+        values.append(solver.ObjectiveValue())
+    assert values[0] == values[1]
+
+def test_onceki_programdan_isinmali_baslangic():
+    from engine import build_reports
+    t = [create_mock_teacher(f"H{i}", target=4) for i in range(6)]
+    c = [create_mock_class(f"B1.0{i}", level="B1", session=i % 2) for i in range(1, 5)]
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(t, c, False, False, time_limit=20.0)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    program, _, _ = build_reports(solver, x, adv, t, c, adjusted)
+
+    # H0 artık Pazartesi gelemiyor; geri kalan program mümkün olduğunca korunmalı.
+    t[0]['Yasaklı Günler'] = "Pazartesi"
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(
+        t, c, False, False, time_limit=20.0, hint_schedule=program, minimal_change=True
+    )
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    new_program, _, _ = build_reports(solver, x, adv, t, c, adjusted)
+
+    changed = sum(1 for old, new in zip(program, new_program) for d in day_names if old[d] != new[d])
+    assert changed <= 4
+    assert all(row["Pazartesi"] != "H0" for row in new_program)
+
+def test_ogretmen_tablosu():
+    from engine import build_teacher_table, LEVEL_BITS, PREF_MORNING, PREF_AFTERNOON, PREF_ANY
+    t = [
+        create_mock_teacher("H1", role="Ek Görevli", preferences="Sabah", forbidden="Pazartesi,Cuma", allowed_levels="B1,B2"),
+        create_mock_teacher("H2", role="native", preferences="ÖĞLE", fixed_class="C2"),
+        create_mock_teacher("H3", role="Destek", preferences="", allowed_levels=""),
+    ]
+    c = [create_mock_class("C1"), create_mock_class("C2")]
+    table = build_teacher_table(t, c)
+
+    assert table.is_ek.tolist() == [True, False, False]
+    assert table.is_native.tolist() == [False, True, False]
+    assert table.is_destek.tolist() == [False, False, True]
+    assert table.competence[0] == LEVEL_BITS["B1"] | LEVEL_BITS["B2"]
+    assert table.competence[2] == sum(LEVEL_BITS.values())
+    assert table.forbidden[0] == (1 << 0) | (1 << 4)
+    assert table.forbidden_count().tolist() == [2, 0, 0]
+    assert table.pref.tolist() == [PREF_MORNING, PREF_AFTERNOON, PREF_ANY]
+    assert table.fixed_class.tolist() == [-1, 1, -1]
+    assert table.can_advise(False).tolist() == [False, False, True]
+    assert table.can_advise(True).tolist() == [False, True, True]
+
+def test_toplu_cozum_cikarimi():
+    from engine import extract_assignment, build_reports
+    t = [
+        create_mock_teacher("H1", target=5, preferences="Öğle", fixed_class="C1"),
+        create_mock_teacher("H2", target=5, forbidden="Salı"),
+        create_mock_teacher("N1", role="Native", target=3),
+    ]
+    c = [create_mock_class("C1", level="B1", session=0), create_mock_class("C2", level="B2", session=1)]
+    status, solver, x, adv, adjusted, days, day_names, sessions = run_solver_full(t, c)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+    assignment, advisor = extract_assignment(solver, x, adv, len(t), len(c))
+    assert assignment.shape == (3, 2, 5, 2)
+    for t_idx in range(len(t)):
+        for c_idx in range(len(c)):
+            for d in days:
+                for s in sessions:
+                    assert assignment[t_idx, c_idx, d, s] == solver.Value(x[(t_idx, c_idx, d, s)])
+    assert advisor[0] == 0
+
+    program, stats, violations = build_reports(solver, x, adv, t, c, adjusted)
+    assert [s["Atanan"] for s in stats] == assignment.sum(axis=(1, 2, 3)).tolist()
+    for row, c_idx in zip(program, range(len(c))):
+        for d_idx, d_name in enumerate(day_names):
+            who = [t[i]['Ad Soyad'] for i in range(len(t)) if assignment[i, c_idx, d_idx].any()]
+            assert row[d_name] == (who[0] if who else "🔴 BOŞ")
+
+def test_bos_kadro_raporu():
+    from engine import build_reports
+    # Sadece başlık satırı olan kadro: çökmek yerine tüm dersler boş raporlanır.
+    c = [create_mock_class("C1", level="B1"), create_mock_class("P1", level="PreFaculty", session=1)]
+    status, solver, x, adv, adjusted, days, day_names, sessions = run_solver_full([], c)
+    program, stats, violations = build_reports(solver, x, adv, [], c, adjusted)
+    assert [row["Sınıf Danışmanı"] for row in program] == ["Atanamadı", "Atanamadı"]
+    assert all(program[0][d] == "🔴 BOŞ" for d in day_names)
+    assert [program[1][d] for d in day_names] == ["🔴 BOŞ"] * 3 + ["⛔ KAPALI"] * 2
+    assert stats == [] and violations == []
+
+def run_solver_full(teachers, classes, allow_native_advisor=False):
+    return generate_schedule(teachers, classes, allow_native_advisor, False, time_limit=10.0)
+
+def test_cozumsuzluk_aciklamasi():
+    from engine import explain_infeasibility, RULE_FIXED_CLASS, RULE_ADVISOR_UNIQUE, RULE_ROLE
+    c = [create_mock_class("C1"), create_mock_class("C2", level="B1")]
+
+    # İki hoca aynı sınıfa sabit: çekirdek iki sabitleme + sınıfın danışman tekilliği.
+    t = [create_mock_teacher("H1", fixed_class="C1"), create_mock_teacher("H2", fixed_class="C1")]
+    status, *_ = run_solver(t, c)
+    assert status == cp_model.INFEASIBLE
+    conflicts = explain_infeasibility(t, c)
+    assert sorted((r["Kural"], r["Hoca"], r["Sınıf"]) for r in conflicts) == sorted([
+        (RULE_FIXED_CLASS, "H1", "C1"), (RULE_FIXED_CLASS, "H2", "C1"), (RULE_ADVISOR_UNIQUE, "", "C1"),
+    ])
+
+    # Ek Görevli danışman olamaz.
+    t = [create_mock_teacher("H1", role="Ek Görevli", fixed_class="C2"), create_mock_teacher("H2")]
+    conflicts = explain_infeasibility(t, c)
+    assert {(r["Kural"], r["Hoca"]) for r in conflicts} == {(RULE_FIXED_CLASS, "H1"), (RULE_ROLE, "H1")}
+
+    assert explain_infeasibility([create_mock_teacher("H1"), create_mock_teacher("H2")], c) == []
+
+def test_akis_kapasite_on_kontrolu():
+    from engine import max_fillable_slots
+    t = [
+        create_mock_teacher("H1", target=5, allowed_levels="A1", forbidden="Cuma"),
+        create_mock_teacher("H2", target=5, role="Native"),
+        create_mock_teacher("H3", target=2, allowed_levels="B1"),
+    ]
+    c = [create_mock_class("C1", level="A1"), create_mock_class("C2", level="B1"), create_mock_class("C3", level="PreFaculty", session=1)]
+    result = max_fillable_slots(t, c)
+    by_group = {(r["Seviye"], r["Zaman"]): (r["İhtiyaç"], r["Doldurulabilir"]) for r in result["by_group"]}
+
+    # A1: sadece H1 (Native giremez) ve Cuma yasak -> 4; PreFaculty 3 gün açık, H2 girebilir.
+    assert by_group[("A1", "Sabah")] == (5, 4)
+    assert by_group[("B1", "Sabah")] == (5, 5)
+    assert by_group[("PreFaculty", "Öğle")] == (3, 3)
+    assert result["total_slots_needed"] == 13
+    # Birlikte: H2 (5) ve H3 (2) B1 + PreFaculty'nin 8 saatini paylaşır -> 4 + 7.
+    assert result["max_fillable"] == 4 + 7
+
+    # Akış değeri modelin ulaştığı doluluğa eşittir.
+    status, solver, x, adv, days, sessions = run_solver(t, c)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    assert sum(solver.Value(v) for v in x.values()) == result["max_fillable"]
+
+def test_kirpma_rol_icinde_esit_yayilir():
+    t = [create_mock_teacher("D1", target=5), create_mock_teacher("D2", target=5), create_mock_teacher("Ek", role="Ek Görevli", target=2)]
+    c = [create_mock_class("C1", level="B1")]
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(t, c, reduce_mode=True, time_limit=10.0)
+    assert status == cp_model.OPTIMAL
+    # 12 saatin 7'si fazla: Ek tamamen, Destekler 3 + 2 kırpılır.
+    assert adjusted[2] == 0
+    assert sorted(adjusted[:2]) == [2, 3]
+
+def test_sinif_basina_max_hoca():
+    t = [create_mock_teacher(f"H{i}", target=2) for i in range(4)]
+    c = [create_mock_class("C1", level="B1")]
+
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(t, c, reduce_mode=False, time_limit=10.0)
+    assert sum(solver.Value(v) for v in x.values()) == 5
+
+    # En fazla 2 farklı hoca, her biri en fazla 2 gün -> 4 ders dolabilir.
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(
+        t, c, reduce_mode=False, time_limit=10.0, max_teachers_per_class=2
+    )
+    assert status == cp_model.OPTIMAL
+    present = [t_idx for t_idx in range(len(t)) if any(solver.Value(x[(t_idx, 0, d, 0)]) for d in days)]
+    assert len(present) == 2
+    assert sum(solver.Value(v) for v in x.values()) == 4
+
+def test_istenmeyen_partner():
+    from engine import build_reports, build_teacher_table, find_equivalent_teachers
+    t = [create_mock_teacher("H1", target=3, partner="H2"), create_mock_teacher("H2", target=3), create_mock_teacher("H3", target=3)]
+    c = [create_mock_class("C1", level="B1"), create_mock_class("C2", level="B1", session=1)]
+    table = build_teacher_table(t, c)
+    assert table.partner_pairs == [(0, 1)]
+    assert find_equivalent_teachers(t, [3, 3, 3]) == []
+
+    # Kesin: H1 ve H2 hiçbir sınıfı paylaşmaz, tüm saatler yine dolar.
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(
+        t, c, reduce_mode=False, time_limit=10.0, partner_rule="hard"
+    )
+    assert status == cp_model.OPTIMAL
+    for c_idx in range(len(c)):
+        s = c[c_idx]['Zaman Kodu']
+        assert not (any(solver.Value(x[(0, c_idx, d, s)]) for d in days) and any(solver.Value(x[(1, c_idx, d, s)]) for d in days))
+    assert sum(solver.Value(v) for v in x.values()) == 9
+
+    # Esnek: tek sınıf ve iki hoca varken doluluk için paylaşırlar, ihlal raporlanır.
+    t = [create_mock_teacher("H1", target=3, partner="H2"), create_mock_teacher("H2", target=3)]
+    c = [create_mock_class("C1", level="B1")]
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(t, c, reduce_mode=False, time_limit=10.0)
+    assert sum(solver.Value(v) for v in x.values()) == 5
+    program, stats, violations = build_reports(solver, x, adv, t, c, adjusted)
+    assert {"Hoca": "H1", "Sorun": "İstenmeyen Partner (H2)", "Sınıf": "C1"} in violations
+
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(
+        t, c, reduce_mode=False, time_limit=10.0, partner_rule="hard"
+    )
+    assert sum(solver.Value(v) for v in x.values()) == 3
+
+def test_cozucu_profilleri():
+    from engine import solver_profile, solver_stats, SOLVER_PROFILES
+    assert set(SOLVER_PROFILES) == {"quick", "balanced", "exhaustive"}
+    quick = solver_profile("quick", cores=16, seed=7)
+    assert quick["num_workers"] == 4 and quick["time_limit"] < solver_profile("balanced", cores=16)["time_limit"]
+    assert quick["params"]["random_seed"] == 7
+    assert solver_profile("exhaustive", cores=16)["num_workers"] == 16
+    assert solver_profile("balanced", cores=2)["num_workers"] == 2
+    with pytest.raises(ValueError):
+        solver_profile("yok")
+
+    t = [create_mock_teacher("H1"), create_mock_teacher("H2")]
+    c = [create_mock_class("C1", level="B1")]
+    status, solver, *_ = generate_schedule(t, c, profile="quick", random_seed=3)
+    assert solver.parameters.random_seed == 3
+    assert solver.parameters.relative_gap_limit == SOLVER_PROFILES["quick"]["params"]["relative_gap_limit"]
+    # Profil verilmese de tohum çözücüye geçer (kademeli modda her kademenin çözücüsüne).
+    for solve_mode in ("weighted", "tiered"):
+        _, solver, *_ = generate_schedule(t, c, time_limit=5.0, num_workers=1, solve_mode=solve_mode, random_seed=11)
+        assert solver.parameters.random_seed == 11
+    stats = solver_stats(solver, status)
+    assert stats["Durum"] in ("OPTIMAL", "FEASIBLE") and stats["Amaç"] is not None
+
+def test_kurulum_ve_cozucu_olcumu():
+    t = [create_mock_teacher("H1", preferences="Sabah"), create_mock_teacher("N1", role="Native"),
+         create_mock_teacher("D1", role="Danışman")]
+    c = [create_mock_class("B1.01", level="B1"), create_mock_class("B2.01", level="B2", session=1)]
+    record = {}
+    status, solver, *_ = generate_schedule(t, c, reduce_mode=True, num_workers=1, instrumentation=record)
+
+    build = record["Kurulum"]
+    families = {f["Aile"]: f for f in build["Aileler"]}
+    assert {"Kesin Kurallar", "Native Şelalesi", "Danışman Pazartesi / 2-3 Gün Ödülleri", "Vardiya Tercihleri",
+            "Çift Vardiya Cezası", "Hedefler, Kırpma ve Yasaklı Günler"} <= set(families)
+    # Aileler kurulumu eksiksiz böler: sayılar modelin toplamını verir.
+    assert sum(f["Değişken"] for f in families.values()) == build["Değişken"]
+    assert sum(f["Kısıt"] for f in families.values()) == build["Kısıt"]
+    assert families["Kesin Kurallar"]["Kısıt"] > 0 and families["Vardiya Tercihleri"]["Amaç Terimi"] > 0
+
+    solver_record = record["Çözücü"]
+    assert solver_record["Durum"] == solver.StatusName(status)
+    assert solver.parameters.log_search_progress
+    assert solver_record["Ön Çözüm (sn)"] is not None and solver_record["Deterministik Süre"] >= 0
+
+    # Ölçüm istenmezse arama günlüğü tutulmaz.
+    status, solver, *_ = generate_schedule(t, c, reduce_mode=True, num_workers=1)
+    assert not solver.parameters.log_search_progress and not solver.ResponseProto().solve_log
+
+def test_native_listesi_tablodan():
+    from engine import build_teacher_table
+    t = [create_mock_teacher("N1", role="Native"), create_mock_teacher("H1"), create_mock_teacher("N2", role="native ")]
+    assert build_teacher_table(t).native_names() == ["N1", "N2"]
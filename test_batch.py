@@ -0,0 +1,42 @@
+import csv
+import json
+
+import openpyxl
+import pandas as pd
+
+from batch import main, department_settings
+
+def roster(n, prefix):
+    return pd.DataFrame({
+        'Ad Soyad': [f"{prefix} {i}" for i in range(n)], 'Rol': ['Destek'] * n, 'Hedef Ders Sayısı': [5] * n,
+        'Tercih (Sabah/Öğle)': ['Farketmez'] * n, 'Yasaklı Günler': [''] * n, 'Sabit Sınıf': [''] * n,
+        'Yetkinlik (Seviyeler)': ['Hepsi'] * n, 'İstenmeyen Partner': [''] * n,
+    })
+
+def test_bolum_ayarlari_varsayilanin_ustune_yazilir():
+    settings = department_settings({"default": {"count_a1": 1}, "Muhendislik": {"count_a1": 2, "time_b1": "Öğle"}}, "Muhendislik")
+    assert settings["count_a1"] == 2 and settings["time_b1"] == "Öğle"
+    assert settings["max_teachers_per_class"] == 3
+    assert department_settings({"default": {"count_a1": 1}}, "Hukuk")["count_a1"] == 1
+
+def test_klasor_toplu_cozum(tmp_path):
+    inputs, out = tmp_path / "kadrolar", tmp_path / "sonuc"
+    inputs.mkdir()
+    roster(2, "Hukuk").to_excel(inputs / "Hukuk.xlsx", sheet_name="Ogretmenler", index=False)
+    roster(3, "Tip").to_csv(inputs / "Tip.csv", index=False)
+    roster(1, "Bozuk").drop(columns=['Rol']).to_csv(inputs / "Bozuk.csv", index=False)
+    (inputs / "~$Hukuk.xlsx").write_bytes(b"")
+    settings = tmp_path / "ayarlar.json"
+    zero = {f"count_{k}": 0 for k in ("a1", "a2", "b1", "b2", "pre")}
+    settings.write_text(json.dumps({"default": dict(zero, count_b1=1), "Tip": dict(zero, count_b1=2)}), encoding="utf-8")
+
+    main([str(inputs), "--output", str(out), "--settings", str(settings), "--time-limit", "10", "--cores", "2",
+          "--workers-per-job", "1"])
+
+    with open(out / "ozet.csv", encoding="utf-8-sig") as fh:
+        rows = {r["Bölüm"]: r for r in csv.DictReader(fh)}
+    assert set(rows) == {"Bozuk", "Hukuk", "Tip"}
+    assert rows["Bozuk"]["Durum"].startswith("GİRDİ HATASI")
+    assert rows["Hukuk"]["Durum"] == "OPTIMAL" and rows["Hukuk"]["Sınıf Sayısı"] == "1"
+    assert rows["Tip"]["Sınıf Sayısı"] == "2" and rows["Tip"]["Boş Ders"] == "0"
+    assert "Program" in openpyxl.load_workbook(rows["Tip"]["Çıktı"]).sheetnames
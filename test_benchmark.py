@@ -0,0 +1,29 @@
+import json
+
+from benchmark import generate_instance, main
+from engine import analyze_data
+
+def test_uretici_tekrarlanabilir_ve_gecerli():
+    teachers, classes = generate_instance(50, seed=3)
+    assert generate_instance(50, seed=3) == (teachers, classes)
+    assert len(classes) == 50
+
+    errors, _ = analyze_data(teachers, classes)
+    assert errors == []
+    assert any(t['Sabit Sınıf'] for t in teachers)
+
+    needed = sum(3 if c['Seviye'] == 'PreFaculty' else 5 for c in classes)
+    assert sum(t['Hedef Ders Sayısı'] for t in teachers) >= needed
+
+def test_rapor_json(tmp_path):
+    out = tmp_path / "bench.json"
+    main(["--sizes", "10", "--time-limit", "2", "--workers", "2", "--output", str(out)])
+    report = json.loads(out.read_text(encoding="utf-8"))
+
+    case = report["cases"][0]
+    assert case["n_classes"] == 10
+    assert case["num_variables"] > 0 and case["num_constraints"] > 0
+    assert case["status"] in ("OPTIMAL", "FEASIBLE")
+    assert case["gap"] is not None
+    assert case["instrumentation"]["Kurulum"]["Değişken"] == case["num_variables"]
+    assert case["instrumentation"]["Çözücü"]["Dallanma"] >= 0
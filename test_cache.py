@@ -0,0 +1,27 @@
+from cache import SolutionCache, make_cache_key
+
+TEACHERS = [{'Ad Soyad': 'H1', 'Rol': 'Destek', 'Hedef Ders Sayısı': 4, 'Yasaklı Günler': ''}]
+CLASSES = [{'Sınıf Adı': 'A1.01', 'Seviye': 'A1', 'Zaman Kodu': 0}]
+SETTINGS = {'max_teachers_per_class': 3, 'allow_native_advisor': False}
+
+def test_anahtar_normalizasyonu():
+    key = make_cache_key(TEACHERS, CLASSES, SETTINGS)
+    same = [{'Ad Soyad': 'H1 ', 'Rol': 'Destek', 'Hedef Ders Sayısı': 4.0, 'Yasaklı Günler': ''}]
+    assert make_cache_key(same, CLASSES, SETTINGS) == key
+    assert make_cache_key(TEACHERS, CLASSES, dict(SETTINGS, allow_native_advisor=True)) != key
+
+def test_lru_tahliye(tmp_path):
+    cache = SolutionCache(str(tmp_path), max_entries=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.put("c", {"v": 3})
+    assert "b" not in cache
+    assert not (tmp_path / "b.json").exists()
+    assert cache.get("a") == {"v": 1}
+
+def test_diskten_geri_yukleme(tmp_path):
+    SolutionCache(str(tmp_path)).put("k", {"schedule": [{"Sınıf": "A1.01"}]})
+    reopened = SolutionCache(str(tmp_path))
+    assert reopened.get("k") == {"schedule": [{"Sınıf": "A1.01"}]}
+    assert reopened.get("missing") is None
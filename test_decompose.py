@@ -0,0 +1,66 @@
+from ortools.sat.python import cp_model
+
+from decompose import allocate_shift_hours
+from engine import generate_schedule, build_reports
+from mock_data import create_mock_teacher, create_mock_class
+
+def test_vardiya_saat_bolusumu():
+    t = [
+        create_mock_teacher("Sabahci", preferences="Sabah"),
+        create_mock_teacher("Oglenci", preferences="Öğle"),
+        create_mock_teacher("Esnek", target=4),
+    ]
+    c = [create_mock_class("M1", level="B1", session=0), create_mock_class("M2", level="B1", session=0), create_mock_class("O1", level="B1", session=1)]
+    hours = allocate_shift_hours(t, c, time_limit=5.0, num_workers=1)
+
+    # 10 sabah + 5 öğle saati: tercihliler kendi vardiyasında kalır, Farketmez hoca sabaha gider.
+    assert hours[0] == [5, 0]
+    assert hours[1] == [0, 5]
+    assert hours[2] == [4, 0]
+
+def test_ayristirilmis_cozum_tam_programi_verir():
+    t = [create_mock_teacher(f"H{i}", preferences="Sabah" if i < 2 else "Öğle") for i in range(4)]
+    t[0]['Sabit Sınıf'] = "M1"
+    c = [create_mock_class("M1", level="B1", session=0), create_mock_class("M2", level="B1", session=0), create_mock_class("O1", level="B1", session=1)]
+    status, solver, x, adv, adjusted, days, day_names, sessions = generate_schedule(
+        t, c, time_limit=10.0, num_workers=2, solve_mode="decomposed"
+    )
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    program, stats, violations = build_reports(solver, x, adv, t, c, adjusted)
+    assert all(row[d] != "🔴 BOŞ" for row in program for d in day_names)
+    assert program[0]["Sınıf Danışmanı"] == "H0"
+    assert not any("Ters Vardiya" in v["Sorun"] for v in violations)
+
+def test_danismanligi_engellenen_hoca_simetri_grubuna_girmez():
+    from engine import build_model, solve_model, find_equivalent_teachers
+    # Aynı profilde üç hoca; ilk ikisinin danışmanlığı diğer vardiyaya bırakılmış.
+    t = [create_mock_teacher(f"H{i}") for i in range(3)]
+    c = [create_mock_class("M1", level="B1")]
+    assert find_equivalent_teachers(t, [5, 5, 5], advisor_blocked=[0, 1]) == [[0, 1]]
+
+    values = []
+    for sb in (False, True):
+        built = build_model(t, c, reduce_mode=False, symmetry_breaking=sb, advisor_blocked=[0, 1])
+        status, solver = solve_model(built, time_limit=10.0, num_workers=1)
+        assert status == cp_model.OPTIMAL
+        values.append(solver.ObjectiveValue())
+    assert values[0] == values[1]
+
+def test_ayristirilmis_cozum_durdurulunca_birlesik_programi_verir():
+    from engine import create_automated_classes
+    from jobs import SolveJob
+    t = [create_mock_teacher(f"H{i}", target=4, preferences=["Sabah", "Öğle", "Farketmez"][i % 3]) for i in range(30)]
+    c = create_automated_classes([(5, "A1", 0), (5, "A2", 0), (5, "B1", 1), (5, "B2", 1)])
+    job = SolveJob(t, c, time_limit=300.0, num_workers=2, solve_mode="decomposed").start()
+    # Her aşama ilerleme bildirir; ilk vardiya çözümü gelince durdurulur.
+    for _ in range(600):
+        if any(p["tier"] in ("Sabah Vardiyası", "Öğle Vardiyası") for p in job.progress):
+            break
+        job.join(0.1)
+    assert job.progress[0]["tier"] == "Ana Adım"
+    job.stop()
+    job.join(60)
+
+    assert not job.running and job.error is None
+    assert job.status_name in ("OPTIMAL", "FEASIBLE")
+    assert len(job.result["schedule"]) == len(c)
@@ -0,0 +1,44 @@
+import io
+
+import openpyxl
+
+from export import write_schedule_workbook
+
+RES_DATA = [
+    {"Sınıf": "A1.01", "Seviye": "A1", "Sınıf Danışmanı": "Ahmet", "Zaman": "Sabah",
+     "Pazartesi": "Ahmet", "Salı": "Ahmet", "Çarşamba": "Ayşe", "Perşembe": "Ayşe", "Cuma": "🔴 BOŞ"},
+    {"Sınıf": "B1.01", "Seviye": "B1", "Sınıf Danışmanı": "Ayşe", "Zaman": "Öğle",
+     "Pazartesi": "Sarah", "Salı": "Ayşe", "Çarşamba": "Sarah", "Perşembe": "Ayşe", "Cuma": "Sarah"},
+]
+STATS = [{"Hoca Adı": n, "Hedef": 4} for n in ("Ahmet", "Ayşe", "Sarah", "Mehmet")]
+VIOLATIONS = [{"Hoca": "Ayşe", "Sorun": "Çift Vardiya"}] * 2
+
+def build():
+    out = write_schedule_workbook(io.BytesIO(), RES_DATA, STATS, VIOLATIONS, ["Sarah"], {"Profil": "Dengeli"})
+    return openpyxl.load_workbook(io.BytesIO(out.getvalue()))
+
+def test_sayfalar_ve_program():
+    wb = build()
+    assert wb.sheetnames == ["Program", "Istatistikler", "Ihlal_Raporu", "Calisma_Kaydi",
+                             "Hoca_Programi", "Seviye_A1", "Seviye_B1", "Listeler"]
+    rows = list(wb["Program"].iter_rows(values_only=True))
+    assert rows[0][:4] == ("Sınıf", "Seviye", "Sınıf Danışmanı", "Zaman")
+    assert rows[2][4] == "Sarah"
+    # Tekrarlanan ihlal satırı bir kez yazılır.
+    assert wb["Ihlal_Raporu"].max_row == 2
+    assert wb["Listeler"].sheet_state == "hidden"
+
+def test_hoca_ve_seviye_sayfalari():
+    wb = build()
+    teacher_rows = {r[0]: r[1:] for r in wb["Hoca_Programi"].iter_rows(min_row=2, values_only=True)}
+    assert teacher_rows["Ahmet"][:2] == ("A1.01 (Sabah)", "A1.01 (Sabah)")
+    assert teacher_rows["Ayşe"] == (None, "B1.01 (Öğle)", "A1.01 (Sabah)", "A1.01 (Sabah) / B1.01 (Öğle)", None)
+    assert all(v is None for v in teacher_rows["Mehmet"])
+    assert [r[0] for r in wb["Seviye_B1"].iter_rows(min_row=2, values_only=True)] == ["B1.01"]
+
+def test_renkler_kosullu_bicimle_verilir():
+    wb = build()
+    rules = {str(rng): [r.formula[0] for r in cf.rules] for rng, cf in
+             ((cf.sqref, cf) for cf in wb["Program"].conditional_formatting)}
+    assert '$B2="A1"' in rules["A2:B3"]
+    assert "COUNTIF(NativeHocalar,E2)>0" in rules["E2:I3"]
@@ -0,0 +1,102 @@
+import io
+
+import pandas as pd
+import pytest
+
+from ingest import read_roster, validate_roster, load_roster, load_calendar
+
+ROWS = {
+    'Ad Soyad': ['Ahmet Hoca', 'Sarah', 'Mehmet'],
+    'Rol': ['Destek', 'native', 'Danışman'],
+    'Hedef Ders Sayısı': [4, 4.0, "3"],
+    'Tercih (Sabah/Öğle)': ['Sabah', '', 'ÖĞLE'],
+    'Yasaklı Günler': ['Cuma', 'Çarşamba, Pazartesi', ''],
+    'Sabit Sınıf': ['', '', 'A1.01'],
+    'Yetkinlik (Seviyeler)': ['A1,A2,B1', 'Hepsi', ''],
+    'İstenmeyen Partner': ['', '', 'Ahmet Hoca'],
+}
+
+def test_gecerli_liste_normalize_edilir():
+    teachers, errors = validate_roster(pd.DataFrame(ROWS))
+    assert errors == []
+    assert [t['Hedef Ders Sayısı'] for t in teachers] == [4, 4, 3]
+    assert teachers[1]['Rol'] == 'native'
+
+def test_tum_hatali_hucreler_tek_seferde_raporlanir():
+    rows = dict(ROWS)
+    rows['Ad Soyad'] = ['Ahmet Hoca', 'Ahmet Hoca', '']
+    rows['Rol'] = ['Destek', 'Müdür', 'Danışman']
+    rows['Hedef Ders Sayısı'] = [4, 'dört', -1]
+    rows['Yasaklı Günler'] = ['Cuma', 'pazartesi', 'Cumartesi']
+    rows['Yetkinlik (Seviyeler)'] = ['A1,C1', 'Hepsi', '']
+    teachers, errors = validate_roster(pd.DataFrame(rows))
+    found = {(e["Satır"], e["Sütun"]) for e in errors}
+    assert found == {
+        (2, 'Ad Soyad'), (3, 'Ad Soyad'), (4, 'Ad Soyad'),
+        (3, 'Rol'),
+        (3, 'Hedef Ders Sayısı'), (4, 'Hedef Ders Sayısı'),
+        (3, 'Yasaklı Günler'), (4, 'Yasaklı Günler'),
+        (2, 'Yetkinlik (Seviyeler)'),
+    }
+
+def test_eksik_zorunlu_sutun():
+    teachers, errors = validate_roster(pd.DataFrame({'Ad Soyad': ['A'], 'Rol': ['Destek']}))
+    assert teachers == []
+    assert errors == [{"Satır": 1, "Sütun": 'Hedef Ders Sayısı', "Değer": "", "Sorun": "Zorunlu sütun eksik"}]
+
+def test_xlsx_csv_parquet_ayni_sonucu_verir(tmp_path):
+    df = pd.DataFrame(ROWS).astype(str)
+    xlsx = tmp_path / "kadro.xlsx"
+    with pd.ExcelWriter(xlsx) as writer:
+        pd.DataFrame({'x': [1]}).to_excel(writer, sheet_name="Baska", index=False)
+        df.rename(columns={'Hedef Ders Sayısı': 'Hedef Gün Sayısı'}).to_excel(writer, sheet_name="Ogretmenler", index=False)
+    csv = io.BytesIO(df.to_csv(index=False).encode("utf-8"))
+    csv.name = "kadro.csv"
+
+    expected, _ = validate_roster(pd.DataFrame(ROWS))
+    assert load_roster(str(xlsx)) == (expected, [])
+    assert load_roster(csv) == (expected, [])
+    pytest.importorskip("pyarrow")
+    parquet = tmp_path / "kadro.parquet"
+    df.to_parquet(parquet)
+    assert load_roster(str(parquet)) == (expected, [])
+
+def test_desteklenmeyen_dosya_ve_eksik_sayfa(tmp_path):
+    with pytest.raises(ValueError):
+        read_roster("kadro.txt")
+    xlsx = tmp_path / "kadro.xlsx"
+    pd.DataFrame({'x': [1]}).to_excel(xlsx, sheet_name="Baska", index=False)
+    with pytest.raises(ValueError):
+        read_roster(str(xlsx))
+
+def test_donem_takvimi(tmp_path):
+    xlsx = tmp_path / "donem.xlsx"
+    with pd.ExcelWriter(xlsx) as writer:
+        pd.DataFrame({'Hafta': [2, 1, 3, 4], 'Durum': ['Ders', '', 'Sınav', 'Bayram'],
+                      'Tatil Günleri': ['Pazartesi', '', '', 'Pazar']}).to_excel(writer, sheet_name="Takvim", index=False)
+        pd.DataFrame({'Hafta': [1, 1, 9], 'Ad Soyad': ['Sarah', 'Sarah', 'Ali'],
+                      'Yasaklı Günler': ['Salı', 'Cuma', 'Salı']}).to_excel(writer, sheet_name="Haftalik_Musaitlik", index=False)
+    weeks, errors = load_calendar(str(xlsx))
+    assert [(w["Hafta"], w["Durum"]) for w in weeks] == [(1, "Ders"), (2, "Ders"), (3, "Sınav"), (4, "Bayram")]
+    assert weeks[0]["Yasaklı Günler"] == {"Sarah": "Salı,Cuma"}
+    assert weeks[1]["Tatil Günleri"] == "Pazartesi"
+    assert {(e["Sayfa"], e["Satır"], e["Sütun"]) for e in errors} == {
+        ("Takvim", 5, 'Durum'), ("Takvim", 5, 'Tatil Günleri'), ("Haftalik_Musaitlik", 4, 'Hafta'),
+    }
+
+def test_bos_satirdan_sonra_satir_numarasi_korunur(tmp_path):
+    rows = {k: list(v) for k, v in ROWS.items()}
+    rows['Rol'][2] = 'Müdür'
+    df = pd.DataFrame(rows).astype(str)
+    # Excel ve CSV'de 3. satır boş: Mehmet dosyada 5. satırdadır.
+    blank = pd.DataFrame([[""] * len(df.columns)], columns=df.columns)
+    df = pd.concat([df.iloc[:1], blank, df.iloc[1:]], ignore_index=True)
+    xlsx = tmp_path / "kadro.xlsx"
+    df.to_excel(xlsx, sheet_name="Ogretmenler", index=False)
+    csv = io.BytesIO(df.to_csv(index=False).replace(",,,,,,,", "").encode("utf-8"))
+    csv.name = "kadro.csv"
+
+    for source in (str(xlsx), csv):
+        teachers, errors = load_roster(source)
+        assert len(teachers) == 3
+        assert [(e["Satır"], e["Sütun"]) for e in errors] == [(5, 'Rol')]
@@ -0,0 +1,56 @@
+import pytest
+import random
+
+from engine import create_automated_classes
+from jobs import SolveJob
+from mock_data import create_mock_teacher
+
+def test_arka_plan_cozumu_ilerleme_raporlar():
+    t = [create_mock_teacher(f"H{i}", target=4) for i in range(3)]
+    c = create_automated_classes([(2, "A2", 0)])
+    job = SolveJob(t, c, reduce_mode=False, time_limit=10.0).start()
+    job.join(30)
+
+    assert not job.running
+    assert job.error is None
+    assert job.status_name == "OPTIMAL"
+    assert len(job.result["schedule"]) == 2
+    assert job.progress and job.latest["objective"] == job.result["solver_stats"]["Amaç"]
+    assert {"objective", "bound", "gap", "elapsed", "tier"} <= set(job.latest)
+
+def test_durdur_ve_en_iyiyi_kullan():
+    rng = random.Random(7)
+    t = [
+        create_mock_teacher(f"H{i}", role=rng.choice(["Destek", "Danışman", "Native"]),
+                            target=rng.choice([3, 4, 5]),
+                            preferences=rng.choice(["Sabah", "Öğle", "Farketmez"]),
+                            forbidden=rng.choice(["", "Cuma", "Salı"]))
+        for i in range(30)
+    ]
+    c = create_automated_classes([(5, "A1", 0), (5, "A2", 0), (5, "B1", 1), (5, "B2", 1)])
+    job = SolveJob(t, c, time_limit=300.0).start()
+    for _ in range(600):
+        if job.progress:
+            break
+        job.join(0.1)
+    job.stop()
+    job.join(30)
+
+    assert not job.running
+    assert job.status_name in ("OPTIMAL", "FEASIBLE")
+    assert len(job.result["schedule"]) == len(c)
+
+@pytest.mark.parametrize("solve_mode", ["weighted", "tiered", "decomposed"])
+def test_cozum_baslamadan_durdurma(solve_mode):
+    t = [create_mock_teacher(f"H{i}", target=4) for i in range(3)]
+    c = create_automated_classes([(2, "A2", 0)])
+    job = SolveJob(t, c, solve_mode=solve_mode, time_limit=10.0, num_workers=1, instrument=True)
+    # Durdurma model kurulmadan gelir: hiçbir aşamada Solve çağrılmaz.
+    job.stop()
+    job.start().join(30)
+
+    assert job.error is None
+    assert job.status_name == "UNKNOWN"
+    stats = job.result["solver_stats"]
+    assert stats["Durum"] == "UNKNOWN" and stats["Süre (sn)"] is None
+    assert job.result["instrumentation"]["Çözücü"]["Durum"] == "UNKNOWN"
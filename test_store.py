@@ -0,0 +1,50 @@
+from store import ScheduleStore
+
+def make_row(name, level, advisor, days):
+    row = {"Sınıf": name, "Seviye": level, "Sınıf Danışmanı": advisor, "Zaman": "Sabah"}
+    row.update(zip(["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"], days))
+    return row
+
+WEEK_1 = [
+    make_row("A1.01", "A1", "Ahmet", ["Ahmet", "Ahmet", "Ayşe", "Ayşe", "Ayşe"]),
+    make_row("PreFaculty.01", "PreFaculty", "Mehmet", ["Mehmet", "Mehmet", "Mehmet", "⛔ KAPALI", "⛔ KAPALI"]),
+]
+WEEK_2 = [
+    make_row("A1.01", "A1", "Ahmet", ["Ahmet", "Sarah", "Ayşe", "Ayşe", "🔴 BOŞ"]),
+    make_row("B1.01", "B1", "Can", ["Can", "Can", "Can", "Can", "Can"]),
+]
+
+def payload(rows):
+    return {"status": "OPTIMAL", "schedule": rows, "stats": [{"Hoca Adı": "Ahmet"}], "violations": [],
+            "solver_stats": {"Durum": "OPTIMAL"}}
+
+def test_kaydet_ve_yeniden_yukle(tmp_path):
+    store = ScheduleStore(str(tmp_path / "programlar.sqlite3"))
+    v1 = store.save(payload(WEEK_1), "2026 Güz", "Hazırlık", "abc", {"solve_mode": "weighted"}, ["Sarah"])
+    store.save(payload(WEEK_2), "2026 Güz", "Hazırlık", "def")
+    store.save(payload(WEEK_2), "2026 Güz", "Mühendislik", "def")
+
+    loaded = store.load(v1)
+    assert loaded["schedule"] == WEEK_1
+    assert loaded["settings"] == {"solve_mode": "weighted"}
+    assert loaded["native_names"] == ["Sarah"]
+    assert [v["inputs_hash"] for v in store.versions("2026 Güz", "Hazırlık")] == ["def", "abc"]
+    store.close()
+
+    # Depo diskten yeniden açıldığında sürümler korunur.
+    assert len(ScheduleStore(str(tmp_path / "programlar.sqlite3")).versions()) == 3
+
+def test_surum_farki_hucre_hucre(tmp_path):
+    store = ScheduleStore(str(tmp_path / "programlar.sqlite3"))
+    v1 = store.save(payload(WEEK_1), "2026 Güz", "Hazırlık", "abc")
+    v2 = store.save(payload(WEEK_2), "2026 Güz", "Hazırlık", "def")
+
+    changes = {(d["Sınıf"], d["Alan"]): (d["Eski"], d["Yeni"]) for d in store.diff(v1, v2)}
+    assert changes[("A1.01", "Salı")] == ("Ahmet", "Sarah")
+    assert changes[("A1.01", "Cuma")] == ("Ayşe", "🔴 BOŞ")
+    assert ("A1.01", "Pazartesi") not in changes
+    # Sadece bir sürümde olan sınıflar boşla karşılaştırılır.
+    assert changes[("PreFaculty.01", "Pazartesi")] == ("Mehmet", "")
+    assert changes[("B1.01", "Sınıf Danışmanı")] == ("", "Can")
+    assert len(changes) == 2 + 6 + 6
+    assert store.diff(v1, v1) == []
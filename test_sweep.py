@@ -0,0 +1,21 @@
+from sweep import expand_grid, run_sweep
+from mock_data import create_mock_teacher
+
+def test_izgara_genisletme():
+    base = {"count_a1": 1, "time_a1": "Sabah", "allow_native_advisor": False}
+    scenarios = expand_grid(base, {"count_a1": [1, 2], "time_a1": ["Sabah", "Öğle"]})
+    assert len(scenarios) == 4
+    assert {(s["count_a1"], s["time_a1"]) for s in scenarios} == {(1, "Sabah"), (1, "Öğle"), (2, "Sabah"), (2, "Öğle")}
+    assert all(s["allow_native_advisor"] is False for s in scenarios)
+
+def test_paralel_tarama_karsilastirma_tablosu():
+    t = [create_mock_teacher(f"H{i}", preferences="Sabah") for i in range(2)]
+    scenarios = expand_grid({"time_a2": "Sabah"}, {"count_a2": [1, 2, 3]})
+    rows = run_sweep(t, scenarios, time_limit=10.0, total_cores=2, workers_per_scenario=1)
+
+    assert [r["count_a2"] for r in rows] == [1, 2, 3]
+    assert all(r["Durum"] == "OPTIMAL" for r in rows)
+    # 2 hoca x 5 ders = 10 saat; 1 sınıfta 5 saat kırpılır, 3 sınıfta 5 ders boş kalır
+    assert rows[0]["Kırpılan Saat"] == 5 and rows[0]["Boş Ders"] == 0
+    assert rows[1]["Boş Ders"] == 0
+    assert rows[2]["Boş Ders"] == 5
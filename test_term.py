@@ -0,0 +1,71 @@
+from term import week_teachers, solve_term, term_summary, HOLIDAY_CELL
+from mock_data import create_mock_teacher, create_mock_class
+
+TEACHERS = [
+    create_mock_teacher("Ali", role="Danışman", forbidden="Cuma"),
+    create_mock_teacher("Veli", role="Danışman"),
+    create_mock_teacher("Can", role="Danışman"),
+]
+CLASSES = [create_mock_class("B1.01", level="B1"), create_mock_class("B1.02", level="B1")]
+
+def test_haftalik_kadro():
+    week = {"Hafta": 3, "Durum": "Ders", "Tatil Günleri": "Pazartesi", "Yasaklı Günler": {"Veli": "Salı"}}
+    week_list = week_teachers(TEACHERS, week)
+    assert [t['Yasaklı Günler'] for t in week_list] == ["Pazartesi,Cuma", "Pazartesi,Salı", "Pazartesi"]
+    # Danışman sürekliliği kadroya sabit sınıf olarak yazılmaz; girdi listesi değişmez.
+    assert all(t['Sabit Sınıf'] == "" for t in week_list)
+    assert TEACHERS[0]['Yasaklı Günler'] == "Cuma"
+
+def test_danisman_surekliligi_yumusak():
+    weeks = [
+        {"Hafta": 1, "Durum": "Ders", "Tatil Günleri": "", "Yasaklı Günler": {}},
+        {"Hafta": 2, "Durum": "Ders", "Tatil Günleri": "", "Yasaklı Günler": {}},
+        {"Hafta": 3, "Durum": "Ders", "Tatil Günleri": "", "Yasaklı Günler": {}},
+    ]
+    first = solve_term(TEACHERS, CLASSES, weeks[:1], time_limit=10.0, num_workers=1)[0]
+    advisor = {row["Sınıf"]: row["Sınıf Danışmanı"] for row in first["schedule"]}["B1.01"]
+    # 2. hafta B1.01'in danışmanı sadece Cuma gelebiliyor: yine de danışman kalır.
+    weeks[1]["Yasaklı Günler"] = {advisor: "Pazartesi,Salı,Çarşamba,Perşembe"}
+    # 3. hafta hiç gelemiyor: hafta çözülür, sınıf başka bir danışmana geçer.
+    weeks[2]["Yasaklı Günler"] = {advisor: "Pazartesi,Salı,Çarşamba,Perşembe,Cuma"}
+    results = solve_term(TEACHERS, CLASSES, weeks, time_limit=30.0, num_workers=1)
+    assert [r["status"] for r in results] == ["OPTIMAL", "OPTIMAL", "OPTIMAL"]
+    advisors = [{row["Sınıf"]: row["Sınıf Danışmanı"] for row in r["schedule"]}["B1.01"] for r in results]
+    assert advisors[0] == advisors[1] == advisor
+    assert advisors[2] not in (advisor, "Atanamadı")
+
+def test_donem_kayan_ufuk():
+    weeks = [
+        {"Hafta": 1, "Durum": "Ders", "Tatil Günleri": "", "Yasaklı Günler": {}},
+        {"Hafta": 2, "Durum": "Ders", "Tatil Günleri": "", "Yasaklı Günler": {}},
+        {"Hafta": 3, "Durum": "Ders", "Tatil Günleri": "", "Yasaklı Günler": {}},
+        {"Hafta": 4, "Durum": "Sınav", "Tatil Günleri": "", "Yasaklı Günler": {}},
+        {"Hafta": 5, "Durum": "Ders", "Tatil Günleri": "Çarşamba", "Yasaklı Günler": {}},
+    ]
+    results = solve_term(TEACHERS, CLASSES, weeks, time_limit=40.0, num_workers=1)
+    assert [r["status"] for r in results] == ["OPTIMAL", "OPTIMAL", "OPTIMAL", "SKIPPED", "OPTIMAL"]
+
+    advisors = [{row["Sınıf"]: row["Sınıf Danışmanı"] for row in r["schedule"]} for r in results if r.get("schedule")]
+    assert all(a == advisors[0] for a in advisors)
+
+    # 3. hafta girdisi 2. haftayla aynı: yeniden çözülmez.
+    assert results[2]["reused"] and results[2]["schedule"] == results[1]["schedule"]
+    assert all(row["Çarşamba"] == HOLIDAY_CELL for row in results[4]["schedule"])
+
+    summary = term_summary(results)
+    assert [s["Boş Ders"] for s in summary] == [0, 0, 0, 0, 0]
+
+def test_tatil_gunu_kesin_kapali():
+    from engine import build_model
+    built = build_model(TEACHERS, CLASSES, reduce_mode=False, closed_days=[2])
+    assert built.x and not any(d == 2 for _, _, d, _ in built.x)
+
+    # Kademeli modda da tatil gününe ders konmaz; istatistikler programda görünen dersleri sayar.
+    weeks = [{"Hafta": 1, "Durum": "Ders", "Tatil Günleri": "Çarşamba", "Yasaklı Günler": {}}]
+    result = solve_term(TEACHERS, CLASSES, weeks, time_limit=20.0, num_workers=1, solve_mode="tiered")[0]
+    assert result["status"] == "OPTIMAL"
+    taught = sum(1 for row in result["schedule"] for d in ("Pazartesi", "Salı", "Perşembe", "Cuma")
+                 if row[d] not in ("🔴 BOŞ", HOLIDAY_CELL))
+    assert all(row["Çarşamba"] == HOLIDAY_CELL for row in result["schedule"])
+    assert sum(s["Atanan"] for s in result["stats"]) == taught
+    assert not any("Yasaklı Gün" in v["Sorun"] for v in result["violations"])